@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Content Manifest Builder
+
+The router used to fetch guides/guides.json and blogs/blog-posts.json
+separately, again on every route change, and then sort and format them in
+the browser. This script validates both files and merges them into one
+content-manifest.json. The router fetches it once and uses it as-is:
+- guides in authored order, blogs newest first
+- 'url', 'category' and 'formattedDate' ("Oct 7, 2025") on every entry
+- a tag index (tag -> entry urls) and per-category entry counts
+- 'version', a hash of the content, which changes whenever any entry does
+
+Validation runs on every build, so a missing field, a malformed date, a
+duplicate slug, an unknown category or a listed page that does not exist
+fails the deploy instead of breaking a route in the browser.
+
+Usage:
+    python build_content_manifest.py              # Write ../build/content-manifest.json
+    python build_content_manifest.py --check      # Validate only; exit 1 on schema errors
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import date
+
+from fileutil import write_atomic
+from prerender_routes import BUILD_DIR, SITE_ROOT
+
+MANIFEST_FILE = 'content-manifest.json'
+MANIFEST_SCHEMA = 1
+
+# (type, metadata file, category for every entry or None to take it from the entry)
+CONTENT_TYPES = (
+    ('guides', 'guides.json', None),
+    ('blogs', 'blog-posts.json', 'blog'),
+)
+REQUIRED_FIELDS = {'slug': str, 'title': str, 'date': str, 'author': str, 'summary': str,
+                   'description': str, 'detailedSummary': str, 'file': str, 'tags': list}
+SLUG = re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$')
+ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+CATEGORY_LABEL = re.compile(r"'([\w-]+)':\s*\{\s*label:\s*'((?:\\.|[^'\\])*)'")
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def parse_category_labels(index_html):
+    """Category key -> display label, from categoryConfig in index.html."""
+    return {key: re.sub(r'\\(.)', r'\1', label) for key, label in CATEGORY_LABEL.findall(index_html)}
+
+def format_date(iso_date):
+    """Format YYYY-MM-DD like the router's formatDate() in en-US: 'Oct 7, 2025'."""
+    day = date.fromisoformat(iso_date)
+    return f"{MONTHS[day.month - 1]} {day.day}, {day.year}"
+
+def validate_entries(content_type, entries, directory, categories=None):
+    """
+    Check one metadata file against the schema.
+
+    Args:
+        content_type (str): 'guides' or 'blogs'
+        entries: Parsed JSON
+        directory (str): Directory the entries' 'file' pages live in
+        categories (set): Known category keys; guides must use one (None skips the check)
+
+    Returns:
+        list: Error messages, empty when the file is valid
+    """
+    if not isinstance(entries, list):
+        return [f"{content_type}: expected a list of entries, got {type(entries).__name__}"]
+
+    errors = []
+    seen = {'slug': set(), 'file': set()}
+    for position, entry in enumerate(entries):
+        where = f"{content_type}[{position}]"
+        if not isinstance(entry, dict):
+            errors.append(f"{where}: expected an object")
+            continue
+        where = f"{where} ({entry.get('slug', '?')})"
+
+        fields = dict(REQUIRED_FIELDS, **({'category': str} if content_type == 'guides' else {}))
+        missing = [f"{where}: missing '{field}'" if field not in entry else
+                   f"{where}: '{field}' must be a non-empty {kind.__name__}"
+                   for field, kind in fields.items()
+                   if field not in entry or not isinstance(entry[field], kind)
+                   or (kind is str and not entry[field].strip())]
+        if missing:
+            errors += missing
+            continue
+
+        if not SLUG.match(entry['slug']):
+            errors.append(f"{where}: slug must be lowercase words joined by '-'")
+        try:
+            if not ISO_DATE.match(entry['date']):
+                raise ValueError
+            date.fromisoformat(entry['date'])
+        except ValueError:
+            errors.append(f"{where}: date '{entry['date']}' is not YYYY-MM-DD")
+        if not all(isinstance(tag, str) and tag.strip() for tag in entry['tags']):
+            errors.append(f"{where}: tags must be non-empty strings")
+        elif len(set(entry['tags'])) != len(entry['tags']):
+            errors.append(f"{where}: duplicate tags")
+        if not entry['file'].endswith('.html') or '/' in entry['file']:
+            errors.append(f"{where}: file '{entry['file']}' must be an .html file name")
+        elif not os.path.isfile(os.path.join(directory, entry['file'])):
+            errors.append(f"{where}: file '{entry['file']}' does not exist")
+        if categories is not None and 'category' in fields and entry['category'] not in categories:
+            errors.append(f"{where}: unknown category '{entry['category']}' (not in categoryConfig)")
+
+        for key in ('slug', 'file'):
+            if entry[key] in seen[key]:
+                errors.append(f"{where}: duplicate {key} '{entry[key]}'")
+            seen[key].add(entry[key])
+    return errors
+
+def load_content(root=SITE_ROOT):
+    """
+    Read and validate every content metadata file.
+
+    Args:
+        root (str): Site root containing index.html, guides/ and blogs/
+
+    Returns:
+        dict: Content type -> entries, as authored, each with 'url' and
+              'category' added
+
+    Raises:
+        ValueError: Listing every schema error found
+    """
+    categories = None
+    index_path = os.path.join(root, 'index.html')
+    if os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            categories = set(parse_category_labels(f.read())) or None
+
+    content, errors = {}, []
+    for content_type, metadata, category in CONTENT_TYPES:
+        directory = os.path.join(root, content_type)
+        try:
+            with open(os.path.join(directory, metadata), encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            errors.append(f"{content_type}/{metadata}: {e}")
+            continue
+        problems = validate_entries(content_type, entries, directory, categories)
+        if problems:
+            errors += problems
+            continue
+        content[content_type] = [dict(entry, url=f"#/{content_type}/{entry['file']}",
+                                      category=category or entry['category']) for entry in entries]
+
+    if errors:
+        raise ValueError(f"{len(errors)} content error(s):\n  " + "\n  ".join(errors))
+    return content
+
+def build_manifest(content):
+    """
+    Derive the merged manifest from validated content.
+
+    Args:
+        content (dict): load_content() output
+
+    Returns:
+        dict: 'schema', 'version', 'guides', 'blogs' (newest first), 'tags' and 'categories'
+    """
+    guides = [dict(entry, formattedDate=format_date(entry['date'])) for entry in content['guides']]
+    blogs = sorted((dict(entry, formattedDate=format_date(entry['date'])) for entry in content['blogs']),
+                   key=lambda entry: entry['date'], reverse=True)
+
+    tags, categories = {}, {}
+    for entry in guides + blogs:
+        for tag in entry['tags']:
+            tags.setdefault(tag, []).append(entry['url'])
+        categories[entry['category']] = categories.get(entry['category'], 0) + 1
+
+    body = {'guides': guides, 'blogs': blogs, 'tags': dict(sorted(tags.items())), 'categories': categories}
+    version = hashlib.sha256(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return {'schema': MANIFEST_SCHEMA, 'version': version, **body}
+
+def write_content_manifest(root=SITE_ROOT, out_path=None):
+    """
+    Validate the site's content and write the manifest as compact JSON.
+
+    Args:
+        root (str): Site root
+        out_path (str): Output file (default: <root>/build/content-manifest.json, never the
+                        site root, where the router would prefer a stale copy)
+
+    Returns:
+        dict: The manifest written
+
+    Raises:
+        ValueError: On schema errors; nothing is written
+    """
+    manifest = build_manifest(load_content(root))
+    out_path = out_path or os.path.join(root, BUILD_DIR, MANIFEST_FILE)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    write_atomic(out_path, json.dumps(manifest, ensure_ascii=False, separators=(',', ':')))
+    return manifest
+
+def main():
+    """Validate guides and blogs metadata and build the content manifest."""
+    parser = argparse.ArgumentParser(description='Validate and merge guides/blogs metadata into one manifest')
+    parser.add_argument('--root', default=SITE_ROOT, help='Site root (default: repository root)')
+    parser.add_argument('--out', help=f'Output file (default: <root>/{BUILD_DIR}/{MANIFEST_FILE})')
+    parser.add_argument('--check', action='store_true', help='Validate only; write nothing')
+
+    args = parser.parse_args()
+
+    try:
+        if args.check:
+            manifest = build_manifest(load_content(args.root))
+        else:
+            manifest = write_content_manifest(args.root, args.out)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    counts = ', '.join(f"{count} {category}" for category, count in manifest['categories'].items())
+    print(f"✅ {len(manifest['guides'])} guides, {len(manifest['blogs'])} blogs valid "
+          f"({counts}; {len(manifest['tags'])} tags), version {manifest['version']}")
+    if not args.check:
+        print(f"📄 Manifest written to {args.out or os.path.join(args.root, BUILD_DIR, MANIFEST_FILE)}")
+
+if __name__ == "__main__":
+    main()
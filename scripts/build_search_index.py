@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Search Index Builder
+
+The resources page and the #/search?q= route used to filter every resource
+with a substring scan on each keystroke, over names, URLs, category labels,
+descriptions and summaries only. This script builds an inverted index once,
+from:
+- the resource list and category labels in index.html
+- guides/guides.json and blogs/blog-posts.json (validated by
+  build_content_manifest.load_content()), including their tags
+- the body text of every guide and blog page
+
+The router loads it on the first search. Lookup cost depends on the number
+of matching terms rather than on the amount of content, and hashtag
+searches reach article bodies.
+
+Index format (search-index.json):
+    {"version": 1,
+     "docs": [resource url, ...],
+     "terms": [sorted terms],
+     "postings": [[doc, score, doc, score, ...] per term]}
+
+Queries are prefix searches: the client binary-searches the sorted term
+list for the range of terms starting with each query token, so prefixes
+cost nothing extra in the file. A document matches when every query token
+matches one of its terms; results are ranked by summed score. Tokens are
+lowercased ASCII letter/digit runs, with accents stripped, in both
+Python and JavaScript; query tokens shorter than MIN_TERM_LENGTH are
+ignored, as no such terms are indexed.
+
+The resources page lists the index hits first, then any resource the old
+substring scan matches that the index does not (infixes such as "ux" in
+"Linux", symbols such as "c++"), so a search never finds less than before.
+
+Usage:
+    python build_search_index.py                      # Write ../build/search-index.json
+    python build_search_index.py --out /tmp/index.json
+"""
+
+import argparse
+import bisect
+import gzip
+import html
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+from build_content_manifest import load_content, parse_category_labels
+from fileutil import write_atomic
+from prerender_routes import BUILD_DIR, SITE_ROOT, extract_body
+
+INDEX_FILE = 'search-index.json'
+INDEX_VERSION = 1
+
+# How much a term occurrence counts, by field; occurrences per field are capped
+FIELD_WEIGHTS = {'name': 8, 'tags': 6, 'category': 4, 'url': 2, 'desc': 2, 'summary': 2,
+                 'detailedSummary': 1, 'body': 1}
+MAX_OCCURRENCES = 3
+MIN_TERM_LENGTH = 2
+
+TOKEN = re.compile(r'[a-z0-9]+')
+COMBINING_MARK = re.compile('[\u0300-\u036f]')
+JS_STRING_FIELD = re.compile(r"(\w+):\s*'((?:\\.|[^'\\])*)'")
+RESOURCE_LIST = re.compile(r'const data = \[([\s\S]*?)\.\.\.guideResources', re.M)
+NON_TEXT = re.compile(r'<(script|style|svg)\b[\s\S]*?</\1\s*>', re.I)
+TAG = re.compile(r'<[^>]+>')
+URL_PREFIX = re.compile(r'^(?:[a-z]+://(?:www\.)?|#/)')
+
+def tokenize(text):
+    """Lowercase letter/digit runs with accents removed (matches searchTokens() in index.html)."""
+    return TOKEN.findall(COMBINING_MARK.sub('', unicodedata.normalize('NFKD', text.lower())))
+
+def _js_unescape(value):
+    """Undo the backslash escapes used in the single-quoted strings of index.html."""
+    return re.sub(r'\\(.)', r'\1', value)
+
+def parse_resources(index_html):
+    """
+    Read the static resource list from renderResourcesPage() in index.html.
+
+    Args:
+        index_html (str): index.html source
+
+    Returns:
+        list: Dicts with the resource's string fields (name, url, cat, desc,
+              summary, detailedSummary), in page order
+    """
+    match = RESOURCE_LIST.search(index_html)
+    if not match:
+        raise ValueError("resource list (const data = [...]) not found in index.html")
+    resources = []
+    for block in re.findall(r'\{([^{}]*)\}', match.group(1)):
+        fields = {key: _js_unescape(value) for key, value in JS_STRING_FIELD.findall(block)}
+        if 'name' in fields and 'url' in fields:
+            resources.append(fields)
+    return resources
+
+def page_text(page_html):
+    """Visible text of a page body: scripts, styles and SVGs (QR codes) removed, entities decoded."""
+    body = NON_TEXT.sub(' ', extract_body(page_html))
+    return html.unescape(TAG.sub(' ', body))
+
+def load_documents(root=SITE_ROOT):
+    """
+    Collect every searchable resource, in the order the resources page lists them.
+
+    Args:
+        root (str): Site root containing index.html, guides/ and blogs/
+
+    Returns:
+        list: Dicts with 'url' (the resource's link, used as its id) and the
+              FIELD_WEIGHTS text fields ('tags' is a list)
+    """
+    with open(os.path.join(root, 'index.html'), encoding='utf-8') as f:
+        index_html = f.read()
+    labels = parse_category_labels(index_html)
+
+    documents = [dict(resource, tags=[]) for resource in parse_resources(index_html)]
+    for content_type, entries in load_content(root).items():
+        for entry in entries:
+            with open(os.path.join(root, content_type, entry['file']), encoding='utf-8') as f:
+                body = page_text(f.read())
+            documents.append({'name': entry['title'], 'url': entry['url'], 'cat': entry['category'],
+                              'desc': entry['description'], 'summary': entry['summary'],
+                              'detailedSummary': entry['detailedSummary'], 'tags': entry['tags'], 'body': body})
+
+    for document in documents:
+        document['category'] = labels.get(document.get('cat', ''), document.get('cat', ''))
+    return documents
+
+def document_scores(document):
+    """Term -> score for one document, summing capped, weighted occurrences per field."""
+    scores = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = document.get(field) or ''
+        if field == 'tags':
+            value = ' '.join(value)
+        elif field == 'url':
+            value = URL_PREFIX.sub('', value.lower())
+        for term, count in Counter(tokenize(value)).items():
+            if len(term) >= MIN_TERM_LENGTH:
+                scores[term] += weight * min(count, MAX_OCCURRENCES)
+    return scores
+
+def build_index(documents):
+    """
+    Build the inverted index.
+
+    Args:
+        documents (list): load_documents() output
+
+    Returns:
+        dict: {'version', 'docs', 'terms', 'postings'} as described in the module docstring
+    """
+    postings = defaultdict(list)
+    for doc, document in enumerate(documents):
+        for term, score in document_scores(document).items():
+            postings[term] += [doc, score]
+    terms = sorted(postings)
+    return {'version': INDEX_VERSION, 'docs': [document['url'] for document in documents],
+            'terms': terms, 'postings': [postings[term] for term in terms]}
+
+def search(index, query):
+    """
+    Reference implementation of the client-side lookup, for tests and debugging.
+
+    Returns:
+        list: Matching resource urls, best first
+    """
+    scores = None
+    for token in tokenize(query):
+        if len(token) < MIN_TERM_LENGTH:
+            continue
+        matched = Counter()
+        start = bisect.bisect_left(index['terms'], token)
+        for t in range(start, len(index['terms'])):
+            if not index['terms'][t].startswith(token):
+                break
+            postings = index['postings'][t]
+            for i in range(0, len(postings), 2):
+                matched[postings[i]] += postings[i + 1]
+        scores = matched if scores is None else Counter({doc: scores[doc] + score
+                                                         for doc, score in matched.items() if doc in scores})
+    if not scores:
+        return []
+    return [index['docs'][doc] for doc, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0]))]
+
+def write_search_index(root=SITE_ROOT, out_path=None):
+    """
+    Build the index for a site and write it as compact JSON.
+
+    Args:
+        root (str): Site root
+        out_path (str): Output file (default: <root>/build/search-index.json, never the
+                        site root, where the router would prefer a stale copy)
+
+    Returns:
+        dict: 'path', 'docs', 'terms', 'bytes' and 'gz_bytes'
+    """
+    out_path = out_path or os.path.join(root, BUILD_DIR, INDEX_FILE)
+    index = build_index(load_documents(root))
+    text = json.dumps(index, separators=(',', ':'))
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    write_atomic(out_path, text)
+    data = text.encode('utf-8')
+    return {'path': out_path, 'docs': len(index['docs']), 'terms': len(index['terms']),
+            'bytes': len(data), 'gz_bytes': len(gzip.compress(data, compresslevel=9, mtime=0))}
+
+def main():
+    """Build the search index for the resources page."""
+    parser = argparse.ArgumentParser(description='Build the full-text search index for #/search')
+    parser.add_argument('--root', default=SITE_ROOT, help='Site root (default: repository root)')
+    parser.add_argument('--out', help=f'Output file (default: <root>/{BUILD_DIR}/{INDEX_FILE})')
+    parser.add_argument('--query', help='Also run a search against the new index and print the ranked urls')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        result = write_search_index(args.root, args.out)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Index build failed: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print(f"🔎 {result['docs']} resources, {result['terms']:,} terms: {result['path']} "
+          f"({result['bytes']:,} bytes, {result['gz_bytes']:,} gzip) in {elapsed:.2f}s")
+
+    if args.query:
+        with open(result['path'], encoding='utf-8') as f:
+            index = json.load(f)
+        for rank, url in enumerate(search(index, args.query), 1):
+            print(f"   {rank:>2}. {url}")
+
+if __name__ == "__main__":
+    main()
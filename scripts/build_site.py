@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Static Site Build
+
+Packages the site into build/ for the GitHub Pages artifact instead of
+uploading the repository as-is:
+1. Copy the served files (index.html, guides/, blogs/, js/, images/, ...)
+2. Validate guides/blogs metadata and merge it into build/content-manifest.json
+   (build_content_manifest.py), prerender the route fragments
+   (prerender_routes.py) into build/prerendered/ and build the search index
+   (build_search_index.py) into build/search-index.json
+3. Minify HTML, CSS, JS and JSON
+4. Fingerprint js/ and images/: copy each asset to a content-hashed name
+   (qr-code-manager.js -> qr-code-manager.<hash>.js), point the references
+   in the HTML pages and stylesheets at it, and record the mapping in
+   asset-manifest.json. A hashed URL never changes content, so it can be
+   cached forever, and a release only re-downloads the assets that changed.
+5. Write .gz (and .br when the brotli module is installed) siblings at
+   maximum compression wherever they are smaller than the file itself
+6. Report per-file and total transfer sizes, plus the first-load budget:
+   index.html and the local scripts, stylesheets and images it references
+
+The minifiers are deliberately conservative: they remove comments and
+collapse whitespace, and never rename, reorder or rewrite anything.
+String, template and regex literals, <pre> and <textarea> contents and
+everything inside tags are left byte-for-byte intact, and line breaks in
+JavaScript are kept wherever automatic semicolon insertion could depend
+on them.
+
+Usage:
+    python build_site.py                       # Build ../build
+    python build_site.py --out /tmp/site       # Build elsewhere
+    python build_site.py --json report.json    # Also save the size report
+"""
+
+import argparse
+import gzip
+import json
+import hashlib
+import os
+import posixpath
+import re
+import shutil
+import sys
+import time
+
+from build_content_manifest import MANIFEST_FILE, write_content_manifest
+from build_search_index import INDEX_FILE, write_search_index
+from prerender_routes import BUILD_DIR, prerender_site
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Everything the deployed site serves; the rest of the repository stays out of the artifact
+SITE_PATHS = ('index.html', 'favicon.ico', 'version.json', '.nojekyll', 'guides', 'blogs', 'images', 'js')
+SKIP_SUFFIXES = ('.md',)
+
+# Text formats worth precompressing; images are already compressed
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.xml', '.ico')
+
+# Assets served under content-hashed names. Pages, JSON content, favicon.ico
+# and version.json keep fixed URLs: they are linked to or fetched by name.
+FINGERPRINT_DIRS = ('js/', 'images/')
+FINGERPRINT_SUFFIXES = ('.js', '.css', '.webp', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.woff2')
+HASH_LENGTH = 10
+ASSET_MANIFEST = 'asset-manifest.json'
+
+# ---------------------------------------------------------------------------
+# CSS
+
+CSS_TOKEN = re.compile(r'/\*[\s\S]*?\*/|"(?:\\[\s\S]|[^"\\])*"|\'(?:\\[\s\S]|[^\'\\])*\'|\s+|[^\s/"\']+|/')
+CSS_TIGHT = set('{};,>')
+
+def minify_css(css):
+    """Drop comments, collapse whitespace and remove it around { } ; , > and before }."""
+    out = []
+    pending_space = False
+    for token in CSS_TOKEN.findall(css):
+        if token.startswith('/*'):
+            pending_space = pending_space or bool(out)
+            continue
+        if token.isspace():
+            pending_space = bool(out)
+            continue
+        if pending_space and out[-1][-1] not in CSS_TIGHT and token[0] not in CSS_TIGHT:
+            out.append(' ')
+        pending_space = False
+        if token[0] == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(token)
+    return ''.join(out)
+
+# ---------------------------------------------------------------------------
+# JavaScript
+
+WORD_CHAR = re.compile(r'[A-Za-z0-9_$\\\x80-\uffff]')
+# A '/' after one of these (or at the start) begins a regex literal, not a division
+REGEX_AFTER_PUNCT = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_AFTER_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                     'void', 'throw', 'instanceof', 'yield', 'await'}
+# Line breaks after these characters, or before the second set, never end a statement
+NEWLINE_SAFE_AFTER = set('{(,[;')
+NEWLINE_SAFE_BEFORE = set(')]},;')
+
+def _needs_space(prev, nxt):
+    """True if removing the whitespace between two characters would change the tokens."""
+    if WORD_CHAR.match(prev) and WORD_CHAR.match(nxt):
+        return True
+    if prev.isdigit() and nxt == '.':
+        return True
+    return prev + nxt in ('++', '--', '//', '<!', '->', '/*')
+
+def _last_word(out):
+    """The identifier or keyword at the end of the output so far."""
+    tail = ''.join(out[-3:])
+    match = re.search(r'[A-Za-z_$][A-Za-z0-9_$]*$', tail)
+    return match.group(0) if match else ''
+
+def _scan_string(src, i):
+    """Index just past the quoted string starting at src[i]."""
+    quote = src[i]
+    i += 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == '\\' else 1
+    return i + 1
+
+def _scan_regex(src, i):
+    """Index just past the regex literal (and its flags) starting at src[i]."""
+    i += 1
+    in_class = False
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            break
+        elif ch == '\n':
+            raise ValueError(f"unterminated regex literal at offset {i}")
+        i += 1
+    i += 1
+    while i < len(src) and (src[i].isalnum() or src[i] == '_'):
+        i += 1
+    return i
+
+def _minify_js(src, i, in_template):
+    """
+    Minify code from src[i] to the end, or to the '}' closing a ${...}.
+
+    Returns:
+        tuple: (output chunks, index after the last consumed character)
+    """
+    out = []
+    pending = ''           # '' (none), ' ' or '\n': whitespace seen since the last token
+    depth = 0
+
+    def emit(token):
+        nonlocal pending
+        if pending and out:
+            prev, nxt = out[-1][-1], token[0]
+            if pending == '\n' and prev not in NEWLINE_SAFE_AFTER and nxt not in NEWLINE_SAFE_BEFORE:
+                out.append('\n')
+            elif _needs_space(prev, nxt):
+                out.append(' ')
+        pending = ''
+        out.append(token)
+
+    while i < len(src):
+        ch = src[i]
+        if ch in ' \t\r\n\f\v\u00a0\ufeff\u2028\u2029':
+            j = i
+            while j < len(src) and src[j] in ' \t\r\n\f\v\u00a0\ufeff\u2028\u2029':
+                j += 1
+            if '\n' in src[i:j] or '\r' in src[i:j] or pending == '\n':
+                pending = '\n'
+            else:
+                pending = pending or ' '
+            i = j
+        elif src.startswith('//', i):
+            end = src.find('\n', i)
+            i = len(src) if end == -1 else end
+            pending = pending or ' '
+        elif src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            if end == -1:
+                raise ValueError(f"unterminated comment at offset {i}")
+            comment = src[i:end + 2]
+            if comment.startswith('/*!'):
+                emit(comment)
+            elif '\n' in comment:
+                pending = '\n'
+            else:
+                pending = pending or ' '
+            i = end + 2
+        elif ch in '"\'':
+            end = _scan_string(src, i)
+            emit(src[i:end])
+            i = end
+        elif ch == '`':
+            chunks = ['`']
+            i += 1
+            while i < len(src) and src[i] != '`':
+                if src[i] == '\\':
+                    chunks.append(src[i:i + 2])
+                    i += 2
+                elif src.startswith('${', i):
+                    inner, i = _minify_js(src, i + 2, True)
+                    chunks.append('${' + ''.join(inner) + '}')
+                else:
+                    chunks.append(src[i])
+                    i += 1
+            chunks.append('`')
+            emit(''.join(chunks))
+            i += 1
+        elif ch == '/':
+            prev = out[-1][-1] if out else ''
+            if not prev or prev in REGEX_AFTER_PUNCT or _last_word(out) in REGEX_AFTER_WORDS:
+                end = _scan_regex(src, i)
+                emit(src[i:end])
+                i = end
+            else:
+                emit('/')
+                i += 1
+        elif ch == '{':
+            depth += 1
+            emit(ch)
+            i += 1
+        elif ch == '}':
+            if in_template and depth == 0:
+                return out, i + 1
+            depth -= 1
+            emit(ch)
+            i += 1
+        else:
+            j = i + 1
+            if WORD_CHAR.match(ch):
+                while j < len(src) and WORD_CHAR.match(src[j]):
+                    j += 1
+            emit(src[i:j])
+            i = j
+
+    if in_template:
+        raise ValueError("unterminated template literal")
+    return out, i
+
+def minify_js(js):
+    """Drop comments (except /*! ... */) and collapse whitespace in JavaScript."""
+    return ''.join(_minify_js(js, 0, False)[0])
+
+# ---------------------------------------------------------------------------
+# HTML
+
+HTML_PART = re.compile(
+    r'<!--[\s\S]*?-->'
+    r'|<(script|style|pre|textarea)\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>([\s\S]*?)</\1\s*>'
+    r'|<[A-Za-z/!](?:[^>"\']|"[^"]*"|\'[^\']*\')*>',
+    re.I)
+TYPE_ATTR = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.I)
+SRC_ATTR = re.compile(r'\bsrc\s*=', re.I)
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+CSS_TYPES = {'', 'text/css', 'text/tailwindcss'}
+
+def _collapse_text(text):
+    """Collapse a run of text whitespace to one newline or one space, as the browser would render it."""
+    return re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', text)
+
+def _minify_raw_element(match):
+    """Minify the body of a <script> or <style>; <pre> and <textarea> stay as written."""
+    tag, attrs, body = match.group(1), match.group(2), match.group(3)
+    kind = tag.lower()
+    type_match = TYPE_ATTR.search(attrs)
+    mime = type_match.group(1).lower() if type_match else ''
+
+    if kind == 'script' and not SRC_ATTR.search(attrs):
+        if mime in JS_TYPES:
+            body = minify_js(body)
+        elif mime == 'application/ld+json':
+            body = json.dumps(json.loads(body), ensure_ascii=False, separators=(',', ':'))
+    elif kind == 'style' and mime in CSS_TYPES:
+        body = minify_css(body)
+    return match.group(0) if kind in ('pre', 'textarea') else f"<{tag}{attrs}>{body}</{tag}>"
+
+def minify_html(html):
+    """
+    Minify an HTML document or fragment.
+
+    Comments go (except <!--[if ...]> conditionals), whitespace between and
+    inside text collapses, and inline scripts, JSON-LD and styles are
+    minified. Tags themselves and <pre>/<textarea> contents are untouched.
+
+    Args:
+        html (str): HTML text
+
+    Returns:
+        str: Minified HTML
+    """
+    out = []
+    text = []              # Text since the last kept part; dropped comments join both sides
+    last = 0
+    for match in HTML_PART.finditer(html):
+        text.append(html[last:match.start()])
+        last = match.end()
+        part = match.group(0)
+        if part.startswith('<!--') and not part.startswith('<!--[if'):
+            continue
+        out.append(_collapse_text(''.join(text)))
+        text = []
+        out.append(_minify_raw_element(match) if match.group(1) else part)
+    text.append(html[last:])
+    out.append(_collapse_text(''.join(text)))
+    return ''.join(out).strip()
+
+def minify_json(text):
+    """Re-serialize JSON without insignificant whitespace, keeping key order."""
+    return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+
+MINIFIERS = {'.html': minify_html, '.css': minify_css, '.js': minify_js, '.json': minify_json}
+
+# ---------------------------------------------------------------------------
+# Fingerprinting
+
+# A relative reference in quotes or url(...); absolute URLs and root paths never match
+ASSET_REF = re.compile(r'(?<=["\'(])((?:\.{1,2}/)*[\w][\w./-]*\.(?:js|css|webp|png|jpe?g|gif|svg|woff2))(?=[?#"\')])')
+
+def hashed_name(rel_path, data):
+    """The fingerprinted path for an asset: name.<hash>.ext next to the original."""
+    stem, ext = posixpath.splitext(rel_path)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+def reference_base(rel_path):
+    """
+    Directory that relative URLs in a built file resolve against.
+
+    Route fragments are injected into index.html, so their URLs resolve
+    from the site root rather than from prerendered/<dir>/.
+    """
+    return '' if rel_path.startswith('prerendered/') else posixpath.dirname(rel_path)
+
+def rewrite_references(rel_path, data, manifest):
+    """
+    Point relative asset references in an HTML page or stylesheet at their hashed names.
+
+    Args:
+        rel_path (str): Path of the file within the site
+        data (bytes): File contents
+        manifest (dict): Original path -> hashed path
+
+    Returns:
+        bytes: Contents with every reference to a manifest entry replaced,
+               keeping its relative prefix (./, ../) as written
+    """
+    base = reference_base(rel_path)
+
+    def replace(match):
+        ref = match.group(1)
+        hashed = manifest.get(posixpath.normpath(posixpath.join(base, ref)))
+        return ref[:len(ref) - len(posixpath.basename(ref))] + posixpath.basename(hashed) if hashed else ref
+
+    return ASSET_REF.sub(replace, data.decode('utf-8')).encode('utf-8')
+
+def fingerprint(contents):
+    """
+    Add content-hashed copies of js/ and images/ assets and rewrite references to them.
+
+    Binary assets are hashed first, then stylesheets after their url()
+    references are rewritten, so a stylesheet's hash covers the image names
+    it points at. References inside .js files are left alone: they resolve
+    against the loading page, which the script cannot know.
+
+    Args:
+        contents (dict): Site path -> built bytes; updated in place with the
+                         rewritten pages and the hashed copies (the fixed
+                         names stay, for absolute links such as og:image)
+
+    Returns:
+        dict: Manifest of original path -> hashed path
+    """
+    assets = [rel for rel in contents if rel.startswith(FINGERPRINT_DIRS) and rel.endswith(FINGERPRINT_SUFFIXES)]
+    manifest = {}
+    for rel in sorted(assets, key=lambda rel: (rel.endswith('.css'), rel)):
+        if rel.endswith('.css'):
+            contents[rel] = rewrite_references(rel, contents[rel], manifest)
+        manifest[rel] = hashed_name(rel, contents[rel])
+
+    for rel in contents:
+        if rel.endswith('.html'):
+            contents[rel] = rewrite_references(rel, contents[rel], manifest)
+    for rel, hashed in manifest.items():
+        contents[hashed] = contents[rel]
+    return manifest
+
+# ---------------------------------------------------------------------------
+# Build
+
+def site_files(root=SITE_ROOT, entries=SITE_PATHS):
+    """Every served file under the given entries as (path relative to root, absolute path), sorted."""
+    files = []
+    for entry in entries:
+        path = os.path.join(root, entry)
+        if os.path.isfile(path):
+            files.append((entry, path))
+        elif os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                for name in names:
+                    full = os.path.join(directory, name)
+                    files.append((os.path.relpath(full, root).replace(os.sep, '/'), full))
+    return sorted(f for f in files if not f[0].endswith(SKIP_SUFFIXES))
+
+def minify(rel_path, data):
+    """Minify file contents by extension; .min.js files and other types pass through."""
+    _, ext = os.path.splitext(rel_path)
+    if ext not in MINIFIERS or rel_path.endswith('.min.js'):
+        return data
+    return MINIFIERS[ext](data.decode('utf-8')).encode('utf-8')
+
+def precompress(data):
+    """
+    Compress data at maximum settings.
+
+    Returns:
+        dict: 'gz' and 'br' bytes ('br' is None without the brotli module)
+    """
+    return {
+        'gz': gzip.compress(data, compresslevel=9, mtime=0),
+        'br': brotli.compress(data, mode=brotli.MODE_TEXT, quality=11) if brotli else None,
+    }
+
+def first_load_paths(index_html):
+    """Local files index.html loads on its own: scripts, stylesheets, icons and images."""
+    paths = {'index.html'}
+    for ref in re.findall(r'<(?:script|img|link)\b[^>]*?\b(?:src|href)="([^"]+)"', index_html, re.I):
+        if '://' not in ref and not ref.startswith(('data:', '#', '${', "'")):
+            paths.add(ref.split('?')[0].split('#')[0].lstrip('./'))
+    return paths
+
+def build_site(root=SITE_ROOT, out_dir=None):
+    """
+    Build the deployable site.
+
+    Args:
+        root (str): Repository root
+        out_dir (str): Output directory (default: <root>/build); replaced entirely
+
+    Returns:
+        dict: 'files' (per file dicts with 'path', 'source_bytes',
+              'minified_bytes', 'gz_bytes', 'br_bytes' and 'hashed_path';
+              the sizes are None when no sibling was written, and
+              'hashed_path' is set on the fixed-name copy of a fingerprinted
+              asset), 'manifest', 'totals' and 'first_load'. Totals count
+              each fingerprinted asset once, under its hashed name.
+    """
+    root = os.path.abspath(root)
+    out_dir = os.path.abspath(out_dir or os.path.join(root, BUILD_DIR))
+    if os.path.commonpath([root, out_dir]) == out_dir:
+        raise ValueError(f"refusing to replace {out_dir}: it contains the site root")
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+
+    # The content manifest, fragments and search index are derived from the
+    # source pages, so they are built straight into the output and then
+    # minified and compressed with everything else. Content schema errors
+    # raise ValueError here and stop the build.
+    write_content_manifest(root, os.path.join(out_dir, MANIFEST_FILE))
+    prerender_site(root, os.path.join(out_dir, 'prerendered'))
+    write_search_index(root, os.path.join(out_dir, INDEX_FILE))
+    sources = {rel: full for rel, full in site_files(root)}
+    sources.update(site_files(out_dir, ('prerendered', MANIFEST_FILE, INDEX_FILE)))
+
+    contents, source_bytes = {}, {}
+    for rel in sorted(sources):
+        with open(sources[rel], 'rb') as f:
+            data = f.read()
+        source_bytes[rel] = len(data)
+        contents[rel] = minify(rel, data)
+
+    manifest = fingerprint(contents)
+    originals = {hashed: rel for rel, hashed in manifest.items()}
+    with open(os.path.join(out_dir, ASSET_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    files = []
+    for rel in sorted(contents):
+        data = contents[rel]
+        target = os.path.join(out_dir, *rel.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+
+        entry = {'path': rel, 'source_bytes': source_bytes[originals.get(rel, rel)], 'minified_bytes': len(data),
+                 'gz_bytes': None, 'br_bytes': None, 'hashed_path': manifest.get(rel)}
+        if rel.endswith(COMPRESSIBLE) and data:
+            for ext, compressed in precompress(data).items():
+                if compressed is not None and len(compressed) < len(data):
+                    with open(f"{target}.{ext}", 'wb') as f:
+                        f.write(compressed)
+                    entry[f'{ext}_bytes'] = len(compressed)
+        files.append(entry)
+
+    with open(os.path.join(out_dir, 'index.html'), encoding='utf-8') as f:
+        first = first_load_paths(f.read())
+    served = [entry for entry in files if entry['hashed_path'] is None]
+    return {'files': files, 'manifest': manifest, 'totals': summarize(served),
+            'first_load': summarize([entry for entry in served if entry['path'] in first])}
+
+def transfer_bytes(entry):
+    """Smallest encoding a client could be sent for a built file."""
+    return min(size for size in (entry['minified_bytes'], entry['gz_bytes'], entry['br_bytes']) if size is not None)
+
+def summarize(files):
+    """Source, minified and best-encoding byte totals for a list of file entries."""
+    source = sum(entry['source_bytes'] for entry in files)
+    transfer = sum(transfer_bytes(entry) for entry in files)
+    return {'files': len(files), 'source_bytes': source,
+            'minified_bytes': sum(entry['minified_bytes'] for entry in files),
+            'transfer_bytes': transfer, 'saved': 1 - transfer / source if source else 0.0}
+
+def print_report(report):
+    """Print per-file sizes and the totals."""
+    def size(value):
+        return f"{value:,}" if value is not None else '-'
+
+    print(f"{'file':<52} {'source':>9} {'minified':>9} {'gzip':>8} {'brotli':>8} {'saved':>6}")
+    for entry in report['files']:
+        if entry['hashed_path'] or (entry['minified_bytes'] == entry['source_bytes'] and entry['gz_bytes'] is None):
+            continue
+        print(f"{entry['path']:<52} {entry['source_bytes']:>9,} {entry['minified_bytes']:>9,} "
+              f"{size(entry['gz_bytes']):>8} {size(entry['br_bytes']):>8} "
+              f"{1 - transfer_bytes(entry) / entry['source_bytes']:>6.1%}")
+
+    for label, totals in (('All files', report['totals']), ('First load', report['first_load'])):
+        print(f"\n📦 {label} ({totals['files']} files): {totals['source_bytes']:,} → "
+              f"{totals['minified_bytes']:,} minified → {totals['transfer_bytes']:,} bytes transferred "
+              f"({totals['saved']:.1%} saved)")
+    print(f"🔖 {len(report['manifest'])} assets fingerprinted (see {ASSET_MANIFEST})")
+
+def main():
+    """Build the site into the output directory and report sizes."""
+    parser = argparse.ArgumentParser(description='Build the minified, precompressed site for deployment')
+    parser.add_argument('--root', default=SITE_ROOT, help='Repository root (default: this repository)')
+    parser.add_argument('--out', help=f'Output directory, replaced on every build (default: <root>/{BUILD_DIR})')
+    parser.add_argument('--json', help='Also write the size report to this JSON file')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        report = build_site(args.root, args.out)
+    except ValueError as e:
+        print(f"❌ Build failed: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print_report(report)
+    if brotli is None:
+        print("ℹ️  brotli module not installed; only .gz siblings written (pip install brotli)")
+    print(f"✅ Built {args.out or os.path.join(args.root, BUILD_DIR)} in {elapsed:.2f}s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Report saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Cheatsheet Video Catalogue
+
+Loads guides/cheatsheet-videos.json (the list of videos linked from each
+Linux cheatsheet) and indexes it by cheatsheet number, video ID and guide
+slug. Nothing is read at import time: the file is parsed on the first
+lookup and the result is cached for the life of the process, so adding a
+video is a data edit rather than a code change.
+
+Usage:
+    python cheatsheet_videos.py            # List the catalogue
+    python cheatsheet_videos.py --check    # Validate the data file, exit 1 on errors
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+
+CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'guides', 'cheatsheet-videos.json')
+VIDEO_FIELDS = ('title', 'url', 'full_url', 'filename')
+_SHORT_URL_ID = re.compile(r'^https://youtu\.be/([A-Za-z0-9_-]{11})$')
+
+class CatalogueError(ValueError):
+    """Raised when the catalogue data file is malformed."""
+
+def _build_index(entries, source):
+    """Validate raw catalogue entries and index them."""
+    by_number = {}
+    by_slug = {}
+    by_video_id = {}
+
+    if not isinstance(entries, list):
+        raise CatalogueError(f"{source}: expected a list of cheatsheets")
+
+    for entry in entries:
+        number = entry.get('cheatsheet')
+        if not isinstance(number, int):
+            raise CatalogueError(f"{source}: cheatsheet entry without an integer 'cheatsheet' number")
+        if number in by_number:
+            raise CatalogueError(f"{source}: cheatsheet {number} is listed more than once")
+
+        videos = []
+        for video in entry.get('videos', []):
+            missing = [field for field in VIDEO_FIELDS if not video.get(field)]
+            if missing:
+                raise CatalogueError(f"{source}: cheatsheet {number} video is missing {', '.join(missing)}")
+            match = _SHORT_URL_ID.match(video['url'])
+            if not match:
+                raise CatalogueError(f"{source}: cheatsheet {number} url is not a youtu.be short URL: {video['url']}")
+            video_id = match.group(1)
+            if video_id in by_video_id:
+                raise CatalogueError(f"{source}: video {video_id} appears in more than one cheatsheet")
+
+            videos.append({field: video[field] for field in VIDEO_FIELDS})
+            by_video_id[video_id] = {**videos[-1], 'cheatsheet': number, 'video_id': video_id}
+
+        slug = entry.get('slug') or f"linux-cheatsheet-{number}"
+        sheet = {
+            'cheatsheet': number,
+            'slug': slug,
+            'file': entry.get('file') or f"{slug}.html",
+            'videos': videos
+        }
+        by_number[number] = sheet
+        by_slug[slug] = sheet
+
+    return {'by_number': by_number, 'by_slug': by_slug, 'by_video_id': by_video_id}
+
+@lru_cache(maxsize=None)
+def load_catalogue(path=CATALOGUE_PATH):
+    """
+    Parse and index the catalogue data file (cached per path).
+
+    Args:
+        path (str): Path to cheatsheet-videos.json
+
+    Returns:
+        dict: 'by_number', 'by_slug' and 'by_video_id' indexes
+
+    Raises:
+        CatalogueError: If the file is malformed or has duplicate entries
+    """
+    with open(path, encoding='utf-8') as f:
+        try:
+            entries = json.load(f)
+        except json.JSONDecodeError as e:
+            raise CatalogueError(f"{path}: {e}") from e
+    return _build_index(entries, os.path.basename(path))
+
+def cheatsheet_numbers(path=CATALOGUE_PATH):
+    """Return the catalogued cheatsheet numbers in ascending order."""
+    return sorted(load_catalogue(path)['by_number'])
+
+def videos_for_cheatsheet(cheatsheet_num, path=CATALOGUE_PATH):
+    """
+    Get the videos for one cheatsheet.
+
+    Args:
+        cheatsheet_num (int): Cheatsheet number
+        path (str): Path to cheatsheet-videos.json
+
+    Returns:
+        list: Video dicts with 'title', 'url', 'full_url' and 'filename'
+              (empty if the cheatsheet is not catalogued)
+    """
+    sheet = load_catalogue(path)['by_number'].get(cheatsheet_num)
+    return [dict(video) for video in sheet['videos']] if sheet else []
+
+def cheatsheet_by_slug(slug, path=CATALOGUE_PATH):
+    """Look up a cheatsheet by guide slug (e.g. 'linux-cheatsheet-3'), or None."""
+    return load_catalogue(path)['by_slug'].get(slug)
+
+def video_by_id(video_id, path=CATALOGUE_PATH):
+    """Look up a video by its 11-character YouTube ID, or None. Includes 'cheatsheet'."""
+    return load_catalogue(path)['by_video_id'].get(video_id)
+
+def main():
+    """List or validate the cheatsheet video catalogue."""
+    parser = argparse.ArgumentParser(description='Inspect the cheatsheet video catalogue')
+    parser.add_argument('--check', action='store_true',
+                       help='Only validate the data file; exit 1 on errors')
+    parser.add_argument('--file', default=CATALOGUE_PATH,
+                       help='Catalogue file (default: guides/cheatsheet-videos.json)')
+
+    args = parser.parse_args()
+
+    try:
+        catalogue = load_catalogue(args.file)
+    except (OSError, CatalogueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.check:
+        print(f"✅ {len(catalogue['by_number'])} cheatsheets, {len(catalogue['by_video_id'])} videos")
+        return
+
+    for number in sorted(catalogue['by_number']):
+        sheet = catalogue['by_number'][number]
+        print(f"📄 {sheet['slug']} ({sheet['file']})")
+        for video in sheet['videos']:
+            print(f"   🎬 {video['url']}  {video['title']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Guide QR Code Embedding Tool
+
+Finds the QR code <svg> blocks in guides/*.html, works out which video each
+one belongs to from the YouTube link in the same table row, regenerates the
+QR codes through generate_qr_codes.py's batch pipeline, and rewrites only
+the blocks whose path data or viewBox is stale. Files are written atomically
+and only when something changed, and within a file only the path data and
+viewBox attribute values are replaced, so formatting, titles and classes
+stay exactly as they were.
+
+Usage:
+    python embed_guide_qr_codes.py                 # Refresh every guide in place
+    python embed_guide_qr_codes.py --check         # Report stale QR codes, exit 1 if any
+    python embed_guide_qr_codes.py guides/linux-cheatsheet-2.html
+
+Replaces the old workflow of copying SVGs out of qr_codes_output.txt by hand.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from fileutil import write_atomic
+from generate_qr_codes import GUIDES_DIR, SVG_BLOCK, PATH_DATA, generate_qr_batch, get_all_cheatsheet_videos
+from qr_svg_cache import QRSvgCache
+from youtube_url_shortener import extract_video_id
+
+VIEWBOX = re.compile(r'viewBox="([^"]*)"')
+YOUTUBE_VIDEO_ID = re.compile(r'(?:youtube\.com/watch\?(?:[^"\'\s<>]*?&(?:amp;)?)?v=|youtu\.be/)([A-Za-z0-9_-]{11})')
+
+def find_qr_blocks(html):
+    """
+    Locate QR code <svg> blocks and the video each one belongs to.
+
+    The owning video is the last YouTube link between the start of the
+    enclosing table row and the <svg>.
+
+    Args:
+        html (str): Guide HTML
+
+    Returns:
+        list: Dicts with 'video_id', 'path' / 'path_span' and
+              'viewbox' / 'viewbox_span' (spans are absolute offsets)
+    """
+    blocks = []
+    for match in SVG_BLOCK.finditer(html):
+        svg = match.group(0)
+        if '<title>QR Code' not in svg:
+            continue
+
+        row_start = html.rfind('<tr', 0, match.start())
+        video_id = None
+        for link in YOUTUBE_VIDEO_ID.finditer(html, max(row_start, 0), match.start()):
+            video_id = link.group(1)
+
+        path_match = PATH_DATA.search(svg)
+        viewbox_match = VIEWBOX.search(svg)
+        if not path_match or not viewbox_match:
+            continue
+
+        blocks.append({
+            'video_id': video_id,
+            'path': path_match.group(1),
+            'path_span': (match.start() + path_match.start(1), match.start() + path_match.end(1)),
+            'viewbox': viewbox_match.group(1),
+            'viewbox_span': (match.start() + viewbox_match.start(1), match.start() + viewbox_match.end(1))
+        })
+    return blocks
+
+def apply_edits(html, edits):
+    """Apply (start, end, replacement) edits, which must not overlap."""
+    for start, end, replacement in sorted(edits, reverse=True):
+        html = html[:start] + replacement + html[end:]
+    return html
+
+def refresh_guides(paths, videos, write=True, **generate_options):
+    """
+    Regenerate the QR codes embedded in guide files and rewrite stale ones.
+
+    Args:
+        paths (list): Guide HTML files
+        videos (list): Catalogue entries with 'url' and 'full_url'
+        write (bool): Rewrite stale files in place (False = report only)
+        **generate_options: Passed to generate_qr_batch() (ecl, box_size, cache, jobs, ...)
+
+    Returns:
+        list: One dict per file with 'path', 'blocks', 'stale', 'unknown',
+              'bytes_before', 'bytes_after' and 'written'
+    """
+    by_video_id = {}
+    for video in videos:
+        for url in (video['url'], video.get('full_url', '')):
+            video_id = extract_video_id(url)
+            if video_id:
+                by_video_id.setdefault(video_id, video)
+
+    documents = []
+    wanted = {}
+    for path in paths:
+        with open(path, encoding='utf-8', newline='') as f:
+            html = f.read()
+        blocks = find_qr_blocks(html)
+        documents.append((path, html, blocks))
+        for block in blocks:
+            video = by_video_id.get(block['video_id'])
+            if video is not None:
+                wanted.setdefault(video['url'], {'title': video['title'], 'url': video['url']})
+
+    # One batch for every QR code in every guide
+    generated = {}
+    for result in generate_qr_batch(list(wanted.values()), **generate_options):
+        if result['svg']:
+            generated[result['url']] = (
+                PATH_DATA.search(result['svg']).group(1),
+                VIEWBOX.search(result['svg']).group(1)
+            )
+
+    reports = []
+    for path, html, blocks in documents:
+        edits = []
+        stale = 0
+        unknown = 0
+        for block in blocks:
+            video = by_video_id.get(block['video_id'])
+            if video is None or video['url'] not in generated:
+                unknown += 1
+                continue
+            new_path, new_viewbox = generated[video['url']]
+            if block['path'] == new_path and block['viewbox'] == new_viewbox:
+                continue
+            stale += 1
+            if block['path'] != new_path:
+                edits.append((*block['path_span'], new_path))
+            if block['viewbox'] != new_viewbox:
+                edits.append((*block['viewbox_span'], new_viewbox))
+
+        updated = apply_edits(html, edits) if edits else html
+        written = False
+        if write and edits:
+            write_atomic(path, updated)
+            written = True
+
+        reports.append({
+            'path': path,
+            'blocks': len(blocks),
+            'stale': stale,
+            'unknown': unknown,
+            'bytes_before': len(html.encode('utf-8')),
+            'bytes_after': len(updated.encode('utf-8')),
+            'written': written
+        })
+    return reports
+
+def main():
+    """Refresh embedded QR codes in guide HTML files."""
+    parser = argparse.ArgumentParser(description='Regenerate and embed QR codes in guide HTML files')
+    parser.add_argument('files', nargs='*',
+                       help='Guide HTML files (default: every guides/*.html)')
+    parser.add_argument('--check', action='store_true',
+                       help='Only report stale QR codes; exit 1 if any are found')
+    parser.add_argument('--ecl', default='L', choices=['L', 'M', 'Q', 'H'],
+                       help='Error Correction Level (default: L)')
+    parser.add_argument('--box-size', type=int, default=8,
+                       help='Box size in pixels (default: 8)')
+    parser.add_argument('--border', type=int, default=2,
+                       help='Border size in modules (default: 2)')
+    parser.add_argument('--optimize', action=argparse.BooleanOptionalAction, default=True,
+                       help='Embed the minimal, decode-verified SVG path (default: on)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Worker processes for encoding (default: 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always re-encode instead of using the on-disk SVG cache')
+
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(os.path.join(GUIDES_DIR, '*.html')))
+    cache = None if args.no_cache else QRSvgCache()
+
+    start = time.perf_counter()
+    reports = refresh_guides(
+        paths,
+        get_all_cheatsheet_videos(),
+        write=not args.check,
+        ecl=args.ecl,
+        box_size=args.box_size,
+        border=args.border,
+        optimize=args.optimize,
+        jobs=args.jobs,
+        cache=cache
+    )
+    elapsed = time.perf_counter() - start
+
+    total_stale = 0
+    for report in reports:
+        if not report['blocks']:
+            continue
+        name = os.path.basename(report['path'])
+        total_stale += report['stale']
+        delta = report['bytes_after'] - report['bytes_before']
+        if report['stale'] == 0:
+            print(f"✅ {name}: {report['blocks']} QR codes up to date")
+        elif report['written']:
+            print(f"🔄 {name}: refreshed {report['stale']} of {report['blocks']} QR codes ({delta:+,} bytes)")
+        else:
+            print(f"⚠️  {name}: {report['stale']} of {report['blocks']} QR codes stale ({delta:+,} bytes if refreshed)")
+        if report['unknown']:
+            print(f"   ❓ {report['unknown']} QR codes have no matching video in the catalogue")
+
+    print(f"\n⏱️  Checked {len(reports)} files in {elapsed * 1000:.1f} ms")
+
+    if args.check and total_stale:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+File Helpers
+
+Standard-library-only helpers shared by the site build scripts. Keep this
+module free of third-party imports: the deploy workflow runs the build
+scripts with nothing but brotli installed, so anything they import must
+not pull in qrcode, numpy or Pillow.
+"""
+
+import os
+import tempfile
+
+def write_atomic(path, content):
+    """Write content to path via a temporary file and rename, keeping the file mode."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.html')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
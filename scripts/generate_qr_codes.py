@@ -9,6 +9,9 @@ Usage:
     python generate_qr_codes.py                    # Generate for cheatsheet 1 (default)
     python generate_qr_codes.py --cheatsheet 2     # Generate for cheatsheet 2
     python generate_qr_codes.py --cheatsheet 4     # Generate for cheatsheet 4
+    python generate_qr_codes.py --all              # Generate for every cheatsheet in one run
+    python generate_qr_codes.py --manifest urls.txt  # Generate for a list of URLs
+    python generate_qr_codes.py --all --jobs 4 --no-cache  # Encode on 4 processes
 
 Features:
 - Low Error Correction Level (ECL) for smaller QR codes
@@ -16,18 +19,87 @@ Features:
 - Minimal border for tight spacing
 - SVG output for direct HTML embedding
 - Configurable box size and border settings
-- Support for multiple cheatsheet types
+- Support for multiple cheatsheet types, catalogued in guides/cheatsheet-videos.json
+- Path data rendered directly from the module matrix with NumPy, one
+  rectangle per horizontal run of dark modules (see qr_svg_path.py)
+- Batch mode sharing one encoder across all URLs, with per-item timing
+- Content-addressed on-disk SVG cache (see qr_svg_cache.py); --no-cache to bypass
+- Minimal path optimizer (relative commands, trimmed numbers) that decodes
+  every optimized code back to its URL and reports bytes saved per guide
+- --jobs N fans encoding out to a process pool; output order never changes
 """
 
 import qrcode
-import qrcode.image.svg
 import base64
 from io import BytesIO
 import argparse
 import sys
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_qr_code(data, ecl='L', box_size=8, border=2, fill_color="black", back_color="#10b981"):
+from cheatsheet_videos import cheatsheet_numbers, videos_for_cheatsheet
+from qr_svg_cache import QRSvgCache, cache_key, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from qr_decode import QRDecodeError, decode_matrix
+from qr_svg_path import module_matrix, path_to_matrix, render_optimized_path, render_path
+
+GUIDES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'guides')
+SVG_BLOCK = re.compile(r'<svg\b.*?</svg>', re.S)
+PATH_DATA = re.compile(r'<path d="([^"]*)"')
+
+def _new_qr(ecl='L', box_size=8, border=2):
+    """Create a QRCode encoder configured for the given ECL, box size and border."""
+    return qrcode.QRCode(
+        version=1,
+        error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{ecl.upper()}'),
+        box_size=box_size,
+        border=border,
+    )
+
+def _encode_svg(qr, data, box_size, border, back_color, optimize=False):
+    """
+    Encode data with an existing QRCode instance and return SVG markup.
+    
+    The encoder is reset before use, so one instance can be shared across
+    many URLs without leaking the previous symbol's version or modules.
+    With optimize=True the minimal path is used, and it is decoded back
+    before returning; a mismatch raises ValueError.
+    """
+    qr.clear()
+    qr.version = 1
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    # Build the path straight from the module matrix (no SVG render + regex round trip)
+    matrix = module_matrix(qr.modules)
+    if optimize:
+        path_data = render_optimized_path(matrix, box_size, border)
+        rendered = path_to_matrix(path_data, qr.modules_count, box_size, border)
+        try:
+            decoded = decode_matrix(rendered)
+        except QRDecodeError as e:
+            raise ValueError(f"Optimized QR code does not decode: {e}")
+        if decoded != data:
+            raise ValueError(f"Optimized QR code decodes to {decoded!r}, expected {data!r}")
+    else:
+        path_data = render_path(matrix, box_size, border)
+    
+    # Calculate dimensions (box_size * modules + border * 2 * box_size)
+    modules = qr.modules_count
+    total_size = modules * box_size + border * 2 * box_size
+    
+    # Create custom SVG with our styling
+    # Display size: 120x120px, but internal coordinates scaled down by 10
+    # This matches the pattern used in cheatsheet 4
+    scaled_size = total_size / 10
+    return f'''<svg width="120" height="120" viewBox="0 0 {scaled_size} {scaled_size}" xmlns="http://www.w3.org/2000/svg" class="border border-emerald-500 rounded" style="background-color: {back_color};">
+  <path d="{path_data}" fill="#000000" fill-opacity="1" fill-rule="nonzero" stroke="none"/>
+  <title>QR Code</title>
+</svg>'''
+
+def generate_qr_code(data, ecl='L', box_size=8, border=2, fill_color="black", back_color="#10b981", cache=None,
+                     optimize=False):
     """
     Generate a QR code and return it as SVG data.
     
@@ -38,150 +110,238 @@ def generate_qr_code(data, ecl='L', box_size=8, border=2, fill_color="black", ba
         border (int): Border size in modules
         fill_color (str): Color of QR code modules
         back_color (str): Background color
+        cache (QRSvgCache): Optional on-disk cache consulted before encoding
+        optimize (bool): Emit the minimal, decode-verified path
     
     Returns:
         str: SVG data ready for HTML embedding
     """
     try:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{ecl.upper()}'),
-            box_size=box_size,
-            border=border,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        # Create SVG factory with custom colors
-        factory = qrcode.image.svg.SvgPathImage
-        img = qr.make_image(image_factory=factory)
-        
-        # Get SVG content
-        svg_content = img.to_string().decode('utf-8')
-        
-        # Extract the path data from the SVG
-        import re
-        path_match = re.search(r'<path d="([^"]*)"', svg_content)
-        if not path_match:
-            raise ValueError("Could not extract path data from SVG")
-        
-        path_data = path_match.group(1)
-        
-        # Calculate dimensions (box_size * modules + border * 2 * box_size)
-        modules = qr.modules_count
-        total_size = modules * box_size + border * 2 * box_size
-        
-        # Create custom SVG with our styling
-        # Display size: 120x120px, but internal coordinates scaled down by 10
-        # This matches the pattern used in cheatsheet 4
-        scaled_size = total_size / 10
-        svg = f'''<svg width="120" height="120" viewBox="0 0 {scaled_size} {scaled_size}" xmlns="http://www.w3.org/2000/svg" class="border border-emerald-500 rounded" style="background-color: {back_color};">
-  <path d="{path_data}" fill="#000000" fill-opacity="1" fill-rule="nonzero" stroke="none"/>
-  <title>QR Code</title>
-</svg>'''
+        if cache is None:
+            return _encode_svg(_new_qr(ecl, box_size, border), data, box_size, border, back_color, optimize)
         
+        key = cache_key(data, ecl, box_size, border, fill_color, back_color, optimize)
+        svg = cache.get(key)
+        if svg is None:
+            svg = _encode_svg(_new_qr(ecl, box_size, border), data, box_size, border, back_color, optimize)
+            cache.put(key, svg)
         return svg
     
     except Exception as e:
         print(f"Error generating QR code: {e}")
         return None
 
+def _encode_timed(qr, data, box_size, border, back_color, optimize=False):
+    """Encode one URL and return (svg, error, seconds); never raises."""
+    start = time.perf_counter()
+    try:
+        svg, error = _encode_svg(qr, data, box_size, border, back_color, optimize), None
+    except Exception as e:
+        svg, error = None, str(e)
+    return svg, error, time.perf_counter() - start
+
+# Per-process encoder state for --jobs N, set up once by _init_worker()
+_worker_state = {}
+
+def _init_worker(ecl, box_size, border, back_color, optimize):
+    """Process pool initializer: build one shared encoder per worker."""
+    _worker_state.update(
+        qr=_new_qr(ecl, box_size, border),
+        box_size=box_size,
+        border=border,
+        back_color=back_color,
+        optimize=optimize
+    )
+
+def _encode_in_worker(data):
+    """Process pool task: encode one URL with the worker's shared encoder."""
+    state = _worker_state
+    return _encode_timed(state['qr'], data, state['box_size'], state['border'], state['back_color'],
+                         state['optimize'])
+
+def generate_qr_batch(items, ecl='L', box_size=8, border=2, fill_color="black", back_color="#10b981",
+                      cache=None, jobs=1, optimize=False):
+    """
+    Generate QR codes for many items through one shared encoder.
+    
+    Args:
+        items (list): Dicts with at least a 'url' key (e.g. from get_cheatsheet_videos())
+        ecl (str): Error Correction Level ('L', 'M', 'Q', 'H')
+        box_size (int): Size of each module in pixels
+        border (int): Border size in modules
+        fill_color (str): Color of QR code modules
+        back_color (str): Background color
+        cache (QRSvgCache): Optional on-disk cache consulted before encoding
+        jobs (int): Worker processes for encoding cache misses (1 = sequential)
+        optimize (bool): Emit the minimal, decode-verified path
+    
+    Returns:
+        list: One dict per item, in input order, with 'svg', 'length',
+              'seconds' and 'cached' added ('svg' is None if encoding failed)
+    """
+    results = [None] * len(items)
+    keys = [None] * len(items)
+    pending = []
+    
+    # Serve cache hits in this process; only misses are encoded
+    for index, item in enumerate(items):
+        if cache is not None:
+            start = time.perf_counter()
+            keys[index] = cache_key(item['url'], ecl, box_size, border, fill_color, back_color, optimize)
+            svg = cache.get(keys[index])
+            if svg is not None:
+                results[index] = (svg, None, time.perf_counter() - start, True)
+                continue
+        pending.append(index)
+    
+    urls = [items[index]['url'] for index in pending]
+    if jobs > 1 and len(urls) > 1:
+        # executor.map() yields in submission order, so output never depends on scheduling
+        chunksize = max(1, len(urls) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(ecl, box_size, border, back_color, optimize)) as executor:
+            encoded = list(executor.map(_encode_in_worker, urls, chunksize=chunksize))
+    else:
+        qr = _new_qr(ecl, box_size, border)
+        encoded = [_encode_timed(qr, url, box_size, border, back_color, optimize) for url in urls]
+    
+    for index, (svg, error, seconds) in zip(pending, encoded):
+        if error is not None:
+            print(f"Error generating QR code for {items[index]['url']}: {error}")
+        elif keys[index] is not None:
+            cache.put(keys[index], svg)
+        results[index] = (svg, error, seconds, False)
+    
+    return [
+        {
+            **item,
+            'svg': svg,
+            'length': len(svg) if svg else 0,
+            'seconds': seconds,
+            'cached': cached
+        }
+        for item, (svg, _, seconds, cached) in zip(items, results)
+    ]
+
 def get_cheatsheet_videos(cheatsheet_num):
-    """Get video data for specific cheatsheet."""
-    cheatsheets = {
-        1: [
-            {
-                'title': 'Linux Commands and File Structure',
-                'url': 'https://youtu.be/N9j--n-zGgc',
-                'full_url': 'https://www.youtube.com/watch?v=N9j--n-zGgc&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M',
-                'filename': 'video1_qr'
-            },
-            {
-                'title': 'File System Navigation from the Terminal',
-                'url': 'https://youtu.be/lI0mUMqBesU',
-                'full_url': 'https://www.youtube.com/watch?v=lI0mUMqBesU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=3',
-                'filename': 'video2_qr'
-            }
-        ],
-        2: [
-            {
-                'title': 'Creating & Moving Files & Folders',
-                'url': 'https://youtu.be/7JYJO_D8zVs',
-                'full_url': 'https://www.youtube.com/watch?v=7JYJO_D8zVs&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=4',
-                'filename': 'video1_qr'
-            },
-            {
-                'title': 'Advanced File Operations',
-                'url': 'https://youtu.be/gSVg40u0fZE',
-                'full_url': 'https://www.youtube.com/watch?v=gSVg40u0fZE&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=5',
-                'filename': 'video2_qr'
-            }
-        ],
-        3: [
-            {
-                'title': 'Files, Deleting, History & Redirects',
-                'url': 'https://youtu.be/twREXouRxns',
-                'full_url': 'https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6',
-                'filename': 'video1_qr'
-            },
-            {
-                'title': 'Advanced File Operations & Redirects',
-                'url': 'https://youtu.be/2DcDQe8idtU',
-                'full_url': 'https://www.youtube.com/watch?v=2DcDQe8idtU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=7',
-                'filename': 'video2_qr'
-            }
-        ],
-        4: [
-            {
-                'title': 'Text Editors & GUI Programs',
-                'url': 'https://youtu.be/rR_n2ciilrc',
-                'full_url': 'https://www.youtube.com/watch?v=rR_n2ciilrc&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=8',
-                'filename': 'video1_qr'
-            },
-            {
-                'title': 'File Deletion & Terminal Management',
-                'url': 'https://youtu.be/l0d7ks9ZkjU',
-                'full_url': 'https://www.youtube.com/watch?v=l0d7ks9ZkjU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=9',
-                'filename': 'video2_qr'
-            }
-        ],
-        3: [
-            {
-                'title': 'Files, Deleting, History & Redirects',
-                'url': 'https://youtu.be/twREXouRxns',
-                'full_url': 'https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6',
-                'filename': 'video1_qr'
-            },
-            {
-                'title': 'Advanced File Operations & Redirects',
-                'url': 'https://youtu.be/2DcDQe8idtU',
-                'full_url': 'https://www.youtube.com/watch?v=2DcDQe8idtU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=7',
-                'filename': 'video2_qr'
-            }
-        ],
-        5: [
-            {
-                'title': 'Users, Permissions & Sudo (Part 1)',
-                'url': 'https://youtu.be/y6-e233rrQE',
-                'full_url': 'https://www.youtube.com/watch?v=y6-e233rrQE&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=10',
-                'filename': 'video1_qr'
-            },
-            {
-                'title': 'Users, Permissions & Sudo (Part 2)',
-                'url': 'https://youtu.be/to0GrfGERK0',
-                'full_url': 'https://www.youtube.com/watch?v=to0GrfGERK0&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=11',
-                'filename': 'video2_qr'
-            }
-        ]
-    }
-    return cheatsheets.get(cheatsheet_num, [])
+    """Get video data for specific cheatsheet (from guides/cheatsheet-videos.json)."""
+    return videos_for_cheatsheet(cheatsheet_num)
+
+def get_all_cheatsheet_videos():
+    """Get video data for every cheatsheet, tagged with its cheatsheet number."""
+    videos = []
+    for cheatsheet_num in cheatsheet_numbers():
+        for video in get_cheatsheet_videos(cheatsheet_num):
+            videos.append({**video, 'cheatsheet': cheatsheet_num})
+    return videos
+
+def load_manifest(path):
+    """
+    Load a manifest of URLs to encode.
+    
+    The manifest is a plain text file with one URL per line, optionally
+    followed by a tab and a title. Blank lines and lines starting with '#'
+    are ignored.
+    
+    Args:
+        path (str): Path to the manifest file
+    
+    Returns:
+        list: Item dicts with 'title', 'url' and 'filename' keys
+    """
+    items = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            url, _, title = line.partition('\t')
+            url = url.strip()
+            items.append({
+                'title': title.strip() or url,
+                'url': url,
+                'filename': f'url{len(items) + 1}_qr'
+            })
+    return items
+
+def embedded_qr_paths(html):
+    """Return the path data of every QR code <svg> embedded in a guide's HTML."""
+    paths = []
+    for svg in SVG_BLOCK.findall(html):
+        if '<title>QR Code' not in svg:
+            continue
+        match = PATH_DATA.search(svg)
+        if match:
+            paths.append(match.group(1))
+    return paths
+
+def report_guide_savings(codes, guides_dir=GUIDES_DIR):
+    """
+    Print path bytes currently embedded in each guide versus the generated paths.
+    
+    Args:
+        codes (list): Generated results with 'svg' and 'cheatsheet' keys
+        guides_dir (str): Directory holding linux-cheatsheet-N.html
+    
+    Returns:
+        dict: {cheatsheet_num: (embedded_bytes, generated_bytes)}
+    """
+    by_cheatsheet = {}
+    for code in codes:
+        if code.get('cheatsheet') is None:
+            continue
+        path_data = PATH_DATA.search(code['svg']).group(1)
+        by_cheatsheet.setdefault(code['cheatsheet'], []).append(len(path_data))
+    
+    savings = {}
+    if not by_cheatsheet:
+        return savings
+    
+    print("📉 QR path bytes per guide (embedded → generated):")
+    for cheatsheet_num, lengths in sorted(by_cheatsheet.items()):
+        guide = os.path.join(guides_dir, f'linux-cheatsheet-{cheatsheet_num}.html')
+        try:
+            with open(guide, encoding='utf-8') as f:
+                embedded = sum(len(p) for p in embedded_qr_paths(f.read()))
+        except OSError:
+            print(f"   linux-cheatsheet-{cheatsheet_num}.html: not found")
+            continue
+        generated = sum(lengths)
+        saved = embedded - generated
+        percent = (saved / embedded * 100) if embedded else 0.0
+        savings[cheatsheet_num] = (embedded, generated)
+        print(f"   linux-cheatsheet-{cheatsheet_num}.html: {embedded:,} → {generated:,} bytes "
+              f"(saved {saved:,}, {percent:.1f}%)")
+    print()
+    return savings
+
+def write_output(path, heading, codes):
+    """Write generated SVG QR codes to a text file, grouped by cheatsheet when known."""
+    with open(path, 'w') as f:
+        f.write(f"# {heading}\n")
+        f.write("# Generated with generate_qr_codes.py (SVG format)\n\n")
+        
+        current_cheatsheet = None
+        for code in codes:
+            if code.get('cheatsheet') is not None and code['cheatsheet'] != current_cheatsheet:
+                current_cheatsheet = code['cheatsheet']
+                f.write(f"## Linux Cheatsheet {current_cheatsheet}\n\n")
+            f.write(f"# {code['title']}\n")
+            f.write(f"# URL: {code['url']}\n")
+            f.write(f"# Length: {code['length']} characters\n")
+            f.write(f"{code['svg']}\n\n")
 
 def main():
     """Main function to generate QR codes for educational document videos."""
     
     parser = argparse.ArgumentParser(description='Generate QR codes for educational document videos')
-    parser.add_argument('--cheatsheet', type=int, choices=[1, 2, 3, 4, 5], default=1,
-                       help='Cheatsheet number (1, 2, 3, 4, or 5, default: 1)')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--cheatsheet', type=int, choices=cheatsheet_numbers(), default=1,
+                       help='Cheatsheet number from guides/cheatsheet-videos.json (default: 1)')
+    source.add_argument('--all', action='store_true',
+                       help='Generate QR codes for every cheatsheet in one run')
+    source.add_argument('--manifest', metavar='FILE',
+                       help='Generate QR codes for the URLs listed in FILE (one per line)')
     parser.add_argument('--ecl', default='L', choices=['L', 'M', 'Q', 'H'],
                        help='Error Correction Level (default: L)')
     parser.add_argument('--box-size', type=int, default=8,
@@ -194,64 +354,105 @@ def main():
                        help='Background color (default: #10b981 - emerald green)')
     parser.add_argument('--output', '-o', default='qr_codes_output.txt',
                        help='Output file for base64 QR codes (default: qr_codes_output.txt)')
+    parser.add_argument('--optimize', action=argparse.BooleanOptionalAction, default=True,
+                       help='Emit the minimal, decode-verified SVG path (default: on)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Worker processes for encoding (default: 1 = sequential, 0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always re-encode instead of using the on-disk SVG cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'SVG cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                       help='Evict least recently used cache entries above this size (default: 16)')
+    parser.add_argument('--clear-cache', action='store_true',
+                       help='Remove every cached SVG and exit')
     
     args = parser.parse_args()
     
-    print(f"🎯 Generating QR codes for Linux Cheatsheet {args.cheatsheet}...")
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 or a positive number')
+    jobs = args.jobs or os.cpu_count() or 1
+    
+    cache = None
+    if args.clear_cache or not args.no_cache:
+        cache = QRSvgCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    
+    if args.clear_cache:
+        removed = cache.clear()
+        print(f"🗑️  Removed {removed} cached QR codes from {args.cache_dir}")
+        return
+    
+    if args.manifest:
+        heading = f"QR Codes for {args.manifest}"
+        try:
+            items = load_manifest(args.manifest)
+        except OSError as e:
+            print(f"❌ Could not read manifest: {e}")
+            sys.exit(1)
+    elif args.all:
+        heading = "QR Codes for all Linux Cheatsheets"
+        items = get_all_cheatsheet_videos()
+    else:
+        heading = f"QR Codes for Linux Cheatsheet {args.cheatsheet}"
+        items = get_cheatsheet_videos(args.cheatsheet)
+    
+    print(f"🎯 Generating {heading}...")
     print(f"   ECL: {args.ecl}")
     print(f"   Box size: {args.box_size}px")
     print(f"   Border: {args.border} modules")
     print(f"   Fill color: {args.fill_color}")
     print(f"   Background color: {args.back_color}")
+    print(f"   Optimized path: {'on' if args.optimize else 'off'}")
+    print(f"   Jobs: {jobs}")
     print()
     
-    # Get videos for selected cheatsheet
-    videos = get_cheatsheet_videos(args.cheatsheet)
-    
-    if not videos:
-        print(f"❌ No videos found for cheatsheet {args.cheatsheet}")
+    if not items:
+        print("❌ No URLs found to encode")
         sys.exit(1)
     
+    batch_start = time.perf_counter()
+    results = generate_qr_batch(
+        items,
+        ecl=args.ecl,
+        box_size=args.box_size,
+        border=args.border,
+        fill_color=args.fill_color,
+        back_color=args.back_color,
+        cache=cache,
+        jobs=jobs,
+        optimize=args.optimize
+    )
+    batch_seconds = time.perf_counter() - batch_start
+    
     generated_codes = []
     
-    for i, video in enumerate(videos, 1):
-        print(f"📹 Generating QR code {i}: {video['title']}")
-        print(f"   URL: {video['url']}")
-        
-        qr_svg = generate_qr_code(
-            data=video['url'],
-            ecl=args.ecl,
-            box_size=args.box_size,
-            border=args.border,
-            fill_color=args.fill_color,
-            back_color=args.back_color
-        )
-        
-        if qr_svg:
-            generated_codes.append({
-                'title': video['title'],
-                'url': video['url'],
-                'filename': video['filename'],
-                'svg': qr_svg,
-                'length': len(qr_svg)
-            })
-            print(f"   ✅ Generated successfully ({len(qr_svg)} characters)")
+    for i, result in enumerate(results, 1):
+        print(f"📹 QR code {i}: {result['title']}")
+        print(f"   URL: {result['url']}")
+        if result['svg']:
+            generated_codes.append(result)
+            source = "cache hit" if result['cached'] else "encoded"
+            print(f"   ✅ Generated successfully ({result['length']} characters, {result['seconds'] * 1000:.2f} ms, {source})")
         else:
             print(f"   ❌ Failed to generate QR code")
         print()
     
+    throughput = len(results) / batch_seconds if batch_seconds > 0 else float('inf')
+    print(f"⏱️  Generated {len(results)} QR codes in {batch_seconds * 1000:.1f} ms ({throughput:.1f} codes/s)")
+    if cache is not None:
+        print(f"   Cache: {cache.hits} hits, {cache.misses} misses ({args.cache_dir})")
+    print()
+    
+    if not args.manifest:
+        cheatsheet_codes = [{'cheatsheet': args.cheatsheet, **code} for code in generated_codes]
+        report_guide_savings(cheatsheet_codes)
+    
+    failed = len(results) - len(generated_codes)
+    
     # Save to output file
     if generated_codes:
         try:
-            with open(args.output, 'w') as f:
-                f.write(f"# QR Codes for Linux Cheatsheet {args.cheatsheet}\n")
-                f.write("# Generated with generate_qr_codes.py (SVG format)\n\n")
-                
-                for code in generated_codes:
-                    f.write(f"# {code['title']}\n")
-                    f.write(f"# URL: {code['url']}\n")
-                    f.write(f"# Length: {code['length']} characters\n")
-                    f.write(f"{code['svg']}\n\n")
+            write_output(args.output, heading, generated_codes)
             
             print(f"📁 QR codes saved to: {args.output}")
             print(f"✅ Generated {len(generated_codes)} QR codes successfully!")
@@ -265,6 +466,10 @@ def main():
         except Exception as e:
             print(f"❌ Error saving output file: {e}")
             sys.exit(1)
+        
+        if failed:
+            print(f"\n❌ {failed} QR codes failed to generate or verify")
+            sys.exit(1)
     else:
         print("❌ No QR codes were generated successfully")
         sys.exit(1)
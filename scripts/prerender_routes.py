@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Route Fragment Prerenderer
+
+The router in index.html renders #/guides/<file> and #/blogs/<file> by
+fetching the standalone page, cutting out its <body> with a regex and
+injecting it. This script does that extraction once at build time and
+writes the result to prerendered/guides/<file> and prerendered/blogs/<file>
+in the build directory, so each navigation downloads only the markup that
+is shown.
+
+A fragment is exactly what the router injected from the full page. Two
+exceptions:
+- Repeated identical <style> blocks are kept only once.
+- <style> blocks identical to one index.html already has are dropped,
+  because the shell's copy already applies.
+
+The router falls back to the full page when a fragment is missing, so the
+site keeps working when served straight from the repository without a build.
+Fragments are never written into the repository root by default: the
+router prefers them there, and stale ones would hide later page edits.
+
+Usage:
+    python prerender_routes.py                    # Build ../build/prerendered
+    python prerender_routes.py --out /tmp/site    # Build elsewhere
+    python prerender_routes.py --check            # Exit 1 if fragments are missing or stale
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+import time
+
+from fileutil import write_atomic
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+ROUTE_DIRS = ('guides', 'blogs')
+BUILD_DIR = 'build'
+OUT_DIR = 'prerendered'
+
+# Same extraction as the router: greedy, case-insensitive, across lines
+BODY = re.compile(r'<body[^>]*>([\s\S]*)</body>', re.I)
+STYLE_BLOCK = re.compile(r'<style\b[^>]*>[\s\S]*?</style>', re.I)
+
+def extract_body(html):
+    """Return what the router injects for a page: the <body> contents, or the whole text without one."""
+    match = BODY.search(html)
+    return match.group(1) if match else html
+
+def style_key(block):
+    """Identity of a <style> block, ignoring whitespace differences."""
+    return hashlib.sha256(' '.join(block.split()).encode('utf-8')).hexdigest()
+
+def shell_style_keys(shell_html):
+    """Keys of every <style> block in the shell page (index.html)."""
+    return {style_key(block) for block in STYLE_BLOCK.findall(shell_html)}
+
+def dedupe_styles(fragment, known=frozenset()):
+    """
+    Keep the first copy of each distinct <style> block in a fragment.
+
+    Args:
+        fragment (str): Body HTML
+        known (set): style_key() values already applied by the shell; these
+                     blocks are dropped entirely
+
+    Returns:
+        tuple: (fragment, number of blocks removed)
+    """
+    seen = set(known)
+    removed = 0
+
+    def keep_first(match):
+        nonlocal removed
+        key = style_key(match.group(0))
+        if key in seen:
+            removed += 1
+            return ''
+        seen.add(key)
+        return match.group(0)
+
+    return STYLE_BLOCK.sub(keep_first, fragment), removed
+
+def prerender_page(html, known_styles=frozenset()):
+    """
+    Turn a standalone guide or blog page into its route fragment.
+
+    Args:
+        html (str): Full page
+        known_styles (set): style_key() values of the shell's <style> blocks
+
+    Returns:
+        tuple: (fragment, <style> blocks removed)
+    """
+    return dedupe_styles(extract_body(html), known_styles)
+
+def route_pages(root=SITE_ROOT):
+    """Every routed page as (route path relative to root, absolute path), sorted."""
+    pages = []
+    for directory in ROUTE_DIRS:
+        for path in sorted(glob.glob(os.path.join(root, directory, '*.html'))):
+            pages.append((f"{directory}/{os.path.basename(path)}", path))
+    return pages
+
+def prerender_site(root=SITE_ROOT, out_dir=None, write=True):
+    """
+    Prerender every guide and blog page.
+
+    Args:
+        root (str): Site root containing index.html, guides/ and blogs/
+        out_dir (str): Output directory (default: <root>/build/prerendered)
+        write (bool): Write changed fragments; False only compares against
+                      what is on disk
+
+    Returns:
+        list: Per page dicts with 'route', 'source_bytes', 'fragment_bytes',
+              'styles_removed' and 'stale' (fragment on disk missing or different)
+    """
+    out_dir = out_dir or os.path.join(root, BUILD_DIR, OUT_DIR)
+    with open(os.path.join(root, 'index.html'), encoding='utf-8') as f:
+        known = shell_style_keys(f.read())
+
+    results = []
+    for route, path in route_pages(root):
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        fragment, removed = prerender_page(source, known)
+
+        target = os.path.join(out_dir, *route.split('/'))
+        existing = None
+        if os.path.exists(target):
+            with open(target, encoding='utf-8') as f:
+                existing = f.read()
+        if write and existing != fragment:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            write_atomic(target, fragment)
+
+        results.append({'route': route, 'source_bytes': len(source.encode('utf-8')),
+                        'fragment_bytes': len(fragment.encode('utf-8')), 'styles_removed': removed,
+                        'stale': existing != fragment})
+    return results
+
+def main():
+    """Build the route fragments for guides and blogs."""
+    parser = argparse.ArgumentParser(description='Prerender guide and blog pages into router body fragments')
+    parser.add_argument('--root', default=SITE_ROOT, help='Site root (default: repository root)')
+    parser.add_argument('--out', help=f'Output directory (default: <root>/{BUILD_DIR}/{OUT_DIR})')
+    parser.add_argument('--check', action='store_true',
+                       help='Write nothing; exit 1 if any fragment is missing or out of date')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = prerender_site(args.root, args.out, write=not args.check)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'route':<45} {'page':>8} {'fragment':>9} {'saved':>6}")
+    for r in results:
+        flag = ' (stale)' if args.check and r['stale'] else ''
+        print(f"{r['route']:<45} {r['source_bytes']:>8,} {r['fragment_bytes']:>9,} "
+              f"{1 - r['fragment_bytes'] / r['source_bytes']:>6.1%}{flag}")
+
+    source = sum(r['source_bytes'] for r in results)
+    fragments = sum(r['fragment_bytes'] for r in results)
+    print(f"\n📦 {len(results)} fragments: {fragments:,} bytes instead of {source:,} "
+          f"({1 - fragments / source:.1%} less per navigation) in {elapsed:.2f}s" if results else
+          "ℹ️  No guide or blog pages found")
+    removed = sum(r['styles_removed'] for r in results)
+    if removed:
+        print(f"🎨 {removed} duplicate <style> block(s) removed")
+
+    if args.check:
+        stale = [r['route'] for r in results if r['stale']]
+        if stale:
+            print(f"❌ {len(stale)} fragment(s) missing or out of date; run prerender_routes.py")
+            sys.exit(1)
+        print("✅ All fragments up to date")
+
+if __name__ == "__main__":
+    main()
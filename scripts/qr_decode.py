@@ -0,0 +1,1025 @@
+#!/usr/bin/env python3
+"""
+Local QR Code Decoder
+
+Decodes a QR code module matrix back to its text without any network
+service or native library: format information is read and BCH-corrected,
+the data mask is removed, codewords are de-interleaved and Reed-Solomon
+corrected per block, and the bit stream is parsed (numeric, alphanumeric,
+byte, ECI and kanji segments).
+
+This is what generate_qr_codes.py uses to prove an optimized SVG path still
+carries the original URL.
+
+Images (PNG bytes, files, PIL images or NumPy arrays) are decoded by
+binarizing with Otsu's threshold, locating the three finder patterns by
+their 1:1:3:1:1 run ratio, and sampling the module grid through the affine
+transform they define. decode() is the common entry point for tests: it
+uses this local backend, or zbar via pyzbar when that is installed and
+requested (or chosen by 'auto').
+
+DecoderProcess keeps one decoder worker process alive and streams raw
+grayscale frames to it, so callers that want an out-of-process decoder
+(e.g. zbar isolated from the test runner) pay one process start for any
+number of images instead of one per image.
+
+Usage:
+    from qr_decode import decode, decode_matrix
+    text = decode_matrix(matrix)   # 2-D bool array, True = dark, no quiet zone
+    text = decode("qr.png")        # Image path, bytes, PIL image or array; None if unreadable
+
+    with DecoderProcess() as decoder:
+        texts = decoder.decode_many(images)
+
+    python qr_decode.py qr1.png qr2.png   # Decode image files from the command line
+"""
+
+import argparse
+import io
+import os
+import struct
+import subprocess
+import sys
+import threading
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+class QRDecodeError(ValueError):
+    """Raised when a module matrix cannot be decoded."""
+
+# Error correction level by the 2-bit value stored in the format information
+ECL_BY_FORMAT_BITS = {1: 'L', 0: 'M', 3: 'Q', 2: 'H'}
+
+# ISO/IEC 18004 Table 9: EC codewords per block and number of blocks, indexed by version
+ECC_CODEWORDS_PER_BLOCK = {
+    'L': (-1, 7, 10, 15, 20, 26, 18, 20, 24, 30, 18, 20, 24, 26, 30, 22, 24, 28, 30, 28, 28,
+          28, 28, 30, 30, 26, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+    'M': (-1, 10, 16, 26, 18, 24, 16, 18, 22, 22, 26, 30, 22, 22, 24, 24, 28, 28, 26, 26, 26,
+          26, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28),
+    'Q': (-1, 13, 22, 18, 26, 18, 24, 18, 22, 20, 24, 28, 26, 24, 20, 30, 24, 28, 28, 26, 30,
+          28, 30, 30, 30, 30, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+    'H': (-1, 17, 28, 22, 16, 22, 28, 26, 26, 24, 28, 24, 28, 22, 24, 24, 30, 28, 28, 26, 28,
+          30, 24, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+}
+NUM_ERROR_CORRECTION_BLOCKS = {
+    'L': (-1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 4, 4, 4, 4, 4, 6, 6, 6, 6, 7, 8,
+          8, 9, 9, 10, 12, 12, 12, 13, 14, 15, 16, 17, 18, 19, 19, 20, 21, 22, 24, 25),
+    'M': (-1, 1, 1, 1, 2, 2, 4, 4, 4, 5, 5, 5, 8, 9, 9, 10, 10, 11, 13, 14, 16,
+          17, 17, 18, 20, 21, 23, 25, 26, 28, 29, 31, 33, 35, 37, 38, 40, 43, 45, 47, 49),
+    'Q': (-1, 1, 1, 2, 2, 4, 4, 6, 6, 8, 8, 8, 10, 12, 16, 12, 17, 16, 18, 21, 20,
+          23, 23, 25, 27, 29, 34, 34, 35, 38, 40, 43, 45, 48, 51, 53, 56, 59, 62, 65, 68),
+    'H': (-1, 1, 1, 2, 4, 4, 4, 5, 6, 8, 8, 11, 11, 16, 16, 18, 16, 19, 21, 25, 25,
+          25, 34, 30, 32, 35, 37, 40, 42, 45, 48, 51, 54, 57, 60, 63, 66, 70, 74, 77, 81),
+}
+
+ALPHANUMERIC_CHARSET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:'
+
+# ---------------------------------------------------------------------------
+# GF(256) arithmetic (primitive polynomial x^8 + x^4 + x^3 + x^2 + 1)
+# ---------------------------------------------------------------------------
+
+GF_EXP = [0] * 512
+GF_LOG = [0] * 256
+_value = 1
+for _i in range(255):
+    GF_EXP[_i] = _value
+    GF_LOG[_value] = _i
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11d
+for _i in range(255, 512):
+    GF_EXP[_i] = GF_EXP[_i - 255]
+
+def _gf_mul(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return GF_EXP[GF_LOG[a] + GF_LOG[b]]
+
+def _gf_div(a, b):
+    if b == 0:
+        raise ZeroDivisionError("GF(256) division by zero")
+    if a == 0:
+        return 0
+    return GF_EXP[(GF_LOG[a] + 255 - GF_LOG[b]) % 255]
+
+def _poly_eval(poly, x):
+    """Evaluate a polynomial (highest degree first) at x."""
+    result = 0
+    for coefficient in poly:
+        result = _gf_mul(result, x) ^ coefficient
+    return result
+
+def rs_correct(codewords, ec_count):
+    """
+    Correct errors in one Reed-Solomon block in place.
+
+    Args:
+        codewords (list): Data codewords followed by EC codewords
+        ec_count (int): Number of EC codewords
+
+    Returns:
+        int: Number of corrected codewords
+
+    Raises:
+        QRDecodeError: If the block has more errors than it can correct
+    """
+    syndromes = [_poly_eval(codewords, GF_EXP[j]) for j in range(ec_count)]
+    if not any(syndromes):
+        return 0
+
+    # Berlekamp-Massey: error locator polynomial (lowest degree first)
+    locator = [1]
+    previous = [1]
+    length = 0
+    shift = 1
+    previous_discrepancy = 1
+    for n in range(ec_count):
+        discrepancy = syndromes[n]
+        for i in range(1, length + 1):
+            if i < len(locator):
+                discrepancy ^= _gf_mul(locator[i], syndromes[n - i])
+        if discrepancy == 0:
+            shift += 1
+            continue
+        scale = _gf_div(discrepancy, previous_discrepancy)
+        candidate = locator + [0] * max(0, len(previous) + shift - len(locator))
+        for i, coefficient in enumerate(previous):
+            candidate[i + shift] ^= _gf_mul(scale, coefficient)
+        if 2 * length <= n:
+            previous = locator
+            length = n + 1 - length
+            previous_discrepancy = discrepancy
+            shift = 1
+        else:
+            shift += 1
+        locator = candidate
+
+    while len(locator) > 1 and locator[-1] == 0:
+        locator.pop()
+    errors = len(locator) - 1
+    if errors * 2 > ec_count:
+        raise QRDecodeError("Too many errors in Reed-Solomon block")
+
+    # Chien search: error at codeword index k (from the front) has position p = n - 1 - k
+    count = len(codewords)
+    positions = []
+    for p in range(count):
+        x_inverse = GF_EXP[(255 - p) % 255]
+        value = 0
+        for coefficient in reversed(locator):
+            value = _gf_mul(value, x_inverse) ^ coefficient
+        if value == 0:
+            positions.append(p)
+    if len(positions) != errors:
+        raise QRDecodeError("Could not locate Reed-Solomon errors")
+
+    # Forney: error evaluator omega = S(x) * locator(x) mod x^ec_count
+    omega = [0] * ec_count
+    for i, s in enumerate(syndromes):
+        for j, coefficient in enumerate(locator):
+            if i + j < ec_count:
+                omega[i + j] ^= _gf_mul(s, coefficient)
+    derivative = [locator[i] if i % 2 == 1 else 0 for i in range(1, len(locator))]
+
+    for p in positions:
+        x = GF_EXP[p]
+        x_inverse = GF_EXP[(255 - p) % 255]
+        numerator = 0
+        for coefficient in reversed(omega):
+            numerator = _gf_mul(numerator, x_inverse) ^ coefficient
+        denominator = 0
+        for coefficient in reversed(derivative):
+            denominator = _gf_mul(denominator, x_inverse) ^ coefficient
+        if denominator == 0:
+            raise QRDecodeError("Reed-Solomon correction failed")
+        # With first consecutive root alpha^0 the magnitude is X * omega / locator'
+        magnitude = _gf_mul(x, _gf_div(numerator, denominator))
+        codewords[count - 1 - p] ^= magnitude
+
+    if any(_poly_eval(codewords, GF_EXP[j]) for j in range(ec_count)):
+        raise QRDecodeError("Reed-Solomon correction failed")
+    return errors
+
+# ---------------------------------------------------------------------------
+# Symbol structure
+# ---------------------------------------------------------------------------
+
+def _bch_format(data):
+    """Return the masked 15-bit format word for 5 bits of format data."""
+    value = data << 10
+    for bit in range(14, 9, -1):
+        if value & (1 << bit):
+            value ^= 0x537 << (bit - 10)
+    return ((data << 10) | value) ^ 0x5412
+
+FORMAT_WORDS = {_bch_format(data): data for data in range(32)}
+
+def alignment_positions(version):
+    """Return alignment pattern center coordinates for a version."""
+    if version == 1:
+        return []
+    count = version // 7 + 2
+    step = 26 if version == 32 else (version * 4 + count * 2 + 1) // (count * 2 - 2) * 2
+    size = version * 4 + 17
+    positions = [size - 7 - i * step for i in range(count - 1)]
+    return [6] + sorted(positions)
+
+def num_raw_data_modules(version):
+    """Number of modules available for data and EC codewords (including remainder bits)."""
+    result = (16 * version + 128) * version + 64
+    if version >= 2:
+        count = version // 7 + 2
+        result -= (25 * count - 10) * count - 55
+        if version >= 7:
+            result -= 36
+    return result
+
+@lru_cache(maxsize=None)
+def function_pattern_mask(version):
+    """Return a bool array marking finder, timing, alignment, format and version modules."""
+    size = version * 4 + 17
+    mask = np.zeros((size, size), dtype=bool)
+
+    # Finder patterns with separators, plus format information areas
+    mask[:9, :9] = True
+    mask[:9, size - 8:] = True
+    mask[size - 8:, :9] = True
+
+    # Timing patterns
+    mask[6, :] = True
+    mask[:, 6] = True
+
+    positions = alignment_positions(version)
+    last = len(positions) - 1
+    for i, row in enumerate(positions):
+        for j, col in enumerate(positions):
+            if (i == 0 and j == 0) or (i == 0 and j == last) or (i == last and j == 0):
+                continue
+            mask[row - 2:row + 3, col - 2:col + 3] = True
+
+    if version >= 7:
+        mask[:6, size - 11:size - 8] = True
+        mask[size - 11:size - 8, :6] = True
+
+    return mask
+
+@lru_cache(maxsize=None)
+def data_module_order(version):
+    """Return (rows, cols) arrays of data modules in zigzag reading order."""
+    size = version * 4 + 17
+    function = function_pattern_mask(version)
+    rows, cols = [], []
+    upward = True
+    col = size - 1
+    while col > 0:
+        if col == 6:
+            col -= 1
+        row_range = range(size - 1, -1, -1) if upward else range(size)
+        for row in row_range:
+            for c in (col, col - 1):
+                if not function[row, c]:
+                    rows.append(row)
+                    cols.append(c)
+        upward = not upward
+        col -= 2
+    return np.array(rows), np.array(cols)
+
+def data_mask(pattern, size):
+    """Return the bool array for one of the eight data mask patterns."""
+    i, j = np.indices((size, size))
+    if pattern == 0:
+        return (i + j) % 2 == 0
+    if pattern == 1:
+        return i % 2 == 0
+    if pattern == 2:
+        return j % 3 == 0
+    if pattern == 3:
+        return (i + j) % 3 == 0
+    if pattern == 4:
+        return (i // 2 + j // 3) % 2 == 0
+    if pattern == 5:
+        return (i * j) % 2 + (i * j) % 3 == 0
+    if pattern == 6:
+        return ((i * j) % 2 + (i * j) % 3) % 2 == 0
+    return ((i + j) % 2 + (i * j) % 3) % 2 == 0
+
+def read_format(matrix):
+    """
+    Read the error correction level and mask pattern from a module matrix.
+
+    Returns:
+        tuple: (ecl, mask_pattern)
+    """
+    size = matrix.shape[0]
+    vertical = 0
+    horizontal = 0
+    for i in range(15):
+        if i < 6:
+            v = matrix[i, 8]
+        elif i < 8:
+            v = matrix[i + 1, 8]
+        else:
+            v = matrix[size - 15 + i, 8]
+        if i < 8:
+            h = matrix[8, size - i - 1]
+        elif i < 9:
+            h = matrix[8, 15 - i]
+        else:
+            h = matrix[8, 14 - i]
+        vertical |= int(v) << i
+        horizontal |= int(h) << i
+
+    best, best_distance = None, 16
+    for word, data in FORMAT_WORDS.items():
+        distance = min(bin(word ^ vertical).count('1'), bin(word ^ horizontal).count('1'))
+        if distance < best_distance:
+            best, best_distance = data, distance
+    if best_distance > 3:
+        raise QRDecodeError("Unreadable format information")
+    return ECL_BY_FORMAT_BITS[best >> 3], best & 7
+
+def read_codewords(matrix, version, mask_pattern):
+    """Unmask the data area and return raw codewords in reading order."""
+    rows, cols = data_module_order(version)
+    size = matrix.shape[0]
+    bits = matrix[rows, cols] ^ data_mask(mask_pattern, size)[rows, cols]
+    count = num_raw_data_modules(version) // 8
+    return np.packbits(bits[:count * 8].astype(np.uint8)).tolist()
+
+def correct_codewords(raw, version, ecl):
+    """De-interleave blocks, Reed-Solomon correct each, and return the data codewords."""
+    ec_length = ECC_CODEWORDS_PER_BLOCK[ecl][version]
+    block_count = NUM_ERROR_CORRECTION_BLOCKS[ecl][version]
+    total = len(raw)
+    short_count = block_count - total % block_count
+    short_length = total // block_count
+
+    data_lengths = [short_length - ec_length + (0 if b < short_count else 1) for b in range(block_count)]
+    blocks = [[] for _ in range(block_count)]
+    index = 0
+    for i in range(max(data_lengths)):
+        for b in range(block_count):
+            if i < data_lengths[b]:
+                blocks[b].append(raw[index])
+                index += 1
+    for _ in range(ec_length):
+        for b in range(block_count):
+            blocks[b].append(raw[index])
+            index += 1
+
+    data = []
+    for b, block in enumerate(blocks):
+        rs_correct(block, ec_length)
+        data.extend(block[:data_lengths[b]])
+    return data
+
+class _BitReader:
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def remaining(self):
+        return len(self.data) * 8 - self.position
+
+    def read(self, count):
+        if count > self.remaining():
+            raise QRDecodeError("Bit stream ended early")
+        value = 0
+        for _ in range(count):
+            byte = self.data[self.position >> 3]
+            value = (value << 1) | ((byte >> (7 - (self.position & 7))) & 1)
+            self.position += 1
+        return value
+
+def _count_bits(mode, version):
+    group = 0 if version <= 9 else 1 if version <= 26 else 2
+    return {
+        1: (10, 12, 14),
+        2: (9, 11, 13),
+        4: (8, 16, 16),
+        8: (8, 10, 12),
+    }[mode][group]
+
+def parse_segments(data, version):
+    """Parse data codewords into text."""
+    reader = _BitReader(data)
+    payload = bytearray()
+    encoding = 'utf-8'
+
+    while reader.remaining() >= 4:
+        mode = reader.read(4)
+        if mode == 0:
+            break
+        if mode == 7:
+            # ECI designator: 8, 16 or 24 bits depending on the leading bits
+            first = reader.read(8)
+            if first & 0x80 == 0:
+                designator = first
+            elif first & 0xC0 == 0x80:
+                designator = ((first & 0x3F) << 8) | reader.read(8)
+            else:
+                designator = ((first & 0x1F) << 16) | reader.read(16)
+            if designator == 26:
+                encoding = 'utf-8'
+            elif designator in (1, 3):
+                encoding = 'latin-1'
+            continue
+        if mode not in (1, 2, 4, 8):
+            raise QRDecodeError(f"Unsupported segment mode {mode}")
+
+        count = reader.read(_count_bits(mode, version))
+        if mode == 1:
+            digits = []
+            while count >= 3:
+                digits.append(f"{reader.read(10):03d}")
+                count -= 3
+            if count == 2:
+                digits.append(f"{reader.read(7):02d}")
+            elif count == 1:
+                digits.append(f"{reader.read(4):01d}")
+            payload.extend(''.join(digits).encode('ascii'))
+        elif mode == 2:
+            chars = []
+            while count >= 2:
+                value = reader.read(11)
+                chars.append(ALPHANUMERIC_CHARSET[value // 45] + ALPHANUMERIC_CHARSET[value % 45])
+                count -= 2
+            if count == 1:
+                chars.append(ALPHANUMERIC_CHARSET[reader.read(6)])
+            payload.extend(''.join(chars).encode('ascii'))
+        elif mode == 4:
+            payload.extend(reader.read(8) for _ in range(count))
+        else:
+            for _ in range(count):
+                value = reader.read(13)
+                word = (value // 0xC0) << 8 | (value % 0xC0)
+                word += 0x8140 if word < 0x1F00 else 0xC140
+                payload.extend(word.to_bytes(2, 'big').decode('shift_jis').encode('utf-8'))
+
+    try:
+        return payload.decode(encoding)
+    except UnicodeDecodeError:
+        return payload.decode('latin-1')
+
+def decode_matrix(matrix):
+    """
+    Decode a QR code module matrix.
+
+    Args:
+        matrix: 2-D array-like of bool (True = dark), without quiet zone
+
+    Returns:
+        str: The encoded text
+
+    Raises:
+        QRDecodeError: If the matrix is not a decodable QR code
+    """
+    matrix = np.asarray(matrix, dtype=bool)
+    size = matrix.shape[0]
+    if matrix.ndim != 2 or matrix.shape[1] != size or size < 21 or (size - 17) % 4 != 0:
+        raise QRDecodeError(f"Invalid QR code size {matrix.shape}")
+    version = (size - 17) // 4
+
+    ecl, mask_pattern = read_format(matrix)
+    raw = read_codewords(matrix, version, mask_pattern)
+    data = correct_codewords(raw, version, ecl)
+    return parse_segments(data, version)
+
+# ---------------------------------------------------------------------------
+# Images
+# ---------------------------------------------------------------------------
+
+def load_image(image):
+    """
+    Convert an image source to a 2-D uint8 grayscale array.
+
+    Args:
+        image: File path, encoded image bytes, binary file object, PIL image,
+               or NumPy array (2-D gray/bool or 3-D RGB/RGBA)
+
+    Returns:
+        np.ndarray: 2-D uint8 array (0 = black, 255 = white)
+    """
+    if isinstance(image, np.ndarray):
+        array = image
+        if array.dtype == bool:
+            return np.where(array, 0, 255).astype(np.uint8)
+        if array.ndim == 3:
+            rgb = array[..., :3].astype(np.float32)
+            gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+            if array.shape[2] == 4:
+                alpha = array[..., 3].astype(np.float32) / 255
+                gray = gray * alpha + 255 * (1 - alpha)
+            return gray.round().astype(np.uint8)
+        return array.astype(np.uint8)
+
+    from PIL import Image
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        image = Image.open(io.BytesIO(image))
+    elif isinstance(image, (str, os.PathLike)) or hasattr(image, 'read'):
+        image = Image.open(image)
+
+    if image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info):
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image.convert('RGBA'))
+    return np.asarray(image.convert('L'), dtype=np.uint8)
+
+def otsu_threshold(gray):
+    """Return the Otsu threshold of a uint8 grayscale array."""
+    histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight = np.cumsum(histogram)
+    mean = np.cumsum(histogram * levels)
+    total_weight, total_mean = weight[-1], mean[-1]
+    background = weight[:-1]
+    foreground = total_weight - background
+    valid = (background > 0) & (foreground > 0)
+    if not valid.any():
+        return 128
+    between = np.zeros(255)
+    between[valid] = (total_mean * background[valid] - total_weight * mean[:-1][valid]) ** 2 \
+        / (background[valid] * foreground[valid])
+    return int(np.argmax(between)) + 1
+
+_FINDER_RATIO = np.array([1, 1, 3, 1, 1], dtype=np.float64)
+
+def _runs(line):
+    """Return (starts, lengths, values) of the runs in a 1-D bool array."""
+    boundaries = np.flatnonzero(line[1:] != line[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    lengths = np.diff(np.concatenate((starts, [len(line)])))
+    return starts, lengths, line[starts]
+
+def _finder_ratio(counts):
+    """True where five run lengths (last axis) look like 1:1:3:1:1."""
+    counts = np.asarray(counts, dtype=np.float64)
+    module = counts.sum(axis=-1, keepdims=True) / 7
+    ok = (np.abs(counts - module * _FINDER_RATIO) < module * 0.6 * _FINDER_RATIO).all(axis=-1)
+    return ok & (module[..., 0] >= 1)
+
+def _cross_check(runs, position):
+    """
+    Check for a finder pattern through one position along a line.
+
+    Args:
+        runs (tuple): _runs() of the line
+        position (int): Index along the line inside the candidate center
+
+    Returns:
+        tuple: (center, total run length) or None
+    """
+    starts, lengths, values = runs
+    index = int(np.searchsorted(starts, position, side='right')) - 1
+    if index < 2 or index + 2 >= len(lengths) or not values[index]:
+        return None
+    counts = lengths[index - 2:index + 3].tolist()
+    module = sum(counts) / 7
+    if module < 1 or any(abs(c - module * r) >= module * 0.6 * r for c, r in zip(counts, (1, 1, 3, 1, 1))):
+        return None
+    return starts[index] + lengths[index] / 2, sum(counts)
+
+def _row_windows(dark):
+    """
+    Find every 1:1:3:1:1 dark/light run window in every row at once.
+
+    Returns:
+        tuple: (rows, starts, lengths) of each window's center run, in scan order
+    """
+    height, width = dark.shape
+    is_start = np.ones((height, width), dtype=bool)
+    is_start[:, 1:] = dark[:, 1:] != dark[:, :-1]
+    starts = np.flatnonzero(is_start)
+    if len(starts) < 5:
+        empty = np.array([], dtype=int)
+        return empty, empty, empty
+    lengths = np.diff(np.append(starts, height * width))
+    rows = starts // width
+    values = dark.ravel()[starts]
+
+    windows = np.lib.stride_tricks.sliding_window_view(lengths, 5)
+    same_row = rows[:-4] == rows[4:]
+    centers = np.flatnonzero(same_row & values[:-4] & _finder_ratio(windows)) + 2
+    return rows[centers], starts[centers] - rows[centers] * width, lengths[centers]
+
+def _window_mask(dark):
+    """Mark the pixels covered by the center run of a row window."""
+    height, width = dark.shape
+    rows, starts, lengths = _row_windows(dark)
+    edges = np.zeros(height * width + 1, dtype=np.int32)
+    np.add.at(edges, rows * width + starts, 1)
+    np.add.at(edges, rows * width + starts + lengths, -1)
+    return (np.cumsum(edges[:-1]) > 0).reshape(height, width)
+
+def _row_candidates(dark):
+    """
+    Find finder candidates: row windows whose center also lies in a column window.
+
+    Returns:
+        tuple: (rows, centers) arrays of candidate positions in scan order
+    """
+    rows, starts, lengths = _row_windows(dark)
+    centers = starts + lengths / 2
+    in_column_window = _window_mask(dark.T).T[rows, centers.astype(int)]
+    return rows[in_column_window], centers[in_column_window]
+
+def find_finder_patterns(dark):
+    """
+    Locate finder pattern candidates in a binarized image.
+
+    Rows are scanned for dark/light/dark/light/dark runs in a 1:1:3:1:1
+    ratio. Each new hit is cross-checked vertically, horizontally and along
+    the diagonal, must be roughly square, and becomes a pattern; later hits
+    inside a confirmed pattern only add to its count.
+
+    Args:
+        dark (np.ndarray): 2-D bool array, True = dark pixel
+
+    Returns:
+        list: (x, y, module_size, hits) tuples, most confirmed first
+    """
+    column_runs = {}
+    rejected = set()
+    clusters = []
+
+    for y, x in zip(*(values.tolist() for values in _row_candidates(dark))):
+        for cluster in clusters:
+            if abs(cluster[0] - x) < cluster[2] and abs(cluster[1] - y) < 2 * cluster[2]:
+                cluster[3] += 1
+                break
+        else:
+            column = int(x)
+            if column not in column_runs:
+                column_runs[column] = _runs(dark[:, column])
+            # Every row inside the same vertical run gets the same verdict
+            key = (column, int(np.searchsorted(column_runs[column][0], y, side='right')))
+            if key in rejected:
+                continue
+            rejected.add(key)
+            vertical = _cross_check(column_runs[column], y)
+            if vertical is None:
+                continue
+            cy = vertical[0]
+            horizontal = _cross_check(_runs(dark[int(cy)]), column)
+            if horizontal is None:
+                continue
+            cx = horizontal[0]
+            if abs(vertical[1] - horizontal[1]) > 0.3 * max(vertical[1], horizontal[1]):
+                continue
+            offset = int(cx) - int(cy)
+            if _cross_check(_runs(dark.diagonal(offset)), int(cy) - max(0, -offset)) is None:
+                continue
+            rejected.discard(key)
+            clusters.append([cx, cy, (vertical[1] + horizontal[1]) / 14, 1])
+
+    return sorted((tuple(c) for c in clusters), key=lambda c: -c[3])
+
+def _order_finders(patterns):
+    """
+    Pick the three finder patterns that best form a QR code's corner triangle.
+
+    Returns:
+        tuple: (top_left, top_right, bottom_left, module_size) as (x, y) arrays, or None
+    """
+    best, best_score = None, None
+    for triple in combinations(patterns[:12], 3):
+        points = [np.array(p[:2]) for p in triple]
+        modules = [p[2] for p in triple]
+        if max(modules) > 1.5 * min(modules):
+            continue
+        sides = [(np.linalg.norm(points[(i + 1) % 3] - points[(i + 2) % 3]), i) for i in range(3)]
+        hypotenuse, corner = max(sides)
+        legs = [length for length, i in sides if i != corner]
+        if hypotenuse == 0 or min(legs) < 7 * min(modules):
+            continue
+        score = abs(legs[0] - legs[1]) / hypotenuse + abs(legs[0] ** 2 + legs[1] ** 2 - hypotenuse ** 2) / hypotenuse ** 2
+        if best_score is None or score < best_score:
+            best_score = score
+            best = (corner, points, float(np.mean(modules)))
+
+    if best is None or best_score > 0.3:
+        return None
+    corner, points, module = best
+    top_left = points[corner]
+    p, q = [points[i] for i in range(3) if i != corner]
+    if (p[0] - top_left[0]) * (q[1] - top_left[1]) - (p[1] - top_left[1]) * (q[0] - top_left[0]) < 0:
+        p, q = q, p
+    return top_left, p, q, module
+
+def sample_grid(dark, top_left, top_right, bottom_left, size):
+    """
+    Sample a size x size module grid through the affine map set by the finder centers.
+
+    Each module is read at its center and four nearby points; the majority wins.
+
+    Returns:
+        np.ndarray: 2-D bool module matrix
+    """
+    height, width = dark.shape
+    span = size - 7
+    across = (top_right - top_left) / span
+    down = (bottom_left - top_left) / span
+    offsets = ((0, 0), (-0.2, -0.2), (0.2, -0.2), (-0.2, 0.2), (0.2, 0.2))
+
+    u, w = np.meshgrid(np.arange(size) + 0.5 - 3.5, np.arange(size) + 0.5 - 3.5)
+    votes = np.zeros((size, size), dtype=np.int8)
+    for du, dw in offsets:
+        x = top_left[0] + (u + du) * across[0] + (w + dw) * down[0]
+        y = top_left[1] + (u + du) * across[1] + (w + dw) * down[1]
+        xi = np.floor(x).astype(int)
+        yi = np.floor(y).astype(int)
+        inside = (xi >= 0) & (xi < width) & (yi >= 0) & (yi < height)
+        values = np.zeros((size, size), dtype=bool)
+        values[inside] = dark[yi[inside], xi[inside]]
+        votes += values
+    return votes * 2 > len(offsets)
+
+def _module_size_along(dark, center, target, fallback):
+    """
+    Measure a finder pattern's module size along the line towards another finder.
+
+    Row/column runs overestimate the module size of a rotated code; sampling
+    along the code's own axis does not.
+    """
+    direction = target - center
+    length = np.linalg.norm(direction)
+    extent = int(fallback * 8)
+    if length == 0 or extent < 7:
+        return fallback
+    steps = np.arange(-extent, extent + 1)
+    xs = np.floor(center[0] + steps * direction[0] / length).astype(int)
+    ys = np.floor(center[1] + steps * direction[1] / length).astype(int)
+    height, width = dark.shape
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    line = np.zeros(len(steps), dtype=bool)
+    line[inside] = dark[ys[inside], xs[inside]]
+    checked = _cross_check(_runs(line), extent)
+    return checked[1] / 7 if checked else fallback
+
+def image_to_matrix_candidates(gray):
+    """
+    Yield plausible module matrices for a grayscale image, best guess first.
+
+    Tries the normal and inverted binarization and the estimated version
+    plus its neighbours.
+    """
+    threshold = otsu_threshold(gray)
+    for dark in (gray < threshold, gray >= threshold):
+        finders = _order_finders(find_finder_patterns(dark))
+        if finders is None:
+            continue
+        top_left, top_right, bottom_left, module = finders
+        modules_across = np.linalg.norm(top_right - top_left) / _module_size_along(dark, top_left, top_right, module)
+        modules_down = np.linalg.norm(bottom_left - top_left) / _module_size_along(dark, top_left, bottom_left, module)
+        estimate = int(round(((modules_across + modules_down) / 2 + 7 - 17) / 4))
+        for version in (estimate, estimate - 1, estimate + 1):
+            if 1 <= version <= 40:
+                yield sample_grid(dark, top_left, top_right, bottom_left, version * 4 + 17)
+
+def decode_image(image):
+    """
+    Decode a QR code image with the local NumPy decoder.
+
+    Args:
+        image: Anything load_image() accepts
+
+    Returns:
+        str: The encoded text
+
+    Raises:
+        QRDecodeError: If no QR code can be located or decoded
+    """
+    gray = load_image(image)
+    last_error = QRDecodeError("No QR code finder patterns found")
+    for matrix in image_to_matrix_candidates(gray):
+        for candidate in (matrix, matrix.T):
+            try:
+                return decode_matrix(candidate)
+            except QRDecodeError as e:
+                last_error = e
+    raise last_error
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+def _decode_zbar(image):
+    """Decode with zbar through pyzbar (optional dependency)."""
+    from PIL import Image
+    from pyzbar import pyzbar
+
+    results = pyzbar.decode(Image.fromarray(load_image(image)), symbols=[pyzbar.ZBarSymbol.QRCODE])
+    if not results:
+        raise QRDecodeError("zbar found no QR code")
+    return results[0].data.decode('utf-8')
+
+@lru_cache(maxsize=None)
+def zbar_available():
+    """True if pyzbar and the zbar shared library can be loaded."""
+    try:
+        from pyzbar import pyzbar  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+def available_backends():
+    """List the decoder backends usable in this environment."""
+    return ['local', 'zbar'] if zbar_available() else ['local']
+
+def decode(image, backend='auto'):
+    """
+    Decode a QR code image through the common backend interface.
+
+    Args:
+        image: Anything load_image() accepts (path, bytes, PIL image, array)
+        backend (str): 'local' (NumPy, always available), 'zbar' (requires
+                       pyzbar), or 'auto' (zbar when installed, falling back
+                       to local)
+
+    Returns:
+        str: The decoded text, or None if the image could not be decoded
+
+    Raises:
+        ValueError: For an unknown or unavailable backend
+    """
+    if backend == 'auto':
+        order = available_backends()[::-1]
+    elif backend in ('local', 'zbar'):
+        if backend == 'zbar' and not zbar_available():
+            raise ValueError("zbar backend requested but pyzbar is not installed")
+        order = [backend]
+    else:
+        raise ValueError(f"Unknown QR decoder backend: {backend}")
+
+    for name in order:
+        try:
+            return _decode_zbar(image) if name == 'zbar' else decode_image(image)
+        except QRDecodeError:
+            continue
+    return None
+
+# ---------------------------------------------------------------------------
+# Long-lived decoder process
+# ---------------------------------------------------------------------------
+#
+# Frame protocol on the worker's stdin/stdout (all integers big-endian):
+#   request:  uint32 height, uint32 width, height * width bytes of uint8 gray
+#             (height == 0 ends the session)
+#   response: int32 length, then length bytes of UTF-8 text (-1 = not decoded)
+
+_FRAME_HEADER = struct.Struct('>II')
+_RESULT_HEADER = struct.Struct('>i')
+
+def _read_exact(stream, size):
+    """Read exactly size bytes, or return None at end of stream."""
+    data = stream.read(size)
+    if len(data) < size:
+        return None
+    return data
+
+def serve(backend='auto', stdin=None, stdout=None):
+    """
+    Decode frames from stdin and write results to stdout until end of input.
+
+    Args:
+        backend (str): decode() backend used for every frame
+        stdin: Binary input stream (default: sys.stdin.buffer)
+        stdout: Binary output stream (default: sys.stdout.buffer)
+
+    Returns:
+        int: Number of frames decoded
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    count = 0
+    while True:
+        header = _read_exact(stdin, _FRAME_HEADER.size)
+        if header is None:
+            break
+        height, width = _FRAME_HEADER.unpack(header)
+        if height == 0:
+            break
+        pixels = _read_exact(stdin, height * width)
+        if pixels is None:
+            break
+        text = decode(np.frombuffer(pixels, dtype=np.uint8).reshape(height, width), backend=backend)
+        if text is None:
+            stdout.write(_RESULT_HEADER.pack(-1))
+        else:
+            encoded = text.encode('utf-8')
+            stdout.write(_RESULT_HEADER.pack(len(encoded)) + encoded)
+        stdout.flush()
+        count += 1
+    return count
+
+class DecoderProcess:
+    """
+    One long-lived decoder worker that decodes many images per call.
+
+    Images are converted to grayscale in the caller and streamed as raw
+    frames, so nothing touches the disk and the worker never re-parses an
+    image format. Requests are written from a helper thread while results
+    are read, so large batches cannot deadlock on full pipes.
+
+    Args:
+        backend (str): decode() backend to run in the worker ('auto', 'local' or 'zbar')
+    """
+
+    def __init__(self, backend='auto'):
+        self.backend = backend
+        self._process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve', '--backend', backend],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def decode_many(self, images):
+        """
+        Decode a batch of images in the worker.
+
+        Args:
+            images (list): Anything load_image() accepts
+
+        Returns:
+            list: Decoded text (or None) per image, in order
+        """
+        frames = [load_image(image) for image in images]
+        errors = []
+
+        def write_frames():
+            try:
+                for gray in frames:
+                    gray = np.ascontiguousarray(gray, dtype=np.uint8)
+                    self._process.stdin.write(_FRAME_HEADER.pack(*gray.shape))
+                    self._process.stdin.write(gray.tobytes())
+                self._process.stdin.flush()
+            except OSError as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write_frames, daemon=True)
+        writer.start()
+        results = []
+        for _ in frames:
+            header = _read_exact(self._process.stdout, _RESULT_HEADER.size)
+            if header is None:
+                writer.join()
+                raise RuntimeError(f"QR decoder process exited unexpectedly ({errors or self._process.poll()})")
+            (length,) = _RESULT_HEADER.unpack(header)
+            results.append(None if length < 0 else _read_exact(self._process.stdout, length).decode('utf-8'))
+        writer.join()
+        return results
+
+    def decode(self, image):
+        """Decode one image in the worker; returns the text or None."""
+        return self.decode_many([image])[0]
+
+    def close(self):
+        """Ask the worker to exit and wait for it."""
+        if self._process.poll() is None:
+            try:
+                self._process.stdin.write(_FRAME_HEADER.pack(0, 0))
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process.wait()
+        self._process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def main():
+    """Decode QR code image files, or serve frames for DecoderProcess."""
+    parser = argparse.ArgumentParser(description='Decode QR code images offline')
+    parser.add_argument('files', nargs='*',
+                       help='Image files to decode')
+    parser.add_argument('--backend', default='auto', choices=['auto', 'local', 'zbar'],
+                       help='Decoder backend (default: auto = zbar when installed, else local)')
+    parser.add_argument('--serve', action='store_true',
+                       help='Decode raw frames from stdin (used by DecoderProcess)')
+
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.backend)
+        return
+
+    if not args.files:
+        parser.error('no image files given')
+
+    failed = 0
+    for filename in args.files:
+        text = decode(filename, backend=args.backend)
+        if text is None:
+            failed += 1
+            print(f"❌ {filename}: no QR code decoded")
+        else:
+            print(f"✅ {filename}: {text}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Minimal QR Code PNG Encoder
+
+Writes a QR module matrix as the smallest practical PNG: 1 bit per pixel,
+either grayscale (black on white) or a two-entry palette (any two colors),
+with unfiltered scanlines and a single IDAT chunk.
+No ancillary chunks are written.
+
+With box_size=1 each module is one pixel and the browser scales the image
+up; pair it with CSS `image-rendering: pixelated` so the modules stay sharp.
+
+Compared with the RGBA PNGs gen_and_embed.py used to produce, a typical
+guide URL shrinks from ~2.8 KB to ~0.7 KB at the same pixel size, or ~0.3 KB
+at one pixel per module.
+
+Usage:
+    from qr_png import encode_png
+    png = encode_png(qr.modules, box_size=1, border=4)
+
+    python qr_png.py                       # Size report for every catalogue video URL
+    python qr_png.py https://youtu.be/twREXouRxns --ecl H --box-size 8
+"""
+
+import argparse
+import base64
+import io
+import struct
+import zlib
+
+import numpy as np
+import qrcode
+from PIL import ImageColor
+
+from cheatsheet_videos import cheatsheet_numbers, videos_for_cheatsheet
+
+PNG_MODES = ('gray1', 'palette1')
+_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_COLOR_TYPE = {'gray1': 0, 'palette1': 3}
+_MAX_LEVEL9_BYTES = 16 * 1024
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def _deflate(raw):
+    """
+    zlib-compress scanlines, at maximum effort only where it is cheap.
+
+    Level 9 is ~10x slower than level 6 on the long repeated rows of
+    scaled-up codes while saving only ~2%, so it is kept for small images
+    (one pixel per module), which is where every byte shows in a data URI.
+    """
+    level = 9 if len(raw) <= _MAX_LEVEL9_BYTES else 6
+    return zlib.compress(raw, level)
+
+def encode_png(modules, box_size=1, border=4, mode='gray1', fill_color='black', back_color='white'):
+    """
+    Encode a QR module matrix as a 1-bit PNG.
+
+    Args:
+        modules (list): 2-D matrix, True = dark (e.g. QRCode.modules), no quiet zone
+        box_size (int): Pixels per module (1 = let the browser scale it up)
+        border (int): Quiet zone in modules
+        mode (str): 'gray1' (1-bit grayscale) or 'palette1' (1-bit, two-color palette)
+        fill_color (str): Dark module color (palette1 only; gray1 is always black)
+        back_color (str): Light module color (palette1 only; gray1 is always white)
+
+    Returns:
+        bytes: PNG file contents
+
+    Raises:
+        ValueError: For an unknown mode, or colors gray1 cannot represent
+    """
+    if mode not in PNG_MODES:
+        raise ValueError(f"Unknown PNG mode {mode!r} (expected one of {', '.join(PNG_MODES)})")
+    fill, back = ImageColor.getrgb(fill_color)[:3], ImageColor.getrgb(back_color)[:3]
+    if mode == 'gray1' and (fill, back) != ((0, 0, 0), (255, 255, 255)):
+        raise ValueError("gray1 PNGs are black on white; use mode='palette1' for other colors")
+
+    dark = np.pad(np.asarray(modules, dtype=bool), border)
+    pixels = (~dark).repeat(box_size, axis=0).repeat(box_size, axis=1)
+    height, width = pixels.shape
+
+    # Bit 1 = light (white / palette entry 1); each scanline gets filter byte 0
+    rows = np.packbits(pixels, axis=1)
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows]).tobytes()
+
+    header = struct.pack('>IIBBBBB', width, height, 1, _COLOR_TYPE[mode], 0, 0, 0)
+    chunks = [_chunk(b'IHDR', header)]
+    if mode == 'palette1':
+        chunks.append(_chunk(b'PLTE', bytes(fill + back)))
+    chunks.append(_chunk(b'IDAT', _deflate(raw)))
+    chunks.append(_chunk(b'IEND', b''))
+    return _SIGNATURE + b''.join(chunks)
+
+def png_data_uri(png):
+    """Wrap PNG bytes in a data: URI."""
+    return "data:image/png;base64," + base64.b64encode(png).decode('ascii')
+
+def _rgba_png(qr):
+    """The RGBA PNG gen_and_embed.py produced before the 1-bit modes existed."""
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").convert("RGBA").save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def size_report(data, ecl='M', box_size=10, border=4):
+    """
+    Compare PNG sizes for one payload across encoder modes.
+
+    Args:
+        data (str): Data to encode
+        ecl (str): Error correction level (L, M, Q, H)
+        box_size (int): Pixels per module for the full-size variants
+        border (int): Quiet zone in modules
+
+    Returns:
+        dict: 'data', 'version' and 'sizes' mapping variant name to PNG bytes
+              ('rgba', 'gray1', 'palette1', 'gray1@1px')
+    """
+    qr = qrcode.QRCode(error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{ecl}'),
+                       box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return {
+        'data': data,
+        'version': qr.version,
+        'sizes': {
+            'rgba': len(_rgba_png(qr)),
+            'gray1': len(encode_png(qr.modules, box_size, border)),
+            'palette1': len(encode_png(qr.modules, box_size, border, mode='palette1')),
+            'gray1@1px': len(encode_png(qr.modules, 1, border)),
+        },
+    }
+
+def catalogue_urls():
+    """Every video URL in the cheatsheet catalogue."""
+    return [video['url'] for number in cheatsheet_numbers() for video in videos_for_cheatsheet(number)]
+
+def main():
+    """Print PNG size savings for the given URLs (default: the catalogue)."""
+    parser = argparse.ArgumentParser(description='Compare QR PNG sizes: RGBA vs 1-bit encodings')
+    parser.add_argument('urls', nargs='*', help='Data to encode (default: every catalogue video URL)')
+    parser.add_argument('--ecl', default='M', choices=['L', 'M', 'Q', 'H'],
+                       help='Error correction level (default: M)')
+    parser.add_argument('--box-size', type=int, default=10,
+                       help='Pixels per module for the full-size variants (default: 10)')
+    parser.add_argument('--border', type=int, default=4,
+                       help='Quiet zone in modules (default: 4)')
+
+    args = parser.parse_args()
+
+    reports = [size_report(url, args.ecl, args.box_size, args.border) for url in args.urls or catalogue_urls()]
+    variants = list(reports[0]['sizes'])
+
+    print(f"{'data':<45} {'ver':>3} " + " ".join(f"{v:>10}" for v in variants))
+    for report in reports:
+        print(f"{report['data'][:45]:<45} {report['version']:>3} " +
+              " ".join(f"{report['sizes'][v]:>10,}" for v in variants))
+
+    totals = {v: sum(r['sizes'][v] for r in reports) for v in variants}
+    print(f"{'total':<49} " + " ".join(f"{totals[v]:>10,}" for v in variants))
+    print(f"\n📉 Savings against RGBA ({totals['rgba']:,} bytes, "
+          f"{4 * ((totals['rgba'] + 2) // 3):,} Base64 chars):")
+    for variant in variants[1:]:
+        saved = totals['rgba'] - totals[variant]
+        print(f"   {variant:<10} {totals[variant]:>8,} bytes  (saved {saved:,}, {saved / totals['rgba']:.1%})")
+
+if __name__ == "__main__":
+    main()
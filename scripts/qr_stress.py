@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+QR Code Decodability Stress Tester
+
+Rasterizes the SVG QR codes generate_qr_codes.py embeds in the guides,
+degrades them the way screens, printers and phone cameras do, and measures
+how often each error correction level and box size still decodes. The
+result picks the smallest code (fewest SVG bytes, lowest version) that
+scans reliably, from data rather than guesswork.
+
+Color schemes:
+- emerald: black modules on the #10b981 guide background
+- footer:  #001011 modules on #f4e4c1 (site theme colors)
+
+Degradations, each at three strengths (see DEGRADATIONS):
+- blur:        Gaussian blur, sigma in pixels
+- print_dpi:   area downscale of the 1.25 in (120 CSS px) code to a print DPI
+- perspective: keystone tilt, top edge narrowed by a fraction of the width
+               (the local decoder samples an affine grid, so it tolerates
+               less tilt than a phone scanner; see qr_decode.py)
+- noise:       Gaussian sensor noise, sigma in 0-255 levels
+- contrast:    contrast loss toward mid gray, as a fraction
+
+Codes with the same raster size are stacked into one NumPy batch, and every
+degradation is applied to the whole batch at once (blur and downscaling as
+matrix products, perspective as one shared gather). Only decoding is per image.
+
+Usage:
+    python qr_stress.py                                  # Catalogue sample, default grid
+    python qr_stress.py --ecl L M --box-size 4 8 --target 0.95
+    python qr_stress.py https://youtu.be/twREXouRxns --scheme footer --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+from PIL import ImageColor
+
+from generate_qr_codes import PATH_DATA, generate_qr_code
+from qr_decode import decode
+from qr_png import catalogue_urls
+from qr_svg_path import path_to_matrix
+
+SCHEMES = {
+    'emerald': ('#000000', '#10b981'),
+    'footer': ('#001011', '#f4e4c1'),
+}
+ECLS = ['L', 'M', 'Q', 'H']
+BOX_SIZES = [2, 4, 8]
+BORDER = 2
+DISPLAY_INCHES = 1.25          # Guide SVGs are 120 CSS px = 1.25 in
+DEFAULT_TARGET = 0.9
+DEFAULT_URL_COUNT = 4
+SEED = 2024
+
+def rasterize_svg(svg, box_size, border=BORDER, scheme='emerald'):
+    """
+    Rasterize a generate_qr_codes.py SVG at box_size pixels per module.
+
+    Args:
+        svg (str): SVG markup from generate_qr_code()
+        box_size (int): box_size the SVG was generated with
+        border (int): border the SVG was generated with
+        scheme (str): Key of SCHEMES
+
+    Returns:
+        numpy.ndarray: (h, w, 3) float32 RGB image, quiet zone included
+    """
+    path_data = PATH_DATA.search(svg).group(1)
+    scaled = float(svg.split('viewBox="0 0 ', 1)[1].split()[0])
+    size = int(round(scaled * 10 / box_size)) - 2 * border
+    dark = np.pad(path_to_matrix(path_data, size, box_size, border), border)
+    dark = dark.repeat(box_size, axis=0).repeat(box_size, axis=1)
+
+    fill, back = (np.array(ImageColor.getrgb(c)[:3], dtype=np.float32) for c in SCHEMES[scheme])
+    return np.where(dark[..., None], fill, back)
+
+def _resample_matrix(n_out, n_in):
+    """Area-averaging matrix (n_out, n_in) that shrinks or stretches one axis."""
+    edges = np.linspace(0, n_in, n_out + 1)
+    starts, ends = edges[:-1, None], edges[1:, None]
+    pixels = np.arange(n_in)[None, :]
+    overlap = np.clip(np.minimum(ends, pixels + 1) - np.maximum(starts, pixels), 0, None)
+    return (overlap / overlap.sum(axis=1, keepdims=True)).astype(np.float32)
+
+def _gaussian_matrix(n, sigma):
+    """Row-normalized Gaussian blur matrix for one axis."""
+    offsets = np.arange(n)[:, None] - np.arange(n)[None, :]
+    weights = np.exp(-0.5 * (offsets / sigma) ** 2)
+    return (weights / weights.sum(axis=1, keepdims=True)).astype(np.float32)
+
+def blur(batch, sigma, rng=None):
+    """Gaussian blur of every image in a (n, h, w, 3) batch."""
+    _, height, width, _ = batch.shape
+    return np.einsum('ij,njkc,lk->nilc', _gaussian_matrix(height, sigma), batch, _gaussian_matrix(width, sigma),
+                     optimize=True)
+
+def print_dpi(batch, dpi, rng=None):
+    """Downscale a batch so the code spans DISPLAY_INCHES at the given DPI."""
+    _, height, width, _ = batch.shape
+    out = max(1, int(round(DISPLAY_INCHES * dpi)))
+    return np.einsum('ij,njkc,lk->nilc', _resample_matrix(out, height), batch,
+                     _resample_matrix(max(1, int(round(out * width / height))), width), optimize=True)
+
+def perspective(batch, tilt, rng=None):
+    """
+    Keystone the batch: the top edge shrinks by tilt × width, centered.
+
+    The inverse mapping is computed once and shared by every image; pixels
+    that fall outside the source take the image's corner (background) color.
+    """
+    _, height, width, _ = batch.shape
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    # Width of the row at this height, narrowing linearly toward the top
+    row_scale = 1 - tilt * (1 - ys / max(height - 1, 1))
+    src_x = (xs - width / 2) / row_scale + width / 2
+    inside = (src_x >= 0) & (src_x <= width - 1)
+
+    x0 = np.clip(np.floor(src_x).astype(int), 0, width - 2)
+    frac = np.clip(src_x - x0, 0, 1)[None, ..., None]
+    rows = ys.astype(int)
+    warped = batch[:, rows, x0] * (1 - frac) + batch[:, rows, x0 + 1] * frac
+    return np.where(inside[None, ..., None], warped, batch[:, :1, :1])
+
+def noise(batch, sigma, rng=None):
+    """Add Gaussian noise to every pixel of the batch."""
+    rng = rng or np.random.default_rng(SEED)
+    return np.clip(batch + rng.normal(0, sigma, batch.shape).astype(np.float32), 0, 255)
+
+def contrast(batch, loss, rng=None):
+    """Pull every pixel toward mid gray by the given fraction."""
+    return 127.5 + (batch - 127.5) * (1 - loss)
+
+DEGRADATIONS = {
+    'blur': (blur, [0.8, 1.6, 2.4]),
+    'print_dpi': (print_dpi, [72, 48, 36]),
+    'perspective': (perspective, [0.02, 0.04, 0.06]),
+    'noise': (noise, [25, 50, 75]),
+    'contrast': (contrast, [0.6, 0.8, 0.9]),
+}
+
+def to_gray(batch):
+    """(n, h, w, 3) float RGB batch to (n, h, w) uint8 luminance."""
+    gray = batch @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return np.clip(gray.round(), 0, 255).astype(np.uint8)
+
+def build_cases(urls, ecls=ECLS, box_sizes=BOX_SIZES, schemes=SCHEMES, optimize=True):
+    """
+    Generate and rasterize every URL × ECL × box size × scheme.
+
+    Args:
+        optimize (bool): Measure the minimal path generate_qr_codes.py and
+                         embed_guide_qr_codes.py ship by default, so
+                         'svg_bytes' is what gets deployed
+
+    Returns:
+        list: dicts with 'url', 'ecl', 'box_size', 'scheme', 'svg_bytes',
+              'version' and 'image'
+    """
+    cases = []
+    for url in urls:
+        for ecl in ecls:
+            for box_size in box_sizes:
+                svg = generate_qr_code(url, ecl=ecl, box_size=box_size, border=BORDER, optimize=optimize)
+                if svg is None:
+                    raise ValueError(f"generate_qr_codes could not encode {url!r}")
+                for scheme in schemes:
+                    image = rasterize_svg(svg, box_size, BORDER, scheme)
+                    modules = image.shape[0] // box_size - 2 * BORDER
+                    cases.append({'url': url, 'ecl': ecl, 'box_size': box_size, 'scheme': scheme,
+                                  'svg_bytes': len(svg.encode('utf-8')), 'version': (modules - 17) // 4,
+                                  'image': image})
+    return cases
+
+def conditions():
+    """Every (degradation, strength) pair, plus the pristine image as ('none', 0)."""
+    return [('none', 0)] + [(name, level) for name, (_, levels) in DEGRADATIONS.items() for level in levels]
+
+def stress(cases, seed=SEED):
+    """
+    Decode every case under every condition.
+
+    Args:
+        cases (list): From build_cases()
+        seed (int): Noise seed, for reproducible runs
+
+    Returns:
+        list: One outcome per case × condition: case fields (without the
+              image) plus 'degradation', 'level' and 'decoded'
+    """
+    groups = defaultdict(list)
+    for case in cases:
+        groups[case['image'].shape].append(case)
+
+    outcomes = []
+    for group in groups.values():
+        batch = np.stack([case['image'] for case in group])
+        for index, (name, level) in enumerate(conditions()):
+            rng = np.random.default_rng([seed, index])
+            degraded = batch if name == 'none' else DEGRADATIONS[name][0](batch, level, rng)
+            for case, gray in zip(group, to_gray(degraded)):
+                fields = {key: value for key, value in case.items() if key != 'image'}
+                outcomes.append({**fields, 'degradation': name, 'level': level,
+                                 'decoded': decode(gray) == case['url']})
+    return outcomes
+
+def summarize(outcomes):
+    """
+    Success rates per scheme × ECL × box size.
+
+    Returns:
+        list: dicts with 'scheme', 'ecl', 'box_size', 'svg_bytes' (mean),
+              'version' (max), 'success' (overall rate) and 'by_degradation'
+              (rate per degradation name), in input order
+    """
+    configs = {}
+    for outcome in outcomes:
+        key = (outcome['scheme'], outcome['ecl'], outcome['box_size'])
+        config = configs.setdefault(key, {'scheme': key[0], 'ecl': key[1], 'box_size': key[2],
+                                          'svg_bytes': [], 'version': 0, 'runs': defaultdict(list)})
+        config['runs'][outcome['degradation']].append(outcome['decoded'])
+        config['version'] = max(config['version'], outcome['version'])
+        if outcome['degradation'] == 'none':
+            config['svg_bytes'].append(outcome['svg_bytes'])
+
+    summary = []
+    for config in configs.values():
+        runs = config.pop('runs')
+        every = [decoded for results in runs.values() for decoded in results]
+        config['svg_bytes'] = int(round(np.mean(config['svg_bytes'])))
+        config['success'] = sum(every) / len(every)
+        config['by_degradation'] = {name: sum(results) / len(results) for name, results in runs.items()}
+        summary.append(config)
+    return summary
+
+def recommend(summary, target=DEFAULT_TARGET):
+    """
+    Smallest configuration per scheme whose overall success rate meets target.
+
+    Returns:
+        dict: scheme -> summary entry (None when nothing meets the target)
+    """
+    best = {}
+    for config in sorted(summary, key=lambda c: (c['svg_bytes'], c['version'], -c['success'])):
+        if config['success'] >= target:
+            best.setdefault(config['scheme'], config)
+    return {scheme: best.get(scheme) for scheme in dict.fromkeys(c['scheme'] for c in summary)}
+
+def print_summary(summary, recommendations, target):
+    """Print the success-rate table and the recommendations."""
+    names = list(DEGRADATIONS)
+    print(f"{'scheme':<8} {'ecl':>3} {'box':>3} {'ver':>3} {'svg B':>7} {'all':>6} " +
+          " ".join(f"{name:>11}" for name in names))
+    for c in summary:
+        print(f"{c['scheme']:<8} {c['ecl']:>3} {c['box_size']:>3} {c['version']:>3} {c['svg_bytes']:>7,} "
+              f"{c['success']:>6.0%} " + " ".join(f"{c['by_degradation'].get(name, 0):>11.0%}" for name in names))
+
+    print(f"\n🎯 Smallest reliable QR code (≥ {target:.0%} decoded across all degradations):")
+    for scheme, config in recommendations.items():
+        if config is None:
+            print(f"   {scheme:<8} ❌ nothing reaches the target")
+        else:
+            print(f"   {scheme:<8} ✅ ECL {config['ecl']}, box_size {config['box_size']} "
+                  f"(version {config['version']}, {config['svg_bytes']:,} SVG bytes, {config['success']:.0%})")
+
+def main():
+    """Stress-test QR decodability and recommend the smallest reliable settings."""
+    parser = argparse.ArgumentParser(description='Measure QR decode rates under image degradations')
+    parser.add_argument('urls', nargs='*',
+                       help=f'URLs to encode (default: {DEFAULT_URL_COUNT} catalogue video URLs)')
+    parser.add_argument('--ecl', nargs='+', default=ECLS, choices=ECLS, help='Error correction levels')
+    parser.add_argument('--box-size', nargs='+', type=int, default=BOX_SIZES, help='Box sizes in pixels')
+    parser.add_argument('--scheme', nargs='+', default=list(SCHEMES), choices=list(SCHEMES),
+                       help='Color schemes')
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET,
+                       help=f'Success rate a configuration must reach (default: {DEFAULT_TARGET})')
+    parser.add_argument('--optimize', action=argparse.BooleanOptionalAction, default=True,
+                       help='Measure the minimal, decode-verified SVG path that is deployed (default: on)')
+    parser.add_argument('--seed', type=int, default=SEED, help='Noise seed')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    args = parser.parse_args()
+
+    urls = args.urls or catalogue_urls()[:DEFAULT_URL_COUNT]
+    log = sys.stderr if args.json else sys.stdout
+    start = time.perf_counter()
+    cases = build_cases(urls, args.ecl, args.box_size, {name: SCHEMES[name] for name in args.scheme}, args.optimize)
+    outcomes = stress(cases, args.seed)
+    summary = summarize(outcomes)
+    recommendations = recommend(summary, args.target)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({'summary': summary, 'recommendations': recommendations}, indent=2))
+    else:
+        print_summary(summary, recommendations, args.target)
+    print(f"\n📊 {len(outcomes):,} decodes of {len(cases)} codes in {elapsed:.1f}s", file=log)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Cache for Generated QR Code SVGs
+
+Stores the SVG markup produced by generate_qr_codes.py on disk, keyed by a
+SHA-256 hash of every input that affects the output (URL, ECL, box size,
+border, colors, qrcode library version and cache format). Repeat runs with
+unchanged inputs skip Reed-Solomon encoding, mask selection and SVG
+rendering entirely, and cached entries are returned byte-for-byte.
+
+The cache is bounded by total size. Each hit refreshes the entry's mtime,
+and the least recently used entries are evicted once the bound is exceeded.
+
+Usage:
+    python qr_svg_cache.py --stats      # Show cache location, entries and size
+    python qr_svg_cache.py --clear      # Remove every cached SVG
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.qr-cache')
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Bump whenever the SVG markup produced by generate_qr_codes.py changes, so
+# entries rendered by an older version are never served.
+CACHE_FORMAT = 2
+
+@lru_cache(maxsize=None)
+def _qrcode_version():
+    """Return the installed qrcode library version (part of every cache key)."""
+    try:
+        return metadata.version('qrcode')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+def cache_key(data, ecl='L', box_size=8, border=2, fill_color="black", back_color="#10b981", optimize=False):
+    """
+    Build the cache key for one QR code.
+
+    Args:
+        data (str): The data encoded in the QR code
+        ecl (str): Error Correction Level ('L', 'M', 'Q', 'H')
+        box_size (int): Size of each module in pixels
+        border (int): Border size in modules
+        fill_color (str): Color of QR code modules
+        back_color (str): Background color
+        optimize (bool): Whether the minimal path variant is rendered
+
+    Returns:
+        str: Hex SHA-256 digest of all inputs
+    """
+    payload = json.dumps(
+        [CACHE_FORMAT, _qrcode_version(), data, ecl.upper(), box_size, border, fill_color, back_color,
+         bool(optimize)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class QRSvgCache:
+    """Size-bounded LRU cache of SVG markup stored as one file per key."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.svg")
+
+    def _entries(self):
+        """Return (mtime, size, path) for every cached file."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.svg'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def get(self, key):
+        """Return the cached SVG for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                svg = f.read().decode('utf-8')
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return svg
+
+    def put(self, key, svg):
+        """Store svg under key (atomically) and evict old entries if over budget."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = svg.encode('utf-8')
+
+        try:
+            previous_size = os.path.getsize(path)
+        except OSError:
+            previous_size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._total_bytes += len(payload) - previous_size
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        self._total_bytes = total
+        return removed
+
+    def clear(self):
+        """
+        Remove every cached entry.
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        self._total_bytes = 0
+        return removed
+
+    def stats(self):
+        """Return a dict describing the cache contents."""
+        entries = self._entries()
+        return {
+            'cache_dir': self.cache_dir,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes
+        }
+
+def main():
+    """Inspect or invalidate the QR SVG cache."""
+    parser = argparse.ArgumentParser(description='Manage the on-disk QR code SVG cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--stats', action='store_true', help='Show cache statistics')
+    action.add_argument('--clear', action='store_true', help='Remove every cached SVG')
+
+    args = parser.parse_args()
+    cache = QRSvgCache(args.cache_dir)
+
+    if args.clear:
+        removed = cache.clear()
+        print(f"🗑️  Removed {removed} cached QR codes from {args.cache_dir}")
+    else:
+        stats = cache.stats()
+        print(f"📁 Cache directory: {stats['cache_dir']}")
+        print(f"   Entries: {stats['entries']}")
+        print(f"   Size: {stats['bytes']} / {stats['max_bytes']} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+NumPy QR Module Matrix to SVG Path Renderer
+
+Builds SVG path data directly from a QR code's module matrix (qr.modules)
+instead of rendering through qrcode.image.svg.SvgPathImage and parsing the
+path back out of the SVG string. Adjacent dark modules in a row are merged
+into a single run-length rectangle, so a row of seven finder modules costs
+one subpath instead of seven.
+
+Coordinates use the same units as SvgPathImage (box_size / 10 per module,
+offset by the border), so the viewBox produced by generate_qr_codes.py is
+unchanged.
+
+render_optimized_path() is the minimal-size variant used for embedding in
+guides: relative commands, trimmed coordinates and no redundant separators.
+
+Also provides path_to_matrix(), which rasterizes a path made of
+axis-aligned rectangles back to a module matrix for verification.
+"""
+
+import re
+
+import numpy as np
+
+_PATH_TOKEN = re.compile(r'([MmHhVvLlZz])|(-?(?:\d+\.?\d*|\.\d+))')
+
+def module_matrix(modules):
+    """Convert qr.modules (list of lists of bool/None) to a 2-D NumPy bool array."""
+    return np.array(modules, dtype=bool)
+
+def module_runs(matrix):
+    """
+    Find horizontal runs of dark modules.
+
+    Args:
+        matrix (np.ndarray): 2-D bool array of dark modules
+
+    Returns:
+        tuple: (rows, starts, ends) int arrays, one entry per run, in row-major
+               order; ends are exclusive
+    """
+    matrix = np.asarray(matrix, dtype=bool)
+    padded = np.zeros((matrix.shape[0], matrix.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+def format_tenths(value):
+    """Format an integer number of tenths as a compact decimal ('16' -> '1.6', '40' -> '4')."""
+    whole, tenth = divmod(int(value), 10)
+    return f"{whole}.{tenth}" if tenth else f"{whole}"
+
+def render_path(matrix, box_size=8, border=2):
+    """
+    Render a module matrix as SVG path data, one rectangle per horizontal run.
+
+    Args:
+        matrix (np.ndarray): 2-D bool array of dark modules (no border)
+        box_size (int): Size of each module in pixels
+        border (int): Border size in modules
+
+    Returns:
+        str: Path data in SvgPathImage units (box_size / 10 per module)
+    """
+    rows, starts, ends = module_runs(matrix)
+
+    # Every coordinate is a whole number of modules, so format each once
+    extent = max(np.asarray(matrix).shape) + 2 * border + 1
+    labels = [format_tenths(k * box_size) for k in range(extent)]
+
+    return ''.join(
+        f"M{labels[x0]},{labels[y]}H{labels[x1]}V{labels[y + 1]}H{labels[x0]}z"
+        for y, x0, x1 in zip((rows + border).tolist(), (starts + border).tolist(), (ends + border).tolist())
+    )
+
+def _compact_number(tenths):
+    """Format signed tenths with the leading zero trimmed ('-8' -> '-.8', '16' -> '1.6')."""
+    text = format_tenths(abs(tenths))
+    if text.startswith('0.'):
+        text = text[1:]
+    return f"-{text}" if tenths < 0 else text
+
+def _join_numbers(first, second):
+    """Join two path numbers with a separator only where the SVG grammar needs one."""
+    if second.startswith('-') or (second.startswith('.') and '.' in first):
+        return first + second
+    return f"{first},{second}"
+
+def render_optimized_path(matrix, box_size=8, border=2):
+    """
+    Render a module matrix as the shortest path this module knows how to emit.
+
+    Each horizontal run is one rectangle drawn with relative commands
+    (m dx,dy h w v u h -w z). After 'z' the pen returns to the rectangle's
+    start, so every 'm' is a small offset from the previous run. Numbers use
+    at most one decimal, drop leading zeros and omit separators wherever the
+    SVG path grammar allows.
+
+    Args:
+        matrix (np.ndarray): 2-D bool array of dark modules (no border)
+        box_size (int): Size of each module in pixels
+        border (int): Border size in modules
+
+    Returns:
+        str: Path data in SvgPathImage units (box_size / 10 per module)
+    """
+    rows, starts, ends = module_runs(matrix)
+    if len(rows) == 0:
+        return ''
+
+    xs = ((starts + border) * box_size).tolist()
+    ys = ((rows + border) * box_size).tolist()
+    widths = ((ends - starts) * box_size).tolist()
+    height = _compact_number(box_size)
+
+    parts = [f"M{_join_numbers(_compact_number(xs[0]), _compact_number(ys[0]))}"]
+    previous_x, previous_y = xs[0], ys[0]
+    for index, (x, y, width) in enumerate(zip(xs, ys, widths)):
+        if index:
+            parts.append(f"m{_join_numbers(_compact_number(x - previous_x), _compact_number(y - previous_y))}")
+            previous_x, previous_y = x, y
+        parts.append(f"h{_compact_number(width)}v{height}h{_compact_number(-width)}z")
+    return ''.join(parts)
+
+def path_to_matrix(path_data, size, box_size=8, border=2):
+    """
+    Rasterize a path of closed, axis-aligned rectangles back to a module matrix.
+
+    Supports absolute and relative M/H/V/L/Z commands, which covers
+    SvgPathImage, render_path() and render_optimized_path() output.
+
+    Args:
+        path_data (str): SVG path data
+        size (int): Module count per side (qr.modules_count)
+        box_size (int): Size of each module in pixels
+        border (int): Border size in modules
+
+    Returns:
+        np.ndarray: 2-D bool array of dark modules (no border)
+    """
+    matrix = np.zeros((size, size), dtype=bool)
+    unit = box_size / 10
+
+    def fill(points):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x0 = int(round(min(xs) / unit)) - border
+        x1 = int(round(max(xs) / unit)) - border
+        y0 = int(round(min(ys) / unit)) - border
+        y1 = int(round(max(ys) / unit)) - border
+        matrix[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)] = True
+
+    x = y = 0.0
+    points = []
+    command = None
+    numbers = []
+
+    def apply(command, numbers):
+        nonlocal x, y, points
+        relative = command.islower()
+        op = command.upper()
+        if op == 'M' or op == 'L':
+            for i in range(0, len(numbers) - 1, 2):
+                dx, dy = numbers[i], numbers[i + 1]
+                x, y = (x + dx, y + dy) if relative else (dx, dy)
+                if op == 'M' and i == 0:
+                    if len(points) > 1:
+                        fill(points)
+                    points = []
+                points.append((x, y))
+        elif op == 'H':
+            for value in numbers:
+                x = x + value if relative else value
+                points.append((x, y))
+        elif op == 'V':
+            for value in numbers:
+                y = y + value if relative else value
+                points.append((x, y))
+        elif op == 'Z':
+            if len(points) > 1:
+                fill(points)
+            if points:
+                x, y = points[0]
+            points = []
+
+    for token_command, token_number in _PATH_TOKEN.findall(path_data):
+        if token_command:
+            if command is not None:
+                apply(command, numbers)
+            command, numbers = token_command, []
+        else:
+            numbers.append(float(token_number))
+    if command is not None:
+        apply(command, numbers)
+
+    return matrix
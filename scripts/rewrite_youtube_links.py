@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Site-wide YouTube Link Rewriter
+
+Scans index.html, guides/*.html and blogs/*.html line by line, finds YouTube
+links in attributes and text, and shortens them to youtu.be form with the
+same engine as youtube_url_shortener.py. Shorter links mean lower-version,
+smaller QR codes for the same video.
+
+By default nothing is written: the changes are printed as a unified diff.
+Pass --write to edit the files in place (atomically), or --check to exit 1
+when any link could be shortened.
+
+Usage:
+    python rewrite_youtube_links.py                  # Dry run: unified diff of every change
+    python rewrite_youtube_links.py --write          # Rewrite files in place
+    python rewrite_youtube_links.py --check          # CI: exit 1 if any long links remain
+    python rewrite_youtube_links.py --jobs 4 ../blogs/*.html
+"""
+
+import argparse
+import difflib
+import glob
+import html
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from fileutil import write_atomic
+from youtube_url_shortener import shorten_youtube_url
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SITE_PATTERNS = ('index.html', os.path.join('guides', '*.html'), os.path.join('blogs', '*.html'))
+
+# A YouTube URL as it appears in HTML: in an attribute (with &amp;) or in text.
+# It must start a token, so look-alike hosts (notyoutube.com) and YouTube URLs
+# nested in another URL's query string are left alone.
+YOUTUBE_LINK = re.compile(
+    r'(?<![\w.@/=?&%#+-])(?:https?://)?(?:[A-Za-z0-9-]+\.)?(?:youtube(?:-nocookie)?\.com|youtu\.be)/[^\s"\'<>()\[\]]*'
+)
+_TRAILING_PUNCTUATION = '.,:!?'
+
+def site_html_files(root=SITE_ROOT):
+    """List the site's HTML files (index.html, guides/*.html, blogs/*.html)."""
+    paths = []
+    for pattern in SITE_PATTERNS:
+        paths.extend(sorted(glob.glob(os.path.join(root, pattern))))
+    return paths
+
+@lru_cache(maxsize=4096)
+def shorten_link(link):
+    """
+    Shorten one YouTube link exactly as it appears in HTML (memoized).
+
+    HTML entities are decoded before shortening, and the link is returned
+    unchanged when it cannot be shortened.
+
+    Args:
+        link (str): Link text from the document (may contain &amp;)
+
+    Returns:
+        str: The youtu.be link, or the original link
+    """
+    shortened = shorten_youtube_url(html.unescape(link))
+    if shortened == html.unescape(link):
+        return link
+    return shortened
+
+def _replace_link(match):
+    link = match.group(0)
+    stripped = link.rstrip(_TRAILING_PUNCTUATION)
+    return shorten_link(stripped) + link[len(stripped):]
+
+def rewrite_lines(lines):
+    """
+    Shorten the YouTube links in a stream of lines.
+
+    Args:
+        lines (iterable): Lines of an HTML document (line endings kept)
+
+    Yields:
+        tuple: (line, rewritten line, number of links shortened)
+    """
+    for line in lines:
+        if 'youtu' not in line:
+            yield line, line, 0
+            continue
+        count = 0
+
+        def replace(match):
+            nonlocal count
+            replacement = _replace_link(match)
+            if replacement != match.group(0):
+                count += 1
+            return replacement
+
+        yield line, YOUTUBE_LINK.sub(replace, line), count
+
+def rewrite_file(path, write=False, diff=True):
+    """
+    Shorten the YouTube links in one HTML file.
+
+    Args:
+        path (str): HTML file
+        write (bool): Replace the file in place when links changed
+        diff (bool): Include a unified diff in the result
+
+    Returns:
+        dict: 'path', 'links' (number shortened), 'diff' (str) and 'written'
+    """
+    before = []
+    after = []
+    links = 0
+    with open(path, encoding='utf-8', newline='') as f:
+        for line, rewritten, count in rewrite_lines(f):
+            before.append(line)
+            after.append(rewritten)
+            links += count
+
+    result = {'path': path, 'links': links, 'diff': '', 'written': False}
+    if not links:
+        return result
+
+    if diff:
+        name = os.path.relpath(path, SITE_ROOT)
+        result['diff'] = ''.join(difflib.unified_diff(before, after, f"a/{name}", f"b/{name}", n=1))
+    if write:
+        write_atomic(path, ''.join(after))
+        result['written'] = True
+    return result
+
+def _rewrite_file_task(args):
+    return rewrite_file(*args)
+
+def rewrite_site(paths, write=False, diff=True, jobs=1):
+    """
+    Shorten YouTube links across many files, in parallel when jobs > 1.
+
+    Args:
+        paths (list): HTML files
+        write (bool): Replace changed files in place
+        diff (bool): Include unified diffs in the results
+        jobs (int): Worker processes (1 = run in this process)
+
+    Returns:
+        list: rewrite_file() results, in the same order as paths
+    """
+    tasks = [(path, write, diff) for path in paths]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            return list(executor.map(_rewrite_file_task, tasks))
+    return [_rewrite_file_task(task) for task in tasks]
+
+def main():
+    """Shorten YouTube links across the site's HTML files."""
+    parser = argparse.ArgumentParser(description='Shorten YouTube links in the site HTML to youtu.be form')
+    parser.add_argument('files', nargs='*',
+                       help='HTML files (default: index.html, guides/*.html, blogs/*.html)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--write', action='store_true',
+                     help='Rewrite files in place instead of printing a diff')
+    mode.add_argument('--check', action='store_true',
+                     help='Only count long links; exit 1 if any are found')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Worker processes (default: 1, 0 = one per CPU)')
+
+    args = parser.parse_args()
+
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 or a positive number')
+    jobs = args.jobs or os.cpu_count() or 1
+    paths = args.files or site_html_files()
+
+    start = time.perf_counter()
+    results = rewrite_site(paths, write=args.write, diff=not (args.write or args.check), jobs=jobs)
+    elapsed = time.perf_counter() - start
+
+    total = 0
+    for result in results:
+        if not result['links']:
+            continue
+        total += result['links']
+        if result['diff']:
+            sys.stdout.write(result['diff'])
+
+    summary = sys.stderr if not (args.write or args.check) else sys.stdout
+    for result in results:
+        if result['links']:
+            name = os.path.relpath(result['path'], SITE_ROOT)
+            action = 'shortened' if result['written'] else 'to shorten'
+            print(f"🔗 {name}: {result['links']} links {action}", file=summary)
+    print(f"⏱️  Scanned {len(results)} files in {elapsed * 1000:.1f} ms, {total} links "
+          f"{'shortened' if args.write else 'can be shortened'}", file=summary)
+
+    if args.check and total:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
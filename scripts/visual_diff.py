@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Visual Diff for Playwright Screenshot Baselines
+
+Compares actual screenshots against their expected baselines with NumPy and
+ranks the regressions by changed area, so a failed visual run can be triaged
+from one table instead of opening PNGs one by one.
+
+Pixels are compared with the same perceptual YIQ color distance Playwright's
+toHaveScreenshot() uses (pixelmatch), with the same default threshold of 0.2.
+Each pair also gets per-region statistics on a fixed grid and a heatmap PNG:
+the expected image faded to light gray, changed pixels from yellow (barely
+past the threshold) to red (maximal change), and magenta where the image
+sizes differ.
+
+Pairs are found in two ways:
+- A Playwright output directory (default: test-results): every
+  `<name>-actual.png` next to a `<name>-expected.png`
+- Two directories (e.g. tests/*-snapshots and a fresh capture): files with
+  the same relative path
+
+Usage:
+    python visual_diff.py                                    # Triage ./test-results
+    python visual_diff.py --results path/to/test-results
+    python visual_diff.py tests/layout-architecture.spec.ts-snapshots new-snapshots/
+    python visual_diff.py --threshold 0.1 --tile 128 --jobs 4 --json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_THRESHOLD = 0.2        # Playwright / pixelmatch default
+DEFAULT_TILE = 64              # Region grid size in pixels
+DEFAULT_OUT = "visual-diff"
+MAX_YIQ_DELTA = 35215.0        # Largest possible YIQ distance between two colors
+TOP_REGIONS = 5
+
+def load_rgb(path):
+    """
+    Load a screenshot as 8-bit RGB, blending any transparency onto white.
+
+    Args:
+        path (str): PNG path
+
+    Returns:
+        numpy.ndarray: (height, width, 3) uint8 array
+    """
+    with Image.open(path) as image:
+        rgba = np.asarray(image.convert("RGBA"))
+    if (rgba[..., 3] == 255).all():
+        return np.ascontiguousarray(rgba[..., :3])
+    alpha = rgba[..., 3:] / 255.0
+    return np.round(255.0 + (rgba[..., :3] - 255.0) * alpha).astype(np.uint8)
+
+def _yiq(rgb):
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    return (r * 0.29889531 + g * 0.58662247 + b * 0.11448223,
+            r * 0.59597799 - g * 0.27417610 - b * 0.32180189,
+            r * 0.21147017 - g * 0.52261711 + b * 0.31114694)
+
+def color_delta(expected, actual):
+    """
+    Perceptual color distance per pixel, as in pixelmatch.
+
+    Args:
+        expected (numpy.ndarray): (..., 3) RGB
+        actual (numpy.ndarray): (..., 3) RGB, same shape
+
+    Returns:
+        numpy.ndarray: (...) distances from 0 to MAX_YIQ_DELTA
+    """
+    (y1, i1, q1), (y2, i2, q2) = _yiq(expected.astype(np.float32)), _yiq(actual.astype(np.float32))
+    return 0.5053 * (y1 - y2) ** 2 + 0.299 * (i1 - i2) ** 2 + 0.1957 * (q1 - q2) ** 2
+
+def changed_mask(delta, threshold):
+    """Pixels past the threshold; NaN (present in only one image) counts as changed."""
+    return ~(delta <= threshold ** 2)
+
+def compare_arrays(expected, actual, threshold=DEFAULT_THRESHOLD, tile=DEFAULT_TILE):
+    """
+    Diff two RGB arrays.
+
+    Images of different sizes are compared on the union of both; pixels that
+    exist in only one image count as changed.
+
+    Args:
+        expected (numpy.ndarray): (h, w, 3) uint8 RGB baseline
+        actual (numpy.ndarray): (h, w, 3) uint8 RGB screenshot
+        threshold (float): Perceptual threshold, 0 (exact) to 1 (anything goes)
+        tile (int): Region size in pixels
+
+    Returns:
+        tuple: (stats dict, per-pixel distance scaled to 0-1 with NaN where only
+               one image has pixels)
+    """
+    height = max(expected.shape[0], actual.shape[0])
+    width = max(expected.shape[1], actual.shape[1])
+    common_h = min(expected.shape[0], actual.shape[0])
+    common_w = min(expected.shape[1], actual.shape[1])
+
+    # Only pixels whose bytes differ need the perceptual distance
+    old, new = expected[:common_h, :common_w], actual[:common_h, :common_w]
+    differs = np.nonzero((old != new).any(axis=2))
+    common = np.zeros((common_h, common_w), dtype=np.float32)
+    common[differs] = color_delta(old[differs], new[differs]) / MAX_YIQ_DELTA
+
+    delta = np.full((height, width), np.nan, dtype=np.float32)
+    delta[:common_h, :common_w] = common
+    changed = changed_mask(delta, threshold)
+
+    # Per-region changed pixel counts on a tile grid
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=np.uint32)
+    padded[:height, :width] = changed
+    counts = padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+    regions = []
+    for flat in np.argsort(counts, axis=None)[::-1][:TOP_REGIONS]:
+        row, col = divmod(int(flat), cols)
+        if counts[row, col] == 0:
+            break
+        x, y = col * tile, row * tile
+        w, h = min(tile, width - x), min(tile, height - y)
+        regions.append({"x": x, "y": y, "width": w, "height": h,
+                        "changed_pixels": int(counts[row, col]), "changed_ratio": float(counts[row, col] / (w * h))})
+
+    changed_pixels = int(changed.sum())
+    ys, xs = np.nonzero(changed)
+    bbox = None
+    if changed_pixels:
+        bbox = {"x": int(xs.min()), "y": int(ys.min()),
+                "width": int(xs.max() - xs.min() + 1), "height": int(ys.max() - ys.min() + 1)}
+
+    stats = {
+        "expected_size": [expected.shape[1], expected.shape[0]],
+        "actual_size": [actual.shape[1], actual.shape[0]],
+        "size_mismatch": expected.shape != actual.shape,
+        "changed_pixels": changed_pixels,
+        "changed_ratio": changed_pixels / (height * width),
+        "max_delta": float(common.max()) ** 0.5 if common.size else 0.0,
+        "regions_changed": int((counts > 0).sum()),
+        "regions_total": rows * cols,
+        "bbox": bbox,
+        "top_regions": regions,
+    }
+    return stats, delta
+
+def heatmap(delta, expected, threshold=DEFAULT_THRESHOLD):
+    """
+    Render a diff heatmap.
+
+    Args:
+        delta (numpy.ndarray): From compare_arrays()
+        expected (numpy.ndarray): uint8 RGB baseline, faded into the background
+        threshold (float): Perceptual threshold used for the diff
+
+    Returns:
+        PIL.Image.Image: RGB heatmap
+    """
+    luminance = np.full(delta.shape, 255.0, dtype=np.float32)
+    luminance[:expected.shape[0], :expected.shape[1]] = _yiq(expected.astype(np.float32))[0]
+    out = np.repeat((255.0 - (255.0 - luminance) * 0.1)[..., None], 3, axis=2)
+
+    outside = np.isnan(delta)
+    changed = changed_mask(delta, threshold) & ~outside
+    # Position between the threshold (yellow) and the largest possible change (red)
+    strength = np.clip((np.sqrt(delta[changed]) - threshold) / max(1.0 - threshold, 1e-6), 0, 1)
+    out[changed] = np.stack([np.full_like(strength, 255.0), 255.0 * (1 - strength), np.zeros_like(strength)], axis=-1)
+    out[outside] = (255.0, 0.0, 255.0)
+    return Image.fromarray(out.astype(np.uint8), "RGB")
+
+def compare_pair(name, expected_path, actual_path, threshold=DEFAULT_THRESHOLD, tile=DEFAULT_TILE, heatmap_dir=None):
+    """
+    Compare one screenshot against its baseline.
+
+    Args:
+        name (str): Label for the report (relative path or snapshot name)
+        expected_path (str): Baseline PNG
+        actual_path (str): Screenshot PNG
+        threshold (float): Perceptual threshold
+        tile (int): Region size in pixels
+        heatmap_dir (str): Directory for the heatmap PNG (None to skip)
+
+    Returns:
+        dict: compare_arrays() stats plus 'name', paths, 'heatmap' and 'seconds'
+    """
+    started = time.perf_counter()
+    expected = load_rgb(expected_path)
+    stats, delta = compare_arrays(expected, load_rgb(actual_path), threshold, tile)
+
+    heatmap_path = None
+    if heatmap_dir and stats["changed_pixels"]:
+        heatmap_path = os.path.join(heatmap_dir, os.path.splitext(name.replace(os.sep, "__"))[0] + "-diff.png")
+        heatmap(delta, expected, threshold).save(heatmap_path)
+
+    return {"name": name, "expected": expected_path, "actual": actual_path, **stats,
+            "heatmap": heatmap_path, "seconds": time.perf_counter() - started}
+
+def _compare_pair_task(args):
+    return compare_pair(*args)
+
+def find_result_pairs(results_dir):
+    """
+    Actual/expected pairs in a Playwright output directory.
+
+    Args:
+        results_dir (str): Playwright outputDir (e.g. test-results)
+
+    Returns:
+        list: (name, expected_path, actual_path) tuples, sorted by name
+    """
+    pairs = []
+    for actual in glob.glob(os.path.join(results_dir, "**", "*-actual.png"), recursive=True):
+        expected = actual[:-len("-actual.png")] + "-expected.png"
+        if os.path.exists(expected):
+            name = os.path.relpath(actual, results_dir)[:-len("-actual.png")] + ".png"
+            pairs.append((name, expected, actual))
+    return sorted(pairs)
+
+def find_directory_pairs(expected_dir, actual_dir):
+    """
+    Pairs of PNGs with the same relative path in two directories.
+
+    Args:
+        expected_dir (str): Baselines
+        actual_dir (str): New screenshots
+
+    Returns:
+        tuple: (pairs as (name, expected_path, actual_path), names only in expected_dir,
+                names only in actual_dir)
+    """
+    def pngs(root):
+        return {os.path.relpath(p, root) for p in glob.glob(os.path.join(root, "**", "*.png"), recursive=True)}
+
+    expected, actual = pngs(expected_dir), pngs(actual_dir)
+    pairs = [(name, os.path.join(expected_dir, name), os.path.join(actual_dir, name))
+             for name in sorted(expected & actual)]
+    return pairs, sorted(expected - actual), sorted(actual - expected)
+
+def diff_all(pairs, threshold=DEFAULT_THRESHOLD, tile=DEFAULT_TILE, heatmap_dir=DEFAULT_OUT, jobs=1):
+    """
+    Compare many pairs, in parallel when jobs > 1, ranked by changed area.
+
+    Args:
+        pairs (list): (name, expected_path, actual_path) tuples
+        threshold (float): Perceptual threshold
+        tile (int): Region size in pixels
+        heatmap_dir (str): Directory for heatmaps (None to skip)
+        jobs (int): Worker processes (1 = run in this process)
+
+    Returns:
+        list: compare_pair() results, most changed pixels first
+    """
+    if heatmap_dir:
+        os.makedirs(heatmap_dir, exist_ok=True)
+    tasks = [(name, expected, actual, threshold, tile, heatmap_dir) for name, expected, actual in pairs]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            results = list(executor.map(_compare_pair_task, tasks))
+    else:
+        results = [_compare_pair_task(task) for task in tasks]
+    return sorted(results, key=lambda r: (-r["changed_pixels"], r["name"]))
+
+def print_table(results, max_diff_pixels=0):
+    """Print the ranked comparison table."""
+    print(f"{'#':>3}  {'screenshot':<52} {'changed px':>11} {'ratio':>7} {'regions':>9}  bbox / size")
+    for rank, r in enumerate(results, 1):
+        icon = "❌" if r["changed_pixels"] > max_diff_pixels else "✅"
+        where = ""
+        if r["size_mismatch"]:
+            where = f"size {r['expected_size'][0]}x{r['expected_size'][1]} → {r['actual_size'][0]}x{r['actual_size'][1]}"
+        elif r["bbox"]:
+            b = r["bbox"]
+            where = f"{b['width']}x{b['height']} at ({b['x']},{b['y']})"
+        print(f"{rank:>3}. {icon} {r['name'][:50]:<50} {r['changed_pixels']:>11,} {r['changed_ratio']:>7.2%} "
+              f"{r['regions_changed']:>4}/{r['regions_total']:<4}  {where}")
+
+def main():
+    """Compare screenshots against baselines and rank the regressions."""
+    parser = argparse.ArgumentParser(description='Rank visual regressions between screenshots and baselines')
+    parser.add_argument('dirs', nargs='*', metavar='DIR',
+                       help='EXPECTED_DIR ACTUAL_DIR to compare files with the same relative path')
+    parser.add_argument('--results', default='test-results',
+                       help='Playwright output directory with *-actual/*-expected pairs (default: test-results)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help=f'Perceptual threshold, 0-1 (default: {DEFAULT_THRESHOLD}, as in Playwright)')
+    parser.add_argument('--tile', type=int, default=DEFAULT_TILE,
+                       help=f'Region size in pixels (default: {DEFAULT_TILE})')
+    parser.add_argument('--max-diff-pixels', type=int, default=0,
+                       help='Changed pixels allowed per screenshot before it fails (default: 0)')
+    parser.add_argument('--out', default=DEFAULT_OUT, help=f'Heatmap directory (default: {DEFAULT_OUT})')
+    parser.add_argument('--no-heatmaps', action='store_true', help='Skip writing heatmaps')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                       help='Worker processes (default: 0 = one per CPU)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    if len(args.dirs) not in (0, 2):
+        parser.error('give both EXPECTED_DIR and ACTUAL_DIR, or neither')
+    if not 0 <= args.threshold <= 1:
+        parser.error('--threshold must be between 0 and 1')
+    if args.jobs < 0 or args.tile < 1:
+        parser.error('--jobs must be 0 or positive and --tile positive')
+    jobs = args.jobs or os.cpu_count() or 1
+    log = sys.stderr if args.json else sys.stdout
+
+    missing, extra = [], []
+    if args.dirs:
+        pairs, missing, extra = find_directory_pairs(*args.dirs)
+    else:
+        pairs = find_result_pairs(args.results)
+
+    start = time.perf_counter()
+    results = diff_all(pairs, args.threshold, args.tile, None if args.no_heatmaps else args.out, jobs)
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if r["changed_pixels"] > args.max_diff_pixels]
+
+    if args.json:
+        print(json.dumps({"results": results, "missing_actual": missing, "missing_expected": extra}, indent=2))
+    else:
+        print("🔍 Visual Diff")
+        print("=" * 50)
+        print_table(results, args.max_diff_pixels)
+        for r in failed[:10]:
+            regions = ", ".join(f"({g['x']},{g['y']}) {g['changed_ratio']:.0%}" for g in r["top_regions"])
+            print(f"\n   {r['name']}: worst regions {regions}")
+            if r["heatmap"]:
+                print(f"   🗺️  {r['heatmap']}")
+    for name in missing:
+        print(f"⚠️  No actual screenshot for {name}", file=log)
+    for name in extra:
+        print(f"⚠️  No baseline for {name}", file=log)
+
+    print(f"\n📊 {len(results)} pairs compared in {elapsed:.2f}s ({jobs} process(es)); "
+          f"{len(failed)} over {args.max_diff_pixels} changed pixels", file=log)
+    if not pairs:
+        print("ℹ️  No screenshot pairs found", file=log)
+    sys.exit(1 if failed or missing else 0)
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,61 @@
 """
 YouTube URL Shortener
 Shortens long YouTube URLs to youtu.be format while preserving prefixes like @
+
+Usage:
+    python youtube_url_shortener.py URL [URL ...]          # Shorten URLs given as arguments
+    python youtube_url_shortener.py --file links.txt       # Stream a file, one URL per line, as JSONL
+    cat links.txt | python youtube_url_shortener.py --file -   # Stream stdin as JSONL
+    python youtube_url_shortener.py --benchmark            # Per-URL cost micro-benchmark
+    python youtube_url_shortener.py                        # Run test cases
 """
 
+import argparse
+import json
 import re
-from urllib.parse import urlparse, parse_qs
+import sys
+import timeit
+
+# One pattern covers every supported form, so a URL is scanned once:
+#   [scheme://][sub.]youtube.com/watch?...v=ID   (any query position)
+#   [scheme://][sub.]youtube.com/embed|shorts|live|v/ID
+#   [scheme://][sub.]youtube-nocookie.com/embed/ID
+#   [scheme://]youtu.be/ID                        (already short)
+# The ID must end at a URL delimiter, so 'v=abc%20' is left alone.
+_YOUTUBE_URL = re.compile(
+    r'(?:https?://)?(?:'
+    r'(?:[A-Za-z0-9-]+\.)?youtube(?:-nocookie)?\.com/'
+    r'(?:watch/?\?(?:[^#]*?&)?v=|embed/|shorts/|live/|v/)(?P<long_id>[A-Za-z0-9_-]+)'
+    r'|youtu\.be/(?P<short_id>[A-Za-z0-9_-]+)'
+    r')(?=[?&#/]|$)'
+)
+
+# Cheap substring test that every YouTube URL passes; most other URLs are
+# rejected without running the pattern at all.
+_HOST_HINT = 'youtu'
+
+
+def _match_youtube_url(url):
+    """Match a URL (without @ prefix) against the YouTube pattern, or return None."""
+    if _HOST_HINT not in url:
+        return None
+    return _YOUTUBE_URL.match(url)
+
+
+def extract_video_id(url):
+    """
+    Extract the video ID from any supported YouTube URL.
+    
+    Args:
+        url (str): A youtube.com, m.youtube.com, /embed/, /shorts/ or youtu.be URL (an @ prefix is allowed)
+    
+    Returns:
+        str: The video ID, or None if the URL is not a recognised YouTube video URL
+    """
+    match = _match_youtube_url(url[1:] if url.startswith('@') else url)
+    if not match:
+        return None
+    return match.group('long_id') or match.group('short_id')
 
 
 def shorten_youtube_url(url):
@@ -16,7 +67,8 @@ def shorten_youtube_url(url):
         url (str): The YouTube URL to shorten (e.g., "@https://www.youtube.com/watch?v=VIDEO_ID&list=...")
     
     Returns:
-        str: The shortened URL (e.g., "@https://youtu.be/VIDEO_ID")
+        str: The shortened URL (e.g., "@https://youtu.be/VIDEO_ID"); already short
+             and non-YouTube URLs are returned unchanged
     """
     # Extract prefix (like @) if present
     prefix = ""
@@ -24,111 +76,203 @@ def shorten_youtube_url(url):
         prefix = "@"
         url = url[1:]
     
-    # Parse the URL
-    parsed_url = urlparse(url)
+    match = _match_youtube_url(url)
+    if not match or not match.group('long_id'):
+        return prefix + url  # Not YouTube, no video ID, or already short
     
-    # Check if it's a YouTube URL
-    if 'youtube.com' not in parsed_url.netloc and 'youtu.be' not in parsed_url.netloc:
-        return prefix + url  # Return original if not YouTube
+    return f"{prefix}https://youtu.be/{match.group('long_id')}"
+
+
+# Kept for callers of the old regex-based implementation; both names now
+# share one engine and always agree.
+shorten_youtube_url_regex = shorten_youtube_url
+
+
+def batch_shorten_urls(urls):
+    """
+    Shorten multiple YouTube URLs at once.
+    
+    Args:
+        urls (list): List of YouTube URLs to shorten
     
-    # If already short format, return as is
-    if 'youtu.be' in parsed_url.netloc:
-        return prefix + url
+    Returns:
+        list: List of shortened URLs
+    """
+    return [shorten_youtube_url(url) for url in urls]
+
+
+def stream_shorten_urls(lines):
+    """
+    Shorten URLs one at a time from any iterable of lines.
     
-    # Extract video ID from query parameters
-    query_params = parse_qs(parsed_url.query)
-    video_id = query_params.get('v', [None])[0]
+    Lines are stripped and blank lines are skipped. Nothing is collected, so
+    an open file or sys.stdin can be streamed in constant memory.
     
-    if not video_id:
-        return prefix + url  # Return original if no video ID found
+    Args:
+        lines (iterable): URLs, one per item (e.g. an open file)
     
-    # Construct short URL
-    short_url = f"https://youtu.be/{video_id}"
-    return prefix + short_url
+    Yields:
+        dict: 'input', 'output', 'video_id' and 'changed' for each URL
+    """
+    for line in lines:
+        url = line.strip()
+        if not url:
+            continue
+        shortened = shorten_youtube_url(url)
+        yield {
+            'input': url,
+            'output': shortened,
+            'video_id': extract_video_id(url),
+            'changed': shortened != url
+        }
 
 
-def shorten_youtube_url_regex(url):
+def write_jsonl(records, out):
     """
-    Alternative implementation using regex for YouTube URL shortening.
+    Write records to a text stream as JSON Lines.
     
     Args:
-        url (str): The YouTube URL to shorten
+        records (iterable): Dicts to serialize
+        out: Writable text stream
     
     Returns:
-        str: The shortened URL
+        int: Number of records written
     """
-    # Extract prefix (like @) if present
-    prefix = ""
-    if url.startswith('@'):
-        prefix = "@"
-        url = url[1:]
-    
-    # Regex pattern to match YouTube URLs and extract video ID
-    pattern = r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)'
-    match = re.search(pattern, url)
-    
-    if match:
-        video_id = match.group(1)
-        short_url = f"https://youtu.be/{video_id}"
-        return prefix + short_url
-    
-    # If already short format or not a YouTube URL, return as is
-    return prefix + url
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write('\n')
+        count += 1
+    return count
 
 
-def batch_shorten_urls(urls):
+BENCHMARK_YOUTUBE_URLS = [
+    "https://www.youtube.com/watch?v=N9j--n-zGgc&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M",
+    "@https://www.youtube.com/watch?v=gSVg40u0fZE&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=5",
+    "https://m.youtube.com/watch?feature=share&v=twREXouRxns",
+    "https://www.youtube.com/embed/rR_n2ciilrc?start=30",
+    "https://youtube.com/shorts/l0d7ks9ZkjU",
+    "https://youtu.be/y6-e233rrQE",
+]
+
+BENCHMARK_OTHER_URLS = [
+    "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+    "https://github.com/CCRI-Cyberknights/page/blob/main/README.md",
+    "https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Cache-Control",
+    "https://www.ccri.edu/comp/",
+    "https://docs.python.org/3/library/re.html#re.compile",
+    "https://example.com/search?q=linux+permissions&page=2",
+]
+
+
+def run_benchmark(number=200000):
     """
-    Shorten multiple YouTube URLs at once.
+    Print the per-URL cost of shorten_youtube_url() for two input mixes.
     
     Args:
-        urls (list): List of YouTube URLs to shorten
+        number (int): URLs to shorten per mix
     
     Returns:
-        list: List of shortened URLs
+        dict: Mix name -> nanoseconds per URL
     """
-    return [shorten_youtube_url(url) for url in urls]
+    mixes = {
+        'all YouTube': BENCHMARK_YOUTUBE_URLS,
+        'mostly non-YouTube (1 in 10)': BENCHMARK_OTHER_URLS * 3 + BENCHMARK_YOUTUBE_URLS[:2],
+    }
+    
+    print("YouTube URL Shortener Benchmark:")
+    print("=" * 50)
+    
+    results = {}
+    for name, urls in mixes.items():
+        rounds = max(1, number // len(urls))
+        timer = timeit.Timer(lambda: [shorten_youtube_url(url) for url in urls])
+        best = min(timer.repeat(repeat=5, number=rounds))
+        results[name] = best / (rounds * len(urls)) * 1e9
+        print(f"⏱️  {name}: {results[name]:.0f} ns/URL ({rounds * len(urls):,} URLs, best of 5)")
+    return results
 
 
-if __name__ == "__main__":
-    import sys
+def run_test_cases():
+    """Print shortening results for a fixed set of sample URLs."""
+    test_urls = [
+        "@https://www.youtube.com/watch?v=N9j--n-zGgc&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=43s",
+        "@https://youtu.be/N9j--n-zGgc",  # Already short
+        "https://www.youtube.com/watch?v=abc123",
+        "https://example.com/not-youtube",  # Not YouTube
+        "@https://www.youtube.com/watch?v=xyz789&feature=youtu.be"
+    ]
+    
+    print("YouTube URL Shortener Test Results:")
+    print("=" * 50)
+    
+    for i, url in enumerate(test_urls, 1):
+        shortened = shorten_youtube_url(url)
+        print(f"Test {i}:")
+        print(f"  Input:  {url}")
+        print(f"  Output: {shortened}")
+        print()
+    
+    print("Batch shortening test:")
+    batch_results = batch_shorten_urls(test_urls)
+    for original, shortened in zip(test_urls, batch_results):
+        print(f"{original} -> {shortened}")
+    
+    print("\nUsage examples:")
+    print("python youtube_url_shortener.py 'https://www.youtube.com/watch?v=VIDEO_ID'")
+    print("python youtube_url_shortener.py '@https://www.youtube.com/watch?v=VIDEO_ID&list=...'")
+    print("python youtube_url_shortener.py --file links.txt > short_links.jsonl")
+
+
+def main():
+    """Shorten URLs from arguments, or stream them from a file or stdin."""
+    parser = argparse.ArgumentParser(description='Shorten YouTube URLs to youtu.be format')
+    parser.add_argument('urls', nargs='*',
+                       help='URLs to shorten (no URLs and no --file runs the test cases)')
+    parser.add_argument('--file', '-f', metavar='FILE',
+                       help="Stream URLs from FILE, one per line ('-' for stdin), writing JSONL to stdout")
+    parser.add_argument('--jsonl', action='store_true',
+                       help='Print JSONL records for URL arguments too')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='Measure per-URL cost for YouTube-only and mostly non-YouTube input')
+    
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        run_benchmark()
+        return
+    
+    if args.file:
+        if args.file == '-':
+            write_jsonl(stream_shorten_urls(sys.stdin), sys.stdout)
+            return
+        try:
+            with open(args.file, encoding='utf-8') as f:
+                write_jsonl(stream_shorten_urls(f), sys.stdout)
+        except OSError as e:
+            print(f"❌ Could not read {args.file}: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    if not args.urls:
+        run_test_cases()
+        return
+    
+    if args.jsonl:
+        write_jsonl(stream_shorten_urls(args.urls), sys.stdout)
+        return
     
     # If URLs provided as command line arguments, shorten them
-    if len(sys.argv) > 1:
-        urls_to_shorten = sys.argv[1:]
-        print("Shortening YouTube URLs:")
-        print("=" * 40)
-        
-        for url in urls_to_shorten:
-            shortened = shorten_youtube_url(url)
-            print(f"Input:  {url}")
-            print(f"Output: {shortened}")
-            print()
-    else:
-        # Test cases
-        test_urls = [
-            "@https://www.youtube.com/watch?v=N9j--n-zGgc&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M",
-            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=43s",
-            "@https://youtu.be/N9j--n-zGgc",  # Already short
-            "https://www.youtube.com/watch?v=abc123",
-            "https://example.com/not-youtube",  # Not YouTube
-            "@https://www.youtube.com/watch?v=xyz789&feature=youtu.be"
-        ]
-        
-        print("YouTube URL Shortener Test Results:")
-        print("=" * 50)
-        
-        for i, url in enumerate(test_urls, 1):
-            shortened = shorten_youtube_url(url)
-            print(f"Test {i}:")
-            print(f"  Input:  {url}")
-            print(f"  Output: {shortened}")
-            print()
-        
-        print("Batch shortening test:")
-        batch_results = batch_shorten_urls(test_urls)
-        for original, shortened in zip(test_urls, batch_results):
-            print(f"{original} -> {shortened}")
-        
-        print("\nUsage examples:")
-        print("python youtube_url_shortener.py 'https://www.youtube.com/watch?v=VIDEO_ID'")
-        print("python youtube_url_shortener.py '@https://www.youtube.com/watch?v=VIDEO_ID&list=...'")
+    print("Shortening YouTube URLs:")
+    print("=" * 40)
+    
+    for url in args.urls:
+        shortened = shorten_youtube_url(url)
+        print(f"Input:  {url}")
+        print(f"Output: {shortened}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,109 +4,51 @@ Robust QR Code Generator with Base64 Embedding
 
 Generates QR codes and creates HTML test pages with proper Base64 embedding.
 This addresses the white QR code rendering issue by ensuring clean data URI generation.
+
+Each PNG is encoded once (render_qr()) and its Base64 is streamed in chunks
+straight into the page (make_html()), with metadata kept in memory. gen_qr()
+still writes the PNG, .b64.txt and .meta.json files for file-based callers.
 """
 
 from qrcode import QRCode
 from PIL import Image
+import argparse
 import base64
 import io
 import json
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import decode
+from qr_png import PNG_MODES, encode_png
+
 OUT = "out"
-os.makedirs(OUT, exist_ok=True)
 
-def gen_qr(id, data, box_size=10, border=4, error='M'):
-    """Generate QR code and save as PNG, Base64, and metadata."""
-    import qrcode.constants
-    qr = QRCode(
-        error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{error}'),
-        box_size=box_size, 
-        border=border
-    )
-    qr.add_data(data)
-    qr.make(fit=True)
-    
-    # Generate image with RGBA for better compatibility
-    img = qr.make_image(fill_color="black", back_color="white").convert("RGBA")
-    
-    # Save PNG
-    png_path = f"{OUT}/qr_{id}.png"
-    img.save(png_path, format='PNG')
-    
-    # Generate Base64 (raw, no data URI prefix)
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    b64 = base64.b64encode(buffer.getvalue()).decode('ascii')
-    
-    # Save Base64 to file
-    with open(f"{OUT}/qr_{id}.b64.txt", 'w') as f:
-        f.write(b64)
-    
-    # Save metadata
-    with open(f"{OUT}/qr_{id}.meta.json", 'w') as f:
-        json.dump({
-            "id": id,
-            "data": data,
-            "box_size": box_size,
-            "border": border,
-            "error_level": error,
-            "png_size": img.size,
-            "base64_length": len(b64)
-        }, f, indent=2)
-    
-    return png_path, b64
+# Linux cheatsheet URLs used for the test page
+TEST_URLS = {
+    "home": "https://ccri-cyberknights.github.io/page/",
+    "cheatsheet3": "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+    "video1": "https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6",
+    "video2": "https://www.youtube.com/watch?v=2DcDQe8idtU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=7"
+}
 
-def make_html(ids):
-    """Create HTML page with properly embedded QR codes."""
-    parts = []
-    
-    for id in ids:
-        # Read Base64 data
-        b64_file = f"{OUT}/qr_{id}.b64.txt"
-        if not os.path.exists(b64_file):
-            print(f"Warning: Base64 file not found for {id}")
-            continue
-            
-        b64 = open(b64_file).read().strip()
-        
-        # Read metadata
-        meta_file = f"{OUT}/qr_{id}.meta.json"
-        meta = {}
-        if os.path.exists(meta_file):
-            with open(meta_file) as f:
-                meta = json.load(f)
-        
-        # Create card with proper data URI
-        parts.append(f'''
-        <div class="card" data-qr-id="{id}">
-            <h3>QR Code {id}</h3>
-            <div class="qr-info">
-                <div class="url">{meta.get('data', 'Unknown URL')}</div>
-                <div class="meta">Size: {meta.get('png_size', 'Unknown')} | Base64: {meta.get('base64_length', 'Unknown')} chars</div>
-            </div>
-            <img id="qr_{id}" 
-                 src="data:image/png;base64,{b64}" 
-                 alt="QR Code {id}"
-                 class="qr-image"
-                 data-expected-url="{meta.get('data', '')}"
-                 data-base64-length="{len(b64)}">
-        </div>''')
-    
-    html = f'''<!DOCTYPE html>
+BASE64_CHUNK = 3 * 16 * 1024  # Input bytes per streamed Base64 chunk (multiple of 3)
+
+HTML_HEAD = '''<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <title>QR Code Test Results</title>
     <style>
-        body {{
+        body {
             font-family: Arial, sans-serif;
             margin: 20px;
             background: #1a1a1a;
             color: #fff;
-        }}
-        .card {{
+        }
+        .card {
             display: inline-block;
             padding: 20px;
             margin: 20px;
@@ -114,73 +56,282 @@ def make_html(ids):
             border-radius: 8px;
             border: 1px solid #333;
             vertical-align: top;
-        }}
-        .qr-info {{
+        }
+        .qr-info {
             margin-bottom: 15px;
-        }}
-        .url {{
+        }
+        .url {
             color: #4ade80;
             word-break: break-all;
             font-size: 14px;
             margin-bottom: 5px;
-        }}
-        .meta {{
+        }
+        .meta {
             color: #94a3b8;
             font-size: 12px;
-        }}
-        .qr-image {{
+        }
+        .qr-image {
             width: 200px;
             height: 200px;
             border: 2px solid #444;
             background: #fff;
-        }}
-        h1 {{
+            image-rendering: pixelated;
+        }
+        h1 {
             color: #fbbf24;
             margin-bottom: 30px;
-        }}
-        h3 {{
+        }
+        h3 {
             color: #60a5fa;
             margin-top: 0;
-        }}
-        .debug-info {{
+        }
+        .debug-info {
             margin-top: 20px;
             padding: 15px;
             background: #333;
             border-radius: 5px;
             font-family: monospace;
             font-size: 12px;
-        }}
+        }
     </style>
 </head>
 <body>
     <h1>🧪 QR Code Test Results</h1>
     <p>Generated QR codes for testing. Use your phone's camera to scan and verify the URLs.</p>
     
-    {''.join(parts)}
+    '''
+
+HTML_TAIL = '''
     
     <div class="debug-info">
         <h3>Debug Information</h3>
         <p>Run this in browser console to check image loading:</p>
-        <pre>document.querySelectorAll('img').forEach(img => {{
+        <pre>document.querySelectorAll('img').forEach(img => {
     console.log('ID:', img.id, 
                 'Src length:', img.src.length,
                 'Natural size:', img.naturalWidth + 'x' + img.naturalHeight,
                 'Visible:', img.offsetWidth > 0 && img.offsetHeight > 0);
-}});</pre>
+});</pre>
     </div>
 </body>
 </html>'''
+
+def render_qr(id, data, box_size=10, border=4, error='M', png_mode='rgba'):
+    """
+    Encode a QR code to PNG bytes once and keep everything in memory.
+
+    Args:
+        id (str): Identifier for the code
+        data (str): Data to encode
+        box_size (int): Pixels per module (1 = one pixel per module, scaled up by the page)
+        border (int): Quiet zone in modules
+        error (str): Error correction level (L, M, Q, H)
+        png_mode (str): 'rgba' (Pillow RGBA) or a 1-bit mode from qr_png ('gray1', 'palette1')
+
+    Returns:
+        dict: The metadata fields written to .meta.json, plus 'png' (bytes)
+    """
+    import qrcode.constants
+    qr = QRCode(
+        error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{error}'),
+        box_size=box_size, 
+        border=border
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
     
-    html_path = f"{OUT}/index.html"
+    # Encode the PNG exactly once; the file, Base64 and data URI all use these bytes
+    if png_mode in PNG_MODES:
+        png = encode_png(qr.modules, box_size, border, mode=png_mode)
+        side = (qr.modules_count + 2 * border) * box_size
+        png_size = [side, side]
+    elif png_mode == 'rgba':
+        # Generate image with RGBA for better compatibility
+        img = qr.make_image(fill_color="black", back_color="white").convert("RGBA")
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG')
+        png = buffer.getvalue()
+        png_size = list(img.size)
+    else:
+        raise ValueError(f"Unknown PNG mode {png_mode!r}")
+    
+    return {
+        "id": id,
+        "data": data,
+        "box_size": box_size,
+        "border": border,
+        "error_level": error,
+        "png_mode": png_mode,
+        "png_size": png_size,
+        "base64_length": base64_length(len(png)),
+        "png": png
+    }
+
+def base64_length(size):
+    """Length of the padded Base64 encoding of size bytes."""
+    return 4 * ((size + 2) // 3)
+
+def write_base64(out, data, chunk_size=BASE64_CHUNK):
+    """
+    Stream the Base64 encoding of data to a text file in fixed-size chunks.
+
+    The chunk size is a multiple of 3, so the chunks concatenate to exactly
+    base64.b64encode(data) without ever holding the whole string.
+
+    Args:
+        out (file): Text file object to write to
+        data (bytes): Data to encode
+        chunk_size (int): Input bytes per chunk (multiple of 3)
+
+    Returns:
+        int: Number of characters written
+    """
+    view = memoryview(data)
+    written = 0
+    for start in range(0, len(view), chunk_size):
+        written += out.write(base64.b64encode(view[start:start + chunk_size]).decode('ascii'))
+    return written
+
+def gen_qr(id, data, box_size=10, border=4, error='M', out_dir=OUT, sidecars=True, png_mode='rgba'):
+    """
+    Generate QR code and save as PNG, Base64, and metadata.
+
+    Args:
+        id (str): Identifier used in the output file names
+        data (str): Data to encode
+        box_size (int): Pixels per module
+        border (int): Quiet zone in modules
+        error (str): Error correction level (L, M, Q, H)
+        out_dir (str): Directory for qr_<id>.png, .b64.txt and .meta.json
+        sidecars (bool): Also write the .b64.txt and .meta.json files
+        png_mode (str): PNG encoding, as in render_qr()
+
+    Returns:
+        tuple: (PNG path, Base64 string)
+    """
+    record = render_qr(id, data, box_size, border, error, png_mode)
+    png_path = save_png(record, out_dir)
+    
+    # Generate Base64 (raw, no data URI prefix)
+    b64 = base64.b64encode(record["png"]).decode('ascii')
+    
+    if sidecars:
+        with open(os.path.join(out_dir, f"qr_{id}.b64.txt"), 'w') as f:
+            f.write(b64)
+        
+        with open(os.path.join(out_dir, f"qr_{id}.meta.json"), 'w') as f:
+            json.dump(metadata(record), f, indent=2)
+    
+    return png_path, b64
+
+def save_png(record, out_dir=OUT):
+    """Write a record's PNG bytes to out_dir/qr_<id>.png and return the path."""
+    os.makedirs(out_dir, exist_ok=True)
+    png_path = os.path.join(out_dir, f"qr_{record['id']}.png")
+    with open(png_path, 'wb') as f:
+        f.write(record["png"])
+    return png_path
+
+def metadata(record):
+    """The JSON-serializable metadata of a render_qr() record (everything but the PNG bytes)."""
+    return {key: value for key, value in record.items() if key != "png"}
+
+def load_qr(id, out_dir=OUT):
+    """
+    Load a QR code written by gen_qr() back into a render_qr()-style record.
+
+    Args:
+        id (str): QR code ID
+        out_dir (str): Directory holding the QR files
+
+    Returns:
+        dict: Record with 'png' bytes and whatever metadata exists, or None if there is no PNG
+    """
+    png_file = os.path.join(out_dir, f"qr_{id}.png")
+    if not os.path.exists(png_file):
+        return None
+    
+    with open(png_file, 'rb') as f:
+        png = f.read()
+    
+    record = {"id": id}
+    meta_file = os.path.join(out_dir, f"qr_{id}.meta.json")
+    if os.path.exists(meta_file):
+        with open(meta_file) as f:
+            record.update(json.load(f))
+    record["base64_length"] = base64_length(len(png))
+    record["png"] = png
+    return record
+
+def write_card(out, record):
+    """
+    Write one QR card to the HTML page, streaming the PNG into its data URI.
+
+    Args:
+        out (file): Text file object of the page being written
+        record (dict): render_qr() or load_qr() record
+    """
+    id = record["id"]
+    out.write(f'''
+        <div class="card" data-qr-id="{id}">
+            <h3>QR Code {id}</h3>
+            <div class="qr-info">
+                <div class="url">{record.get('data', 'Unknown URL')}</div>
+                <div class="meta">Size: {record.get('png_size', 'Unknown')} | Base64: {record['base64_length']} chars</div>
+            </div>
+            <img id="qr_{id}" 
+                 src="data:image/png;base64,''')
+    write_base64(out, record["png"])
+    out.write(f'''" 
+                 alt="QR Code {id}"
+                 class="qr-image"
+                 data-expected-url="{record.get('data', '')}"
+                 data-base64-length="{record['base64_length']}">
+        </div>''')
+
+def make_html(items, out_dir=OUT):
+    """
+    Create HTML page with properly embedded QR codes.
+
+    Records from render_qr() are embedded straight from memory; IDs are
+    loaded from the files gen_qr() wrote to out_dir. Either way each PNG is
+    Base64-encoded in chunks directly into the page, so no .b64.txt is read
+    and the page is never held in memory as a whole.
+
+    Args:
+        items (iterable): render_qr() records and/or QR code IDs written by gen_qr()
+        out_dir (str): Directory holding the QR files; index.html is written here
+
+    Returns:
+        str: Path of the HTML page
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    html_path = os.path.join(out_dir, "index.html")
     with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+        f.write(HTML_HEAD)
+        for item in items:
+            record = item if isinstance(item, dict) else load_qr(item, out_dir)
+            if record is None:
+                print(f"Warning: PNG file not found for {item}")
+                continue
+            write_card(f, record)
+        f.write(HTML_TAIL)
     
     return html_path
 
-def verify_b64_roundtrip(id):
-    """Verify Base64 roundtrip by decoding and comparing with original PNG."""
-    b64_file = f"{OUT}/qr_{id}.b64.txt"
-    png_file = f"{OUT}/qr_{id}.png"
+def verify_b64_roundtrip(id, out_dir=OUT):
+    """
+    Verify Base64 roundtrip by decoding and comparing with original PNG.
+
+    Args:
+        id (str): QR code ID previously written by gen_qr() to out_dir
+        out_dir (str): Directory holding the QR files
+
+    Returns:
+        tuple: (success, message)
+    """
+    b64_file = os.path.join(out_dir, f"qr_{id}.b64.txt")
+    png_file = os.path.join(out_dir, f"qr_{id}.png")
     
     if not os.path.exists(b64_file) or not os.path.exists(png_file):
         return False, "Files not found"
@@ -193,7 +344,7 @@ def verify_b64_roundtrip(id):
         decoded_data = base64.b64decode(b64)
         
         # Write decoded data to temp file
-        temp_file = f"{OUT}/qr_{id}_decoded.png"
+        temp_file = os.path.join(out_dir, f"qr_{id}_decoded.png")
         with open(temp_file, 'wb') as f:
             f.write(decoded_data)
         
@@ -208,40 +359,45 @@ def verify_b64_roundtrip(id):
 
 def main():
     """Generate QR codes for Linux cheatsheet URLs."""
+    parser = argparse.ArgumentParser(description='Generate QR codes and an HTML test page')
+    parser.add_argument('--png-mode', default='rgba', choices=('rgba',) + PNG_MODES,
+                       help='PNG encoding (default: rgba; gray1/palette1 are 1-bit)')
+    parser.add_argument('--box-size', type=int, default=10,
+                       help='Pixels per module; 1 lets the browser scale each module up (default: 10)')
+    
+    args = parser.parse_args()
+    
     print("🚀 QR Code Generator with Debugging")
     print("=" * 50)
     
-    # Test URLs
-    test_urls = {
-        "home": "https://ccri-cyberknights.github.io/page/",
-        "cheatsheet3": "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
-        "video1": "https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6",
-        "video2": "https://www.youtube.com/watch?v=2DcDQe8idtU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=7"
-    }
-    
-    generated_ids = []
+    records = []
+    rgba_bytes = 0
     
-    for id, url in test_urls.items():
+    for id, url in TEST_URLS.items():
         print(f"\n📱 Generating QR code for {id}:")
         print(f"   URL: {url}")
         
         try:
-            png_path, b64 = gen_qr(id, url)
-            generated_ids.append(id)
+            record = render_qr(id, url, box_size=args.box_size, png_mode=args.png_mode)
+            png_path = save_png(record)
+            records.append(record)
             
-            print(f"   ✅ PNG saved: {png_path}")
-            print(f"   ✅ Base64 length: {len(b64)} chars")
+            print(f"   ✅ PNG saved: {png_path} ({len(record['png'])} bytes, {args.png_mode})")
+            print(f"   ✅ Base64 length: {record['base64_length']} chars")
             
-            # Verify roundtrip
-            success, msg = verify_b64_roundtrip(id)
-            print(f"   🔍 Roundtrip test: {'✅' if success else '❌'} {msg}")
+            if args.png_mode != 'rgba':
+                rgba_bytes += len(render_qr(id, url, png_mode='rgba')["png"])
+            
+            # Verify the encoded bytes decode back to the URL
+            decoded = decode(record["png"])
+            print(f"   🔍 Decode test: {'✅' if decoded == url else '❌'} {decoded}")
             
         except Exception as e:
             print(f"   ❌ Error: {e}")
     
-    # Create HTML page
-    if generated_ids:
-        html_path = make_html(generated_ids)
+    # Create HTML page straight from the in-memory records
+    if records:
+        html_path = make_html(records)
         print(f"\n📄 HTML test page created: {html_path}")
         
         # Open in browser
@@ -249,9 +405,14 @@ def main():
         webbrowser.open(f"file://{os.path.abspath(html_path)}")
     
     print(f"\n📊 Summary:")
-    print(f"   Generated: {len(generated_ids)} QR codes")
+    print(f"   Generated: {len(records)} QR codes")
     print(f"   Output directory: {os.path.abspath(OUT)}")
-    print(f"   Files: PNG, Base64, JSON metadata, HTML page")
+    print(f"   Files: PNG, HTML page (Base64 streamed inline, metadata kept in memory)")
+    
+    if rgba_bytes:
+        png_bytes = sum(len(record["png"]) for record in records)
+        print(f"   PNG bytes: {png_bytes:,} vs {rgba_bytes:,} as 10 px/module RGBA "
+              f"(saved {1 - png_bytes / rgba_bytes:.1%})")
 
 if __name__ == "__main__":
     main()
@@ -4,172 +4,338 @@ Playwright QR Code Validation
 
 Validates QR code rendering using Playwright to diagnose white box issues.
 Checks DOM properties, computed styles, and takes screenshots for debugging.
+
+One headless Chromium is launched per run and shared by every page; each
+page gets its own browser context, and pages are validated concurrently.
+All per-image diagnostics for a page come back from a single evaluate call.
+
+QR codes are either <img class="qr-image"> data URIs (gen_and_embed.py test
+pages) or inline <svg> blocks with a <title> (the site's guides). A page on
+which the selector matches nothing fails, so a selector that no longer fits
+the markup cannot pass by checking zero codes.
+
+Usage:
+    python3 playwright_validate.py                        # out/index.html
+    python3 playwright_validate.py page1.html page2.html  # Several pages, one browser
+    python3 playwright_validate.py --site ../..           # Site pages with QR codes (index.html, guides/, blogs/)
+    python3 playwright_validate.py --headed               # Show the browser for debugging
 """
 
-from playwright.sync_api import sync_playwright, expect
-import os
+import argparse
+import asyncio
+import base64
+import binascii
+import glob
 import json
+import os
+import re
+import struct
 import sys
+import time
 
 OUT = "out"
+DEFAULT_SELECTOR = "img.qr-image, svg:has(> title)"
+SITE_PATTERNS = ("index.html", os.path.join("guides", "*.html"), os.path.join("blogs", "*.html"))
+QR_MARKUP = re.compile(r'<title>QR Code|class="[^"]*\bqr-image\b')
+DEFAULT_CONCURRENCY = 4
+DATA_URI_PREFIX = "data:image/png;base64,"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Everything diagnose() needs for every matching image, in one round trip
+COLLECT_DIAGNOSTICS_JS = """
+(imgs) => imgs.map((img, i) => {
+    const cs = window.getComputedStyle(img);
+    const rect = img.getBoundingClientRect();
+    const parent = img.parentElement;
+    const ps = parent ? window.getComputedStyle(parent) : null;
+    const isSvg = img.tagName.toLowerCase() === "svg";
+    const viewBox = isSvg && img.viewBox.baseVal;
+    const path = isSvg ? img.querySelector("path") : null;
+    return {
+        id: img.getAttribute("id") || `img_${i}`,
+        kind: isSvg ? "svg" : "img",
+        src: isSvg ? "" : img.getAttribute("src") || "",
+        path_length: path ? (path.getAttribute("d") || "").length : 0,
+        alt: img.getAttribute("alt") || "",
+        expected_url: img.getAttribute("data-expected-url") || "",
+        natural_width: isSvg ? (viewBox ? viewBox.width : 0) : img.naturalWidth,
+        natural_height: isSvg ? (viewBox ? viewBox.height : 0) : img.naturalHeight,
+        is_visible: rect.width > 0 && rect.height > 0 && cs.visibility !== "hidden",
+        computed_styles: {
+            display: cs.display,
+            visibility: cs.visibility,
+            opacity: cs.opacity,
+            width: cs.width,
+            height: cs.height,
+            background: cs.background,
+            backgroundColor: cs.backgroundColor,
+            filter: cs.filter,
+            mixBlendMode: cs.mixBlendMode,
+            zIndex: cs.zIndex
+        },
+        parent_styles: ps && {
+            display: ps.display,
+            overflow: ps.overflow,
+            backgroundColor: ps.backgroundColor,
+            width: ps.width,
+            height: ps.height
+        }
+    };
+})
+"""
+
+def png_dimensions(src):
+    """
+    Read the image size from the IHDR chunk at the start of a PNG data URI.
+
+    Only the first 24 bytes are decoded, so this is cheap for any data URI.
+
+    Returns:
+        tuple: (width, height), or None when src is not a PNG with a non-empty size
+    """
+    if not src.startswith(DATA_URI_PREFIX):
+        return None
+    try:
+        head = base64.b64decode(src[len(DATA_URI_PREFIX):len(DATA_URI_PREFIX) + 32], validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    if len(head) < 24 or head[:8] != PNG_SIGNATURE or head[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", head[16:24])
+    return (width, height) if width and height else None
+
+def diagnose(raw):
+    """
+    Turn the raw diagnostics of one image or inline SVG into a result with its issues.
+
+    Args:
+        raw (dict): One entry returned by COLLECT_DIAGNOSTICS_JS
+
+    Returns:
+        dict: Result as stored in playwright_results.json
+    """
+    src = raw["src"]
+    styles = raw["computed_styles"]
+    result = {
+        "id": raw["id"],
+        "kind": raw.get("kind", "img"),
+        "src_length": len(src),
+        "src_prefix": src[:50] + "..." if len(src) > 50 else src,
+        "natural_width": raw["natural_width"],
+        "natural_height": raw["natural_height"],
+        "is_visible": raw["is_visible"],
+        "expected_url": raw["expected_url"],
+        "computed_styles": styles,
+        "parent_styles": raw["parent_styles"],
+        "issues": []
+    }
+
+    if result["kind"] == "svg":
+        if raw["natural_width"] == 0 or raw["natural_height"] == 0:
+            result["issues"].append("SVG has no viewBox")
+    elif raw["natural_width"] == 0 or raw["natural_height"] == 0:
+        result["issues"].append("Image not loaded (natural dimensions are 0)")
+
+    if not raw["is_visible"]:
+        result["issues"].append("Image not visible")
+
+    if result["kind"] == "svg":
+        if not raw.get("path_length"):
+            result["issues"].append("QR path data is empty")
+    # 1-bit PNGs are a few hundred characters, so check the header rather than the length
+    elif not src.startswith(DATA_URI_PREFIX):
+        result["issues"].append("Invalid data URI format")
+    elif png_dimensions(src) is None:
+        result["issues"].append("Base64 data is not a valid PNG")
+
+    if styles.get("opacity") == "0":
+        result["issues"].append("Opacity is 0")
+
+    if styles.get("display") == "none":
+        result["issues"].append("Display is none")
+
+    if styles.get("visibility") == "hidden":
+        result["issues"].append("Visibility is hidden")
+
+    return result
+
+def page_error(results, selector):
+    """Page-level failure for a page's results: None, or why the page fails although no image did."""
+    if not results:
+        return f"No QR codes found (nothing matches {selector!r})"
+    return None
+
+def screenshot_name(html_path, single):
+    """Screenshot file name for a page (the historical name when only one page is validated)."""
+    if single:
+        return "playwright_screenshot.png"
+    stem = os.path.splitext(os.path.relpath(html_path))[0].replace(os.sep, "_").strip("._")
+    return f"playwright_screenshot_{stem}.png"
+
+async def validate_page(browser, html_path, selector=DEFAULT_SELECTOR, screenshot_path=None):
+    """
+    Validate the QR images on one page in a fresh browser context.
+
+    Args:
+        browser: Launched Playwright browser, shared between pages
+        html_path (str): Local HTML file
+        selector (str): CSS selector for QR images
+        screenshot_path (str): Where to save a full page screenshot (None to skip)
+
+    Returns:
+        dict: 'page', 'results' (one per image), 'seconds' and 'error' (None on success)
+    """
+    started = time.perf_counter()
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(f"file://{os.path.abspath(html_path)}")
+        await page.wait_for_load_state('networkidle')
+
+        raw = await page.eval_on_selector_all(selector, COLLECT_DIAGNOSTICS_JS)
+        results = [dict(diagnose(r), page=html_path) for r in raw]
+
+        if screenshot_path:
+            await page.screenshot(path=screenshot_path, full_page=True)
+        error = page_error(results, selector)
+    except Exception as e:
+        results, error = [], str(e)
+    finally:
+        await context.close()
+
+    return {"page": html_path, "results": results, "seconds": time.perf_counter() - started, "error": error}
 
-def validate_qr_rendering(html_path=None):
-    """Validate QR code rendering using Playwright."""
+async def validate_pages(html_paths, selector=DEFAULT_SELECTOR, concurrency=DEFAULT_CONCURRENCY,
+                         headless=True, screenshot_dir=OUT):
+    """
+    Validate many pages with one browser, several contexts at a time.
+
+    Args:
+        html_paths (list): Local HTML files
+        selector (str): CSS selector for QR images
+        concurrency (int): Pages validated at once
+        headless (bool): Run Chromium without a window
+        screenshot_dir (str): Directory for screenshots (None to skip them)
+
+    Returns:
+        list: validate_page() reports, in the order of html_paths
+    """
+    # Imported here so diagnose() and the reporting helpers work without Playwright
+    from playwright.async_api import async_playwright
+
+    if screenshot_dir:
+        os.makedirs(screenshot_dir, exist_ok=True)
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            async def bounded(html_path):
+                shot = screenshot_dir and os.path.join(screenshot_dir, screenshot_name(html_path, len(html_paths) == 1))
+                async with limit:
+                    return await validate_page(browser, html_path, selector, shot)
+
+            return await asyncio.gather(*(bounded(path) for path in html_paths))
+        finally:
+            await browser.close()
+
+def find_pages(root):
+    """
+    The site pages that embed QR codes: index.html, guides/*.html and blogs/*.html.
+
+    Build output, tests and docs are never included, and pages without QR
+    markup in their source are skipped rather than reported as empty.
+    """
+    pages = []
+    for pattern in SITE_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            with open(path, encoding="utf-8") as f:
+                if QR_MARKUP.search(f.read()):
+                    pages.append(path)
+    return pages
+
+def print_report(report):
+    """Print the diagnosis of one page."""
+    print(f"\n📄 {report['page']} ({report['seconds']:.2f}s)")
+    if report["error"]:
+        print(f"   ❌ Error during validation: {report['error']}")
+        return
+    print(f"   📱 Found {len(report['results'])} QR codes")
+    for result in report["results"]:
+        styles = result["computed_styles"]
+        print(f"   🔍 {result['id']}: {result['natural_width']}x{result['natural_height']}, "
+              f"visible={result['is_visible']}, computed {styles.get('width')} x {styles.get('height')}, "
+              f"background {styles.get('backgroundColor')}")
+        for issue in result["issues"]:
+            print(f"      ❌ {issue}")
+
+def save_results(reports, out_dir=OUT):
+    """Write every image result of the reports to out_dir/playwright_results.json and return the path."""
+    os.makedirs(out_dir, exist_ok=True)
+    results_path = os.path.join(out_dir, "playwright_results.json")
+    with open(results_path, 'w') as f:
+        json.dump([result for report in reports for result in report["results"]], f, indent=2)
+    return results_path
+
+def validate_qr_rendering(html_path=None, headless=True, concurrency=DEFAULT_CONCURRENCY,
+                          selector=DEFAULT_SELECTOR, screenshots=True):
+    """
+    Validate QR code rendering using Playwright.
+
+    Args:
+        html_path (str or list): HTML file, or several (default: out/index.html)
+        headless (bool): Run Chromium without a window
+        concurrency (int): Pages validated at once
+        selector (str): CSS selector for QR images
+        screenshots (bool): Save a full page screenshot per page into out/
+
+    Returns:
+        bool: True if every page loaded and every QR image rendered without issues
+    """
     if html_path is None:
         html_path = os.path.join(OUT, "index.html")
-    
-    if not os.path.exists(html_path):
-        print(f"❌ HTML file not found: {html_path}")
+    html_paths = [html_path] if isinstance(html_path, str) else list(html_path)
+
+    missing = [path for path in html_paths if not os.path.exists(path)]
+    for path in missing:
+        print(f"❌ HTML file not found: {path}")
+    if not html_paths:
+        print("❌ No HTML files to validate")
+    if missing or not html_paths:
         return False
-    
+
     print("🔍 Playwright QR Code Validation")
     print("=" * 50)
-    
-    # Convert to file:// URL
-    html_url = f"file://{os.path.abspath(html_path)}"
-    print(f"📄 Loading: {html_url}")
-    
-    results = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Show browser for debugging
-        page = browser.new_page()
-        
-        try:
-            page.goto(html_url)
-            page.wait_for_load_state('networkidle')
-            
-            # Find all QR code images
-            imgs = page.query_selector_all("img.qr-image")
-            print(f"📱 Found {len(imgs)} QR code images")
-            
-            for i, img in enumerate(imgs):
-                img_id = img.get_attribute("id") or f"img_{i}"
-                print(f"\n🔍 Analyzing {img_id}:")
-                
-                # Get basic properties
-                src = img.get_attribute("src") or ""
-                alt = img.get_attribute("alt") or ""
-                expected_url = img.get_attribute("data-expected-url") or ""
-                
-                # Get natural dimensions (actual image size)
-                natural_dims = page.evaluate("(img) => [img.naturalWidth, img.naturalHeight]", img)
-                natural_width, natural_height = natural_dims
-                
-                # Check if image is visible
-                is_visible = img.is_visible()
-                
-                # Get computed styles
-                computed_styles = page.evaluate("""
-                    (img) => {
-                        const cs = window.getComputedStyle(img);
-                        return {
-                            display: cs.display,
-                            visibility: cs.visibility,
-                            opacity: cs.opacity,
-                            width: cs.width,
-                            height: cs.height,
-                            background: cs.background,
-                            backgroundColor: cs.backgroundColor,
-                            filter: cs.filter,
-                            mixBlendMode: cs.mixBlendMode,
-                            zIndex: cs.zIndex
-                        };
-                    }
-                """, img)
-                
-                # Check parent element styles
-                parent_styles = page.evaluate("""
-                    (img) => {
-                        const parent = img.parentElement;
-                        if (!parent) return null;
-                        const cs = window.getComputedStyle(parent);
-                        return {
-                            display: cs.display,
-                            overflow: cs.overflow,
-                            backgroundColor: cs.backgroundColor,
-                            width: cs.width,
-                            height: cs.height
-                        };
-                    }
-                """, img)
-                
-                result = {
-                    "id": img_id,
-                    "src_length": len(src),
-                    "src_prefix": src[:50] + "..." if len(src) > 50 else src,
-                    "natural_width": natural_width,
-                    "natural_height": natural_height,
-                    "is_visible": is_visible,
-                    "expected_url": expected_url,
-                    "computed_styles": computed_styles,
-                    "parent_styles": parent_styles,
-                    "issues": []
-                }
-                
-                # Diagnose issues
-                if natural_width == 0 or natural_height == 0:
-                    result["issues"].append("Image not loaded (natural dimensions are 0)")
-                
-                if not is_visible:
-                    result["issues"].append("Image not visible")
-                
-                if len(src) < 1000:
-                    result["issues"].append("Base64 data seems too short")
-                
-                if not src.startswith("data:image/png;base64,"):
-                    result["issues"].append("Invalid data URI format")
-                
-                if computed_styles.get("opacity") == "0":
-                    result["issues"].append("Opacity is 0")
-                
-                if computed_styles.get("display") == "none":
-                    result["issues"].append("Display is none")
-                
-                if computed_styles.get("visibility") == "hidden":
-                    result["issues"].append("Visibility is hidden")
-                
-                results.append(result)
-                
-                # Print diagnosis
-                print(f"   📊 Natural size: {natural_width}x{natural_height}")
-                print(f"   👁️  Visible: {is_visible}")
-                print(f"   📏 Computed size: {computed_styles.get('width')} x {computed_styles.get('height')}")
-                print(f"   🎨 Background: {computed_styles.get('backgroundColor')}")
-                print(f"   🔍 Issues: {len(result['issues'])}")
-                
-                for issue in result["issues"]:
-                    print(f"      ❌ {issue}")
-            
-            # Take full page screenshot
-            screenshot_path = os.path.join(OUT, "playwright_screenshot.png")
-            page.screenshot(path=screenshot_path, full_page=True)
-            print(f"\n📸 Screenshot saved: {screenshot_path}")
-            
-            # Save detailed results
-            results_path = os.path.join(OUT, "playwright_results.json")
-            with open(results_path, 'w') as f:
-                json.dump(results, f, indent=2)
-            print(f"📄 Results saved: {results_path}")
-            
-        except Exception as e:
-            print(f"❌ Error during validation: {e}")
-            return False
-        
-        finally:
-            browser.close()
-    
+    print(f"📄 Loading {len(html_paths)} page(s), {concurrency} at a time "
+          f"({'headless' if headless else 'headed'})")
+
+    started = time.perf_counter()
+    reports = asyncio.run(validate_pages(html_paths, selector, concurrency, headless,
+                                         OUT if screenshots else None))
+    elapsed = time.perf_counter() - started
+
+    for report in reports:
+        print_report(report)
+
+    results = [result for report in reports for result in report["results"]]
+    results_path = save_results(reports)
+    if screenshots:
+        print(f"\n📸 Screenshots saved in: {OUT}")
+    print(f"📄 Results saved: {results_path}")
+
     # Summary
+    failed_pages = sum(1 for r in reports if r["error"])
     total_issues = sum(len(r["issues"]) for r in results)
     successful_qrs = sum(1 for r in results if len(r["issues"]) == 0)
-    
+
     print(f"\n📊 Validation Summary")
     print("=" * 50)
+    print(f"Pages: {len(reports)} ({failed_pages} failed) in {elapsed:.2f}s")
     print(f"Total QR codes: {len(results)}")
     print(f"Successful: {successful_qrs}")
     print(f"Total issues: {total_issues}")
-    
-    if total_issues == 0:
+
+    if total_issues == 0 and failed_pages == 0:
         print("🎉 All QR codes rendered successfully!")
         return True
     else:
@@ -178,12 +344,23 @@ def validate_qr_rendering(html_path=None):
 
 def main():
     """Main function."""
-    if len(sys.argv) > 1:
-        html_path = sys.argv[1]
-    else:
-        html_path = None
-    
-    success = validate_qr_rendering(html_path)
+    parser = argparse.ArgumentParser(description='Validate QR code rendering with Playwright')
+    parser.add_argument('html_paths', nargs='*', help='HTML files to validate (default: out/index.html)')
+    parser.add_argument('--site', metavar='DIR',
+                       help='Validate the pages with QR codes in DIR/index.html, DIR/guides and DIR/blogs')
+    parser.add_argument('--selector', default=DEFAULT_SELECTOR,
+                       help=f'CSS selector for QR images (default: {DEFAULT_SELECTOR})')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Pages validated at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--headed', action='store_true', help='Show the browser for debugging')
+    parser.add_argument('--no-screenshots', action='store_true', help='Skip full page screenshots')
+
+    args = parser.parse_args()
+
+    html_paths = args.html_paths + (find_pages(args.site) if args.site else [])
+    success = validate_qr_rendering(html_paths if args.html_paths or args.site else None, headless=not args.headed,
+                                    concurrency=args.concurrency, selector=args.selector,
+                                    screenshots=not args.no_screenshots)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+QR Generation Micro-Benchmarks
+
+Measures the Python QR path stage by stage for realistic URL lengths at all
+four error correction levels:
+
+- generate_qr_code: SVG generation in scripts/generate_qr_codes.py (no cache)
+- generate_qr_code[optimize]: the same with the minimal, decode-verified path
+- gen_qr: PNG + Base64 + metadata files from gen_and_embed.py
+- png_encode: rendering an encoded QR code to PNG bytes with Pillow
+- png_encode[gray1]: the same image as a minimal 1-bit PNG (scripts/qr_png.py)
+- base64_encode: Base64-encoding those PNG bytes
+
+For each case it reports median and best per-code latency, throughput and
+peak Python memory (tracemalloc, measured in a separate untimed call).
+Results are compared against qr_benchmark_baseline.json and the run fails
+when any case is slower (median) or larger than the baseline by more than
+--threshold.
+
+Baselines are machine-specific: refresh them with --update-baseline on the
+machine that runs the comparison.
+
+Usage:
+    python3 qr_benchmark.py                         # Compare against the baseline
+    python3 qr_benchmark.py --threshold 0.25        # Fail on more than 25% regression
+    python3 qr_benchmark.py --update-baseline       # Record a new baseline
+    python3 qr_benchmark.py --benchmark png_encode --ecl H --repeat 50
+"""
+
+import argparse
+import base64
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib.metadata import version
+
+import qrcode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from gen_and_embed import gen_qr
+from generate_qr_codes import generate_qr_code
+from qr_png import encode_png
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'qr_benchmark_baseline.json')
+DEFAULT_REPEAT = 2
+DEFAULT_ROUNDS = 5
+DEFAULT_THRESHOLD = 0.5
+
+# Realistic payloads, from a youtu.be link up to a long tracking URL
+URLS = {
+    'short': "https://youtu.be/twREXouRxns",
+    'guide': "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+    'playlist': "https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6",
+    'long': "https://ccri-cyberknights.github.io/page/#/blogs/ctf-writeup.html?" + "&".join(
+        f"utm_{name}=cyberknights-{name}" for name in ('source', 'medium', 'campaign')
+    ),
+}
+ECLS = ('L', 'M', 'Q', 'H')
+
+# Differences below these are timer or allocator noise, never regressions
+MIN_DELTA = {'median_us': 20.0, 'peak_kib': 4.0}
+
+def _new_qr(url, ecl):
+    qr = qrcode.QRCode(error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{ecl}'))
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr
+
+def _png_bytes(qr):
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def _setup_generate(url, ecl, out_dir):
+    return lambda: generate_qr_code(url, ecl=ecl)
+
+def _setup_generate_optimized(url, ecl, out_dir):
+    return lambda: generate_qr_code(url, ecl=ecl, optimize=True)
+
+def _setup_gen_qr(url, ecl, out_dir):
+    return lambda: gen_qr("bench", url, error=ecl, out_dir=out_dir)
+
+def _setup_png_encode(url, ecl, out_dir):
+    qr = _new_qr(url, ecl)
+    return lambda: _png_bytes(qr)
+
+def _setup_png_encode_gray1(url, ecl, out_dir):
+    qr = _new_qr(url, ecl)
+    return lambda: encode_png(qr.modules, qr.box_size, qr.border)
+
+def _setup_base64_encode(url, ecl, out_dir):
+    png = _png_bytes(_new_qr(url, ecl))
+    return lambda: base64.b64encode(png).decode('ascii')
+
+# name -> setup(url, ecl, out_dir) returning the zero-argument call to time
+BENCHMARKS = {
+    'generate_qr_code': _setup_generate,
+    'generate_qr_code[optimize]': _setup_generate_optimized,
+    'gen_qr': _setup_gen_qr,
+    'png_encode': _setup_png_encode,
+    'png_encode[gray1]': _setup_png_encode_gray1,
+    'base64_encode': _setup_base64_encode,
+}
+
+def time_calls(func, repeat):
+    """
+    Time repeated calls with garbage collection paused, like timeit.
+
+    Args:
+        func (callable): Zero-argument call to time
+        repeat (int): Number of calls
+
+    Returns:
+        list: Nanoseconds per call
+    """
+    samples = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            func()
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples
+
+def peak_memory(func):
+    """Peak Python memory (bytes) allocated during one call, via tracemalloc."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def summarize(samples, peak):
+    """
+    Reduce timing samples and a peak to the reported metrics.
+
+    Args:
+        samples (list): Nanoseconds per call
+        peak (int): Peak bytes from peak_memory()
+
+    Returns:
+        dict: 'median_us', 'min_us', 'throughput' (codes/s) and 'peak_kib'
+    """
+    median_us = statistics.median(samples) / 1000
+    return {
+        'median_us': round(median_us, 1),
+        'min_us': round(min(samples) / 1000, 1),
+        'throughput': round(1e6 / median_us, 1) if median_us else None,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+def case_key(name, url_class, ecl):
+    """Baseline key for one benchmark case."""
+    return f"{name}/{url_class}/{ecl}"
+
+def run_benchmarks(names=None, url_classes=None, ecls=ECLS, repeat=DEFAULT_REPEAT, rounds=DEFAULT_ROUNDS):
+    """
+    Run every selected benchmark × URL × ECL case.
+
+    Cases are timed round-robin: each round times every case repeat times,
+    so slow drift in machine load is spread over all cases instead of
+    skewing whichever ran during it.
+
+    Args:
+        names (list): Benchmark names (default: all of BENCHMARKS)
+        url_classes (list): Keys of URLS (default: all)
+        ecls (list): Error correction levels
+        repeat (int): Timed calls per case per round
+        rounds (int): Passes over all cases
+
+    Returns:
+        dict: case_key() -> summarize() result, in run order
+    """
+    with tempfile.TemporaryDirectory() as out_dir:
+        cases = {}
+        for name in names or BENCHMARKS:
+            for url_class in url_classes or URLS:
+                for ecl in ecls:
+                    func = BENCHMARKS[name](URLS[url_class], ecl, out_dir)
+                    func()  # Warm-up
+                    cases[case_key(name, url_class, ecl)] = func
+
+        samples = {key: [] for key in cases}
+        for _ in range(rounds):
+            for key, func in cases.items():
+                samples[key].extend(time_calls(func, repeat))
+
+        return {key: summarize(samples[key], peak_memory(func)) for key, func in cases.items()}
+
+def environment():
+    """Describe the interpreter and libraries a baseline was recorded with."""
+    return {
+        'python': platform.python_version(),
+        'qrcode': version('qrcode'),
+        'pillow': version('Pillow'),
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+def load_baseline(path=BASELINE_PATH):
+    """Load a baseline file; returns None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baseline(results, path=BASELINE_PATH, repeat=DEFAULT_REPEAT, rounds=DEFAULT_ROUNDS):
+    """Write results as the new baseline (keys sorted for stable diffs)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'repeat': repeat, 'rounds': rounds, 'results': results},
+                  f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Find cases that regressed past the threshold.
+
+    A case regresses when its median latency or peak memory exceeds the
+    baseline by more than threshold (a fraction, 0.25 = 25%) and by more
+    than the MIN_DELTA noise floor. Cases missing from the baseline are not
+    regressions.
+
+    Args:
+        results (dict): run_benchmarks() output
+        baseline (dict): Baseline 'results' mapping
+        threshold (float): Allowed relative increase
+
+    Returns:
+        list: One dict per regression with 'case', 'metric', 'baseline', 'current' and 'ratio'
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, floor in MIN_DELTA.items():
+            before, after = previous[metric], current[metric]
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append({
+                    'case': key,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': round(after / before, 2) if before else None,
+                })
+    return regressions
+
+def print_table(results, baseline=None):
+    """Print results, with the change against the baseline when given."""
+    print(f"{'case':<36} {'median µs':>10} {'best µs':>10} {'codes/s':>9} {'peak KiB':>9} {'vs base':>8}")
+    for key, result in results.items():
+        change = ''
+        if baseline and key in baseline and baseline[key]['median_us']:
+            change = f"{result['median_us'] / baseline[key]['median_us'] - 1:+.0%}"
+        print(f"{key:<36} {result['median_us']:>10.1f} {result['min_us']:>10.1f} "
+              f"{result['throughput'] or 0:>9.0f} {result['peak_kib']:>9.1f} {change:>8}")
+
+def main():
+    """Run the benchmarks and compare against (or update) the baseline."""
+    parser = argparse.ArgumentParser(description='QR generation micro-benchmarks with regression thresholds')
+    parser.add_argument('--benchmark', '-b', action='append', choices=list(BENCHMARKS),
+                       help='Benchmark to run (repeatable, default: all)')
+    parser.add_argument('--url', action='append', choices=list(URLS),
+                       help='URL length class to run (repeatable, default: all)')
+    parser.add_argument('--ecl', action='append', choices=ECLS,
+                       help='Error correction level to run (repeatable, default: all)')
+    parser.add_argument('--repeat', '-r', type=int, default=DEFAULT_REPEAT,
+                       help=f'Timed calls per case per round (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS,
+                       help=f'Round-robin passes over all cases (default: {DEFAULT_ROUNDS})')
+    parser.add_argument('--threshold', '-t', type=float, default=DEFAULT_THRESHOLD,
+                       help=f'Allowed regression as a fraction (default: {DEFAULT_THRESHOLD} = '
+                            f'{DEFAULT_THRESHOLD:.0%})')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                       help='Baseline JSON file (default: qr_benchmark_baseline.json)')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help='Record the results as the new baseline instead of comparing')
+    parser.add_argument('--json', action='store_true',
+                       help='Print the results as JSON')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1 or args.rounds < 1:
+        parser.error('--repeat and --rounds must be at least 1')
+    if args.threshold < 0:
+        parser.error('--threshold must not be negative')
+
+    results = run_benchmarks(args.benchmark, args.url, args.ecl or ECLS, args.repeat, args.rounds)
+
+    if args.update_baseline:
+        if args.benchmark or args.url or args.ecl:
+            baseline = load_baseline(args.baseline) or {}
+            results = {**baseline.get('results', {}), **results}
+        save_baseline(results, args.baseline, args.repeat, args.rounds)
+        print_table(results)
+        print(f"\n💾 Baseline written to {args.baseline} ({len(results)} cases)")
+        return
+
+    baseline = load_baseline(args.baseline)
+    previous = baseline['results'] if baseline else None
+
+    # With --json, stdout carries only the results; status goes to stderr
+    report = sys.stderr if args.json else sys.stdout
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, previous)
+
+    if previous is None:
+        print(f"\n⚠️  No baseline at {args.baseline}; run with --update-baseline to record one", file=report)
+        return
+
+    if baseline.get('environment') != environment():
+        print(f"\n⚠️  Baseline was recorded with {baseline.get('environment')}; "
+              f"timings may not be comparable", file=report)
+
+    regressions = compare(results, previous, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=report)
+        for r in regressions:
+            print(f"   {r['case']} {r['metric']}: {r['baseline']} → {r['current']} ({r['ratio']}x)", file=report)
+        sys.exit(1)
+
+    print(f"\n✅ No regressions beyond {args.threshold:.0%} across {len(results)} cases", file=report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+In-Memory QR Round-Trip Harness
+
+Generates QR codes straight into NumPy arrays and decodes them again
+without writing images to disk or spawning a process per image. Decoding
+runs in this process by default; pass a DecoderProcess (scripts/qr_decode.py)
+to decode every image in one long-lived worker instead.
+
+Usage:
+    python3 qr_roundtrip.py                    # Run the default round-trip suite in-process
+    python3 qr_roundtrip.py --process          # Same, through one decoder worker process
+    python3 qr_roundtrip.py --backend zbar     # Use the zbar backend (requires pyzbar)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import qrcode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import DecoderProcess, decode
+from qr_png import encode_png, png_data_uri
+
+DEFAULT_URLS = [
+    "https://ccri-cyberknights.github.io/page/",
+    "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+    "https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6",
+    "https://www.youtube.com/watch?v=2DcDQe8idtU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=7",
+]
+
+def render_array(text, ecl='L', box_size=10, border=4):
+    """
+    Encode text as a QR code rendered directly to a grayscale array.
+
+    Produces the same pixels as qrcode's PIL image (black on white) without
+    going through PIL or PNG.
+
+    Args:
+        text (str): Data to encode
+        ecl (str): Error correction level (L, M, Q, H)
+        box_size (int): Pixels per module
+        border (int): Quiet zone in modules
+
+    Returns:
+        np.ndarray: 2-D uint8 array (0 = dark module, 255 = light)
+    """
+    qr = qrcode.QRCode(
+        error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{ecl}'),
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(text)
+    qr.make(fit=True)
+    modules = np.pad(np.array(qr.modules, dtype=bool), border)
+    pixels = np.where(modules, 0, 255).astype(np.uint8)
+    return pixels.repeat(box_size, axis=0).repeat(box_size, axis=1)
+
+def image_data_uri(img):
+    """
+    Inline a qrcode PIL image as a data URI.
+
+    The PNG is written from the image's module matrix as a minimal 1-bit PNG
+    (scripts/qr_png.py), so it has the same pixels as img at a fraction of
+    the size of img.save().
+
+    Args:
+        img: Image returned by qrcode.QRCode.make_image()
+
+    Returns:
+        str: 'data:image/png;base64,...'
+    """
+    return png_data_uri(encode_png(img.modules, img.box_size, img.border))
+
+def roundtrip(cases, decoder=None, backend='auto'):
+    """
+    Generate and decode a batch of QR codes entirely in memory.
+
+    Args:
+        cases (list): Dicts with 'text' and optional 'ecl', 'box_size', 'border'
+        decoder (DecoderProcess): Decode in this worker (default: in-process)
+        backend (str): decode() backend for in-process decoding
+
+    Returns:
+        list: One dict per case with the case fields, 'shape', 'decoded' and 'success'
+    """
+    cases = [{'ecl': 'L', 'box_size': 10, 'border': 4, **case} for case in cases]
+    images = [render_array(c['text'], c['ecl'], c['box_size'], c['border']) for c in cases]
+
+    if decoder is not None:
+        decoded = decoder.decode_many(images)
+    else:
+        decoded = [decode(image, backend=backend) for image in images]
+
+    return [
+        {**case, 'shape': image.shape, 'decoded': text, 'success': text == case['text']}
+        for case, image, text in zip(cases, images, decoded)
+    ]
+
+def default_cases(urls=DEFAULT_URLS):
+    """Every URL at every error correction level, plus small and borderless renders."""
+    cases = []
+    for url in urls:
+        for ecl in ('L', 'M', 'Q', 'H'):
+            cases.append({'text': url, 'ecl': ecl})
+        cases.append({'text': url, 'box_size': 3, 'border': 1})
+        cases.append({'text': url, 'box_size': 1, 'border': 0})
+    return cases
+
+def main():
+    """Run the default round-trip suite and report timing."""
+    parser = argparse.ArgumentParser(description='In-memory QR generate/decode round trip')
+    parser.add_argument('--process', action='store_true',
+                       help='Decode in one long-lived worker process instead of in-process')
+    parser.add_argument('--backend', default='auto', choices=['auto', 'local', 'zbar'],
+                       help='Decoder backend (default: auto)')
+
+    args = parser.parse_args()
+
+    cases = default_cases()
+    start = time.perf_counter()
+    if args.process:
+        with DecoderProcess(args.backend) as decoder:
+            results = roundtrip(cases, decoder=decoder)
+    else:
+        results = roundtrip(cases, backend=args.backend)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        status = '✅' if result['success'] else '❌'
+        print(f"{status} {result['ecl']} box={result['box_size']} border={result['border']} "
+              f"{result['shape'][1]}x{result['shape'][0]}  {result['text'][:60]}")
+
+    passed = sum(1 for r in results if r['success'])
+    print(f"\n⏱️  {passed}/{len(results)} round trips passed in {elapsed * 1000:.0f} ms")
+    sys.exit(0 if passed == len(results) else 1)
+
+if __name__ == "__main__":
+    main()
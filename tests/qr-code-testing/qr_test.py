@@ -7,12 +7,15 @@ Usage: python3 qr_test.py <text> [output_file]
 """
 
 import qrcode
-import base64
-import io
+import os
 import sys
-import requests
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import decode
+from qr_roundtrip import image_data_uri
+
 def generate_qr(text, output_file=None, size=10):
     """Generate QR code and optionally save to file."""
     qr = qrcode.QRCode(
@@ -32,32 +35,17 @@ def generate_qr(text, output_file=None, size=10):
     
     return img
 
-def decode_qr(filename):
-    """Decode QR code using online API."""
+def decode_qr(image):
+    """Decode QR code offline from a file path or in-memory image (local decoder, or zbar when installed)."""
     try:
-        with open(filename, 'rb') as f:
-            files = {'file': f}
-            response = requests.post('https://api.qrserver.com/v1/read-qr-code/', 
-                                  files=files, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0 and 'symbol' in data[0]:
-                return data[0]['symbol'][0]['data']
-        return None
-    except Exception as e:
+        return decode(image)
+    except OSError as e:
         print(f"Error decoding QR code: {e}")
         return None
 
 def get_base64_qr(text, size=10):
     """Get QR code as base64 string."""
-    img = generate_qr(text, size=size)
-    
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
+    return image_data_uri(generate_qr(text, size=size))
 
 def main():
     """Main function."""
@@ -100,14 +88,13 @@ def main():
         width, height = img.size
         print(f"QR code size: {width}x{height}")
         
-        if output_file:
-            # Test decoding
-            decoded = decode_qr(output_file)
-            if decoded:
-                print(f"Decoded content: {decoded}")
-                print(f"✅ Success: {decoded == text}")
-            else:
-                print("❌ Failed to decode QR code")
+        # Test decoding straight from memory (no need to re-read the saved file)
+        decoded = decode_qr(img.get_image())
+        if decoded:
+            print(f"Decoded content: {decoded}")
+            print(f"✅ Success: {decoded == text}")
+        else:
+            print("❌ Failed to decode QR code")
 
 if __name__ == "__main__":
     main()
@@ -2,144 +2,245 @@
 """
 Comprehensive QR Code Troubleshooting Script
 
-Runs the complete debugging pipeline:
-1. Generate QR codes with proper Base64
-2. Verify Base64 roundtrip
-3. Create HTML test page
-4. Run Playwright validation
-5. Generate debugging report
+Runs the complete debugging pipeline in-process, as timed stages:
+1. generate   - QR codes and the HTML test page (gen_and_embed)
+2. verify     - Generated files and a decode of every PNG       } run
+3. playwright - Rendering validation in headless Chromium       } concurrently
+4. package    - Debugging report zip
+
+Each stage reports the files it produced; the package stage streams exactly
+those files into the zip instead of walking the output directory again.
+
+Usage:
+    python3 qr_troubleshoot.py
+    python3 qr_troubleshoot.py --png-mode gray1 --skip-playwright
+    python3 qr_troubleshoot.py --package-dir /tmp     # Write the debug zip elsewhere
 """
 
+import argparse
+import asyncio
+import json
 import os
+import shutil
 import sys
-import json
-import subprocess
+import time
 import zipfile
 from datetime import datetime
 
-def run_command(cmd, description):
-    """Run a command and return success status."""
-    print(f"\n🔧 {description}")
-    print(f"   Command: {cmd}")
-    
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from gen_and_embed import OUT, TEST_URLS, make_html, render_qr, save_png
+from qr_decode import decode
+from qr_png import PNG_MODES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ZIP_CHUNK = 64 * 1024
+
+# Scripts shipped with every debug package
+DEBUG_SCRIPTS = ["gen_and_embed.py", "playwright_validate.py", "qr_test.py"]
+
+async def run_stage(name, stage, *args):
+    """
+    Run one stage, timing it and turning exceptions into a failed result.
+
+    Args:
+        name (str): Stage name
+        stage: Coroutine function returning a dict with 'detail' and optionally
+               'ok', 'artifacts' (file paths) and stage-specific data
+        *args: Arguments for stage
+
+    Returns:
+        dict: The stage's dict plus 'name', 'ok', 'artifacts' and 'seconds'
+    """
+    print(f"\n🔧 {name}: started")
+    started = time.perf_counter()
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"   ✅ Success")
-            if result.stdout.strip():
-                print(f"   Output: {result.stdout.strip()}")
-            return True
-        else:
-            print(f"   ❌ Failed")
-            if result.stderr.strip():
-                print(f"   Error: {result.stderr.strip()}")
-            return False
+        outcome = await stage(*args)
     except Exception as e:
-        print(f"   ❌ Exception: {e}")
-        return False
+        outcome = {"ok": False, "detail": f"{type(e).__name__}: {e}"}
+    outcome.setdefault("ok", True)
+    outcome.setdefault("artifacts", [])
+    outcome.update(name=name, seconds=time.perf_counter() - started)
+
+    print(f"   {'✅' if outcome['ok'] else '❌'} {name}: {outcome['detail']} ({outcome['seconds']:.2f}s)")
+    return outcome
+
+async def generate_stage(out_dir, png_mode):
+    """Render every test URL once, save the PNGs and build the HTML page."""
+    def generate():
+        records = [render_qr(id, url, png_mode=png_mode) for id, url in TEST_URLS.items()]
+        files = [save_png(record, out_dir) for record in records]
+        return records, files + [make_html(records, out_dir)]
+
+    records, files = await asyncio.to_thread(generate)
+    return {"detail": f"{len(records)} QR codes, {len(files)} files", "records": records,
+            "html_path": files[-1], "artifacts": files}
 
-def create_debug_report():
+async def verify_stage(records, files):
+    """Check the generated files are non-empty and every PNG decodes to its URL."""
+    def verify():
+        problems = []
+        for path in files:
+            size = os.path.getsize(path)
+            print(f"   📄 {os.path.basename(path)}: {size} bytes")
+            if size == 0:
+                problems.append(f"{os.path.basename(path)} is empty")
+        for record in records:
+            if decode(record["png"]) != record["data"]:
+                problems.append(f"qr_{record['id']} does not decode to its URL")
+        return problems
+
+    problems = await asyncio.to_thread(verify)
+    return {"ok": not problems, "detail": "; ".join(problems) or f"{len(files)} files, {len(records)} decoded"}
+
+async def playwright_stage(html_path, out_dir):
+    """Validate the rendered page in headless Chromium."""
+    try:
+        import playwright.async_api  # noqa: F401 (validate_pages() imports it when it launches Chromium)
+        from playwright_validate import save_results, screenshot_name, validate_pages
+    except ImportError as e:
+        return {"ok": False, "detail": f"Playwright not available ({e})"}
+
+    reports = await validate_pages([html_path], screenshot_dir=out_dir)
+    results = [result for report in reports for result in report["results"]]
+    errors = [report["error"] for report in reports if report["error"]]
+    issues = sum(len(result["issues"]) for result in results)
+
+    artifacts = [save_results(reports, out_dir)]
+    screenshot = os.path.join(out_dir, screenshot_name(html_path, True))
+    if os.path.exists(screenshot):
+        artifacts.append(screenshot)
+
+    return {"ok": not errors and issues == 0, "artifacts": artifacts,
+            "detail": "; ".join(errors) or f"{len(results)} images, {issues} issues"}
+
+async def package_stage(stages, out_dir, package_path, summary):
+    """Stream every stage's artifacts, the debug scripts and the summary into one zip."""
+    out_parent = os.path.dirname(os.path.abspath(out_dir))
+    entries = [(path, os.path.relpath(os.path.abspath(path), out_parent))
+               for stage in stages for path in stage["artifacts"]]
+    entries += [(os.path.join(HERE, name), name) for name in DEBUG_SCRIPTS]
+
+    def package():
+        with zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for path, arcname in entries:
+                with open(path, 'rb') as src, zf.open(arcname, 'w') as dst:
+                    shutil.copyfileobj(src, dst, ZIP_CHUNK)
+            zf.writestr("debug_summary.json", json.dumps(summary, indent=2))
+        return os.path.getsize(package_path)
+
+    size = await asyncio.to_thread(package)
+    return {"detail": f"{package_path} ({len(entries) + 1} files, {size:,} bytes)", "artifacts": []}
+
+async def run_pipeline(out_dir=OUT, package_dir=None, playwright=True, png_mode="rgba"):
+    """
+    Run the troubleshooting stages.
+
+    Generation runs first; verification and Playwright validation only depend
+    on it, so they run concurrently; packaging runs last.
+
+    Args:
+        out_dir (str): Directory for generated files
+        package_dir (str): Directory for the debug zip (default: out_dir)
+        playwright (bool): Run the Playwright stage
+        png_mode (str): PNG encoding passed to gen_and_embed.render_qr()
+
+    Returns:
+        dict: 'ok', 'stages' (name, ok, seconds, detail) and 'debug_package' (None if generation failed)
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    started = time.perf_counter()
+
+    generated = await run_stage("generate", generate_stage, out_dir, png_mode)
+    stages = [generated]
+    if generated["ok"]:
+        checks = [run_stage("verify", verify_stage, generated["records"], generated["artifacts"])]
+        if playwright:
+            checks.append(run_stage("playwright", playwright_stage, generated["html_path"], out_dir))
+        stages += await asyncio.gather(*checks)
+
+    timings = [{key: stage[key] for key in ("name", "ok", "seconds", "detail")} for stage in stages]
+    package_path = None
+    if generated["ok"]:
+        os.makedirs(package_dir or out_dir, exist_ok=True)
+        package_path = os.path.join(package_dir or out_dir, f"qr_debug_{timestamp}.zip")
+        summary = {
+            "timestamp": timestamp,
+            "png_mode": png_mode,
+            "stages": timings,
+            "files_generated": len(generated["artifacts"]),
+            "debug_package": os.path.basename(package_path)
+        }
+        packaged = await run_stage("package", package_stage, stages, out_dir, package_path, summary)
+        stages.append(packaged)
+        timings.append({key: packaged[key] for key in ("name", "ok", "seconds", "detail")})
+
+    return {"ok": all(stage["ok"] for stage in stages), "stages": timings,
+            "seconds": time.perf_counter() - started, "debug_package": package_path}
+
+def print_timings(report):
+    """Print the wall-clock time of every stage."""
+    print("\n⏱️  Stage Timings")
+    print("=" * 60)
+    for stage in report["stages"]:
+        print(f"   {'✅' if stage['ok'] else '❌'} {stage['name']:<12} {stage['seconds']:>7.2f}s")
+    print(f"   {'total':<15} {report['seconds']:>7.2f}s")
+
+def create_debug_report(out_dir=OUT, playwright=True, png_mode="rgba", package_dir=None):
     """Create comprehensive debugging report."""
     print("🚀 QR Code Troubleshooting Pipeline")
     print("=" * 60)
-    
-    # Step 1: Generate QR codes
-    print("\n📱 Step 1: Generate QR Codes")
-    success_gen = run_command("python3 tests/gen_and_embed.py", "Generate QR codes and HTML")
-    
-    if not success_gen:
+
+    report = asyncio.run(run_pipeline(out_dir, package_dir, playwright=playwright, png_mode=png_mode))
+    print_timings(report)
+
+    if report["debug_package"] is None:
         print("❌ QR generation failed - stopping pipeline")
         return False
-    
-    # Step 2: Check generated files
-    print("\n📁 Step 2: Verify Generated Files")
-    out_dir = "out"
-    if os.path.exists(out_dir):
-        files = os.listdir(out_dir)
-        print(f"   Files in {out_dir}: {len(files)}")
-        for file in sorted(files):
-            file_path = os.path.join(out_dir, file)
-            size = os.path.getsize(file_path)
-            print(f"   📄 {file}: {size} bytes")
-    else:
-        print("   ❌ Output directory not found")
-        return False
-    
-    # Step 3: Run Playwright validation
-    print("\n🎭 Step 3: Playwright Validation")
-    success_playwright = run_command("python3 tests/playwright_validate.py", "Validate QR rendering")
-    
-    # Step 4: Create debugging package
-    print("\n📦 Step 4: Create Debug Package")
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    debug_package = f"qr_debug_{timestamp}.zip"
-    
-    with zipfile.ZipFile(debug_package, 'w') as zf:
-        # Add all output files
-        for root, dirs, files in os.walk(out_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arc_path = os.path.relpath(file_path, '.')
-                zf.write(file_path, arc_path)
-        
-        # Add test scripts
-        test_files = [
-            "tests/gen_and_embed.py",
-            "tests/playwright_validate.py",
-            "tests/qr_test.py"
-        ]
-        
-        for test_file in test_files:
-            if os.path.exists(test_file):
-                zf.write(test_file, os.path.basename(test_file))
-        
-        # Add summary report
-        summary = {
-            "timestamp": timestamp,
-            "generation_success": success_gen,
-            "playwright_success": success_playwright,
-            "files_generated": len(os.listdir(out_dir)) if os.path.exists(out_dir) else 0,
-            "debug_package": debug_package
-        }
-        
-        zf.writestr("debug_summary.json", json.dumps(summary, indent=2))
-    
-    print(f"   📦 Debug package created: {debug_package}")
-    
-    # Step 5: Print next steps
+    print(f"\n📦 Debug package created: {report['debug_package']}")
+
+    # Next steps
     print("\n📋 Next Steps for Engineer")
     print("=" * 60)
-    print("1. 📁 Check the 'out/' directory for generated files:")
+    print(f"1. 📁 Check the '{out_dir}/' directory for generated files:")
     print("   - PNG files: Actual QR code images")
-    print("   - B64 files: Base64 encoded data")
-    print("   - JSON files: Metadata")
-    print("   - HTML file: Test page")
+    print("   - HTML file: Test page with the Base64 data inline")
     print("   - Screenshot: Playwright rendering result")
-    
-    print("\n2. 🔍 Open 'out/index.html' in browser to see visual result")
-    
-    print("\n3. 📊 Check 'out/playwright_results.json' for detailed analysis")
-    
-    print("\n4. 📦 Send 'qr_debug_TIMESTAMP.zip' to engineer for analysis")
-    
+
+    print(f"\n2. 🔍 Open '{out_dir}/index.html' in browser to see visual result")
+
+    print(f"\n3. 📊 Check '{out_dir}/playwright_results.json' for detailed analysis")
+
+    print(f"\n4. 📦 Send '{report['debug_package']}' to engineer for analysis")
+
     print("\n5. 🛠️  Common fixes to try:")
     print("   - Check if PNG files are actually white when viewed directly")
     print("   - Verify Base64 data doesn't have line breaks or extra characters")
     print("   - Check browser console for image loading errors")
     print("   - Try replacing data URI with direct PNG file path")
-    
-    return success_gen and success_playwright
+
+    return report["ok"]
 
 def main():
     """Main troubleshooting function."""
-    success = create_debug_report()
-    
+    parser = argparse.ArgumentParser(description='Run the QR troubleshooting pipeline')
+    parser.add_argument('--out-dir', default=OUT, help=f'Directory for generated files (default: {OUT})')
+    parser.add_argument('--png-mode', default='rgba', choices=('rgba',) + PNG_MODES,
+                       help='PNG encoding (default: rgba)')
+    parser.add_argument('--package-dir', help='Directory for the debug zip (default: the --out-dir directory)')
+    parser.add_argument('--skip-playwright', action='store_true', help='Skip the Playwright stage')
+
+    args = parser.parse_args()
+
+    success = create_debug_report(args.out_dir, playwright=not args.skip_playwright, png_mode=args.png_mode,
+                                  package_dir=args.package_dir)
+
     if success:
         print("\n🎉 Troubleshooting completed successfully!")
     else:
         print("\n⚠️  Troubleshooting completed with issues")
         print("   Check the debug package for detailed analysis")
-    
+
     return success
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Content Manifest Tests (Pytest)
+
+Tests for scripts/build_content_manifest.py: schema errors must be reported
+at build time, and the merged manifest must carry the sorted order and
+derived fields the router uses without further processing.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from build_content_manifest import (build_manifest, format_date, load_content, parse_category_labels,
+                                    validate_entries, write_content_manifest)
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+def entry(slug, date='2025-01-02', **fields):
+    """A valid guide/blog entry, with fields overridden."""
+    return dict({'slug': slug, 'title': slug.title(), 'date': date, 'author': 'Club', 'summary': 's',
+                 'description': 'd', 'detailedSummary': 'ds', 'file': f'{slug}.html', 'tags': ['linux']}, **fields)
+
+def make_site(root, guides, blogs):
+    """Write index.html with two categories, the metadata files and every listed page."""
+    (root / "index.html").write_text("const categoryConfig = {\n  'linux': {\n    label: 'Linux',\n  },\n"
+                                     "  'blog': {\n    label: 'Blog Posts',\n  },\n};")
+    for directory, metadata, entries in (("guides", "guides.json", guides), ("blogs", "blog-posts.json", blogs)):
+        (root / directory).mkdir()
+        (root / directory / metadata).write_text(json.dumps(entries))
+        for item in entries:
+            (root / directory / item['file']).write_text("<body></body>")
+
+def test_site_content_is_valid():
+    """The repository's guides.json and blog-posts.json pass validation."""
+    content = load_content(SITE_ROOT)
+    assert content['guides'] and content['blogs']
+    assert all(item['url'] == f"#/guides/{item['file']}" for item in content['guides'])
+    assert {item['category'] for item in content['blogs']} == {'blog'}
+
+def test_format_date_matches_router():
+    """Same text as toLocaleDateString('en-US', {year: 'numeric', month: 'short', day: 'numeric'})."""
+    assert format_date('2025-10-07') == 'Oct 7, 2025'
+    assert format_date('2024-09-30') == 'Sep 30, 2024'
+
+def test_parse_category_labels():
+    """Category keys and labels come from categoryConfig, with JS escapes undone."""
+    source = "const categoryConfig = { 'ctf-tools': { label: 'CTF \\'Tools\\'', icon: 'x' } };"
+    assert parse_category_labels(source) == {'ctf-tools': "CTF 'Tools'"}
+
+def test_validation_errors(tmp_path):
+    """Every problem is reported with the entry it belongs to."""
+    (tmp_path / "a.html").write_text("")
+    entries = [
+        entry('a', category='linux'),
+        entry('a', date='2025-13-01', category='linux'),                 # duplicate slug, bad date
+        entry('Bad Slug', file='missing.html', tags=['x', 'x'], category='nope'),
+        {'slug': 'partial'},
+        'not an object',
+    ]
+    errors = validate_entries('guides', entries, str(tmp_path), categories={'linux'})
+    expected = [
+        "guides[1] (a): date '2025-13-01' is not YYYY-MM-DD",
+        "guides[1] (a): duplicate slug 'a'",
+        "guides[1] (a): duplicate file 'a.html'",
+        "guides[2] (Bad Slug): slug must be lowercase words joined by '-'",
+        "guides[2] (Bad Slug): duplicate tags",
+        "guides[2] (Bad Slug): file 'missing.html' does not exist",
+        "guides[2] (Bad Slug): unknown category 'nope' (not in categoryConfig)",
+        "guides[3] (partial): missing 'title'",
+        "guides[4]: expected an object",
+    ]
+    for message in expected:
+        assert message in errors
+    assert not any(error.startswith('guides[0]') for error in errors)
+    assert validate_entries('blogs', {}, str(tmp_path)) == ["blogs: expected a list of entries, got dict"]
+
+def test_manifest(tmp_path):
+    """Blogs come newest first; tags, category counts and dates are precomputed; version tracks content."""
+    make_site(tmp_path, [entry('one', category='linux', tags=['linux', 'shell'])],
+              [entry('old', '2025-09-30', tags=['career']), entry('new', '2025-10-22', tags=['career', 'linux'])])
+
+    manifest = write_content_manifest(str(tmp_path))
+    assert json.loads((tmp_path / "build" / "content-manifest.json").read_text()) == manifest
+    assert not (tmp_path / "content-manifest.json").exists()
+    assert manifest['schema'] == 1
+    assert [item['slug'] for item in manifest['blogs']] == ['new', 'old']
+    assert manifest['blogs'][0]['formattedDate'] == 'Oct 22, 2025'
+    assert manifest['tags'] == {'career': ['#/blogs/new.html', '#/blogs/old.html'],
+                                'linux': ['#/guides/one.html', '#/blogs/new.html'],
+                                'shell': ['#/guides/one.html']}
+    assert manifest['categories'] == {'linux': 1, 'blog': 2}
+
+    version = manifest['version']
+    assert build_manifest(load_content(str(tmp_path)))['version'] == version
+    (tmp_path / "guides" / "guides.json").write_text(json.dumps([entry('one', category='linux', title='Renamed')]))
+    assert build_manifest(load_content(str(tmp_path)))['version'] != version
+
+def test_invalid_content_writes_nothing(tmp_path):
+    """Schema errors raise with every message and leave no manifest behind."""
+    make_site(tmp_path, [entry('one', category='unknown')], [entry('post', date='07/10/2025')])
+    with pytest.raises(ValueError) as error:
+        write_content_manifest(str(tmp_path))
+    assert "2 content error(s)" in str(error.value)
+    assert "unknown category 'unknown'" in str(error.value) and "'07/10/2025'" in str(error.value)
+    assert not (tmp_path / "build" / "content-manifest.json").exists()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Build Script Dependency Tests (Pytest)
+
+The deploy workflow runs the site build scripts with only the standard
+library and brotli. These tests run them in a fresh interpreter in which
+the QR stack (qrcode, numpy, Pillow, ...) cannot be imported, so a new
+import that reaches it fails here instead of on the Pages runner.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+
+# Packages the deploy workflow does not install
+NOT_IN_WORKFLOW = ('qrcode', 'numpy', 'PIL', 'pyzbar', 'playwright')
+
+BLOCK_IMPORTS = """
+import importlib.abc, sys
+class Block(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path=None, target=None):
+        if name.split('.')[0] in {blocked!r}:
+            raise ModuleNotFoundError(f"No module named {{name!r}}", name=name)
+sys.meta_path.insert(0, Block())
+sys.path.insert(0, {scripts!r})
+"""
+
+def run_without_qr_stack(code, *args):
+    """Run code in a new interpreter where the packages in NOT_IN_WORKFLOW cannot be imported."""
+    prelude = BLOCK_IMPORTS.format(blocked=NOT_IN_WORKFLOW, scripts=SCRIPTS_DIR)
+    return subprocess.run([sys.executable, '-c', prelude + code, *args], capture_output=True, text=True)
+
+@pytest.mark.parametrize("module", ['fileutil', 'prerender_routes', 'build_content_manifest', 'build_search_index',
+                                    'rewrite_youtube_links'])
+def test_build_scripts_import_without_qr_stack(module):
+    """Build-time scripts import with only the standard library."""
+    result = run_without_qr_stack(f"import {module}")
+    assert result.returncode == 0, result.stderr
+
+def test_build_site_runs_without_qr_stack(tmp_path):
+    """scripts/build_site.py builds the real site with only the workflow's dependencies."""
+    out = tmp_path / "build"
+    script = os.path.join(SCRIPTS_DIR, 'build_site.py')
+    result = run_without_qr_stack(f"import runpy; sys.argv = [{script!r}] + sys.argv[1:]; "
+                                  f"runpy.run_path({script!r}, run_name='__main__')",
+                                  '--out', str(out), '--json', str(tmp_path / "report.json"))
+    assert result.returncode == 0, result.stderr
+    for name in ('index.html', 'content-manifest.json', 'search-index.json', 'asset-manifest.json'):
+        assert (out / name).exists(), name
+    assert any((out / "prerendered" / "guides").iterdir())
+
+def test_qr_stack_is_really_blocked():
+    """The guard itself works: the QR tools cannot be imported."""
+    result = run_without_qr_stack("import embed_guide_qr_codes")
+    assert "No module named 'qrcode'" in result.stderr
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Search Index Tests (Pytest)
+
+Tests for scripts/build_search_index.py: the indexer must see every resource
+the resources page lists, reach guide and blog body text, and the router's
+JavaScript lookup must return exactly what the Python reference search does.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from build_content_manifest import build_manifest, load_content, parse_category_labels
+from build_search_index import (build_index, load_documents, page_text, parse_resources, search, tokenize,
+                                write_search_index)
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+# Evaluates the router's search functions from index.html against an index file
+JS_SEARCH = r"""
+const fs = require('fs');
+const html = fs.readFileSync(process.argv[2], 'utf8');
+const start = html.indexOf('    // Must match tokenize()');
+const end = html.indexOf('    async function loadContent(type) {');
+const createSearchIndex = new Function(html.slice(start, end) + '; return createSearchIndex;')();
+const index = createSearchIndex(JSON.parse(fs.readFileSync(process.argv[3], 'utf8')));
+const out = {};
+for (const q of JSON.parse(process.argv[4])) out[q] = index.search(q);
+console.log(JSON.stringify(out));
+"""
+
+# Runs the resources page's search (index hits merged with the substring scan) and lists the cards
+JS_RESULTS = r"""
+const fs = require('fs');
+const [htmlPath, indexPath, resourcesPath, manifestPath, labelsJson, queriesJson] = process.argv.slice(2);
+const html = fs.readFileSync(htmlPath, 'utf8');
+const start = html.indexOf('    // Must match tokenize()');
+const end = html.indexOf('    async function loadContent(type) {');
+const page = new Function(html.slice(start, end) + '; return { createSearchIndex, scanResources, mergeSearchResults };')();
+const index = page.createSearchIndex(JSON.parse(fs.readFileSync(indexPath, 'utf8')));
+const resources = JSON.parse(fs.readFileSync(resourcesPath, 'utf8'));
+const manifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+const labels = JSON.parse(labelsJson);
+const out = {};
+for (const q of JSON.parse(queriesJson)) {
+  const scanned = page.scanResources(resources, q, cat => labels[cat] || cat);
+  out[q] = { scanned: scanned.map(r => r.url),
+             results: page.mergeSearchResults(index.search(q), scanned, resources, manifest).map(r => [r.name, r.url]) };
+}
+console.log(JSON.stringify(out));
+"""
+
+def test_tokenize():
+    """Lowercase ASCII letter/digit runs; accents are stripped, punctuation splits."""
+    assert tokenize("Café CTF-Tools, chmod 755!") == ['cafe', 'ctf', 'tools', 'chmod', '755']
+
+def test_parse_resources():
+    """Resources come from index.html, with JS escapes undone."""
+    source = """
+      const data = [
+        { name: 'CyberChef', url: 'https://cyberchef.io/', cat: 'ctf-tools',
+          summary: 'It\\'s a "Swiss Army knife"' },
+        ...guideResources,
+      ];
+    """
+    assert parse_resources(source) == [{'name': 'CyberChef', 'url': 'https://cyberchef.io/', 'cat': 'ctf-tools',
+                                        'summary': 'It\'s a "Swiss Army knife"'}]
+    with pytest.raises(ValueError):
+        parse_resources("<html></html>")
+
+def test_page_text_skips_non_text():
+    """Only visible body text is indexed: no head, scripts, styles or QR code SVG paths."""
+    html = ("<head><title>Head</title></head><body><style>.a{}</style><p>chmod &amp; chown</p>"
+            "<svg><path d='M0 0h7'/></svg><script>var hidden = 1</script></body>")
+    assert tokenize(page_text(html)) == ['chmod', 'chown']
+
+def test_prefix_search_requires_every_token():
+    """Every token must prefix-match a term of the document; higher-weighted fields rank first."""
+    index = build_index([
+        {'url': 'a', 'name': 'Linux permissions', 'body': 'chmod'},
+        {'url': 'b', 'name': 'Networking', 'body': 'linux routing'},
+        {'url': 'c', 'name': 'Ciphers', 'tags': ['crypto']},
+    ])
+    assert search(index, 'lin') == ['a', 'b']
+    assert search(index, 'linux chm') == ['a']
+    assert search(index, 'cry') == ['c']
+    assert search(index, 'nothing') == []
+    assert search(index, '') == []
+
+def test_short_query_tokens_are_ignored():
+    """Tokens below MIN_TERM_LENGTH match nothing in the index instead of every term they prefix."""
+    index = build_index([{'url': 'a', 'name': 'C++ crypto'}, {'url': 'b', 'name': 'Linux'}])
+    assert search(index, 'c++') == []
+    assert search(index, 'c linux') == ['b']
+
+def test_site_index_covers_resources_and_bodies():
+    """Every resource on the page is a document, and guide bodies and blog tags are searchable."""
+    documents = load_documents(SITE_ROOT)
+    urls = [document['url'] for document in documents]
+    assert len(urls) == len(set(urls))
+    assert 'https://cyberchef.io/' in urls
+    assert any(url.startswith('#/guides/') for url in urls) and any(url.startswith('#/blogs/') for url in urls)
+
+    index = build_index(documents)
+    assert search(index, 'chmod') and all(url.startswith('#/guides/') for url in search(index, 'chmod'))
+    assert '#/blogs/ebay-laptop-buying-guide.html' in search(index, 'buying-guide')
+
+def test_default_output_is_build_dir(tmp_path):
+    """Without --out the index goes to build/, not the site root the router reads first."""
+    (tmp_path / "guides").mkdir()
+    (tmp_path / "blogs").mkdir()
+    (tmp_path / "index.html").write_text("const data = [{ name: 'Tool', url: 'https://tool.example/' }, ...guideResources];")
+    (tmp_path / "guides" / "guides.json").write_text("[]")
+    (tmp_path / "blogs" / "blog-posts.json").write_text("[]")
+
+    result = write_search_index(str(tmp_path))
+    assert result["path"] == os.path.join(str(tmp_path), "build", "search-index.json")
+    assert json.loads((tmp_path / "build" / "search-index.json").read_text())["docs"] == ["https://tool.example/"]
+    assert not (tmp_path / "search-index.json").exists()
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node not installed")
+def test_router_search_matches_python(tmp_path):
+    """The createSearchIndex() lookup in index.html agrees with the Python reference search."""
+    index = build_index(load_documents(SITE_ROOT))
+    index_path = tmp_path / "search-index.json"
+    index_path.write_text(json.dumps(index))
+    script = tmp_path / "search.js"
+    script.write_text(JS_SEARCH)
+
+    queries = ['linux', 'chmod perm', 'Café', 'ncl', 'buying-guide', 'x', '', 'zzz', 'ctf tools', 'CyberChef',
+               'c++', 'c linux']
+    result = subprocess.run(['node', str(script), os.path.join(SITE_ROOT, 'index.html'), str(index_path),
+                             json.dumps(queries)], capture_output=True, text=True, check=True)
+    js = json.loads(result.stdout)
+    for query in queries:
+        assert js[query] == search(index, query), query
+
+def run_page_search(tmp_path, resources, queries):
+    """Run the page's merged search in node over the site index, with `resources` as the page's data."""
+    with open(os.path.join(SITE_ROOT, 'index.html'), encoding='utf-8') as f:
+        labels = parse_category_labels(f.read())
+    paths = {}
+    for name, value in (('index', build_index(load_documents(SITE_ROOT))), ('resources', resources),
+                        ('manifest', build_manifest(load_content(SITE_ROOT)))):
+        paths[name] = tmp_path / f"{name}.json"
+        paths[name].write_text(json.dumps(value))
+    script = tmp_path / "results.js"
+    script.write_text(JS_RESULTS)
+    result = subprocess.run(['node', str(script), os.path.join(SITE_ROOT, 'index.html'), str(paths['index']),
+                             str(paths['resources']), str(paths['manifest']), json.dumps(labels), json.dumps(queries)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node not installed")
+def test_body_only_hits_reach_results(tmp_path):
+    """A term only found in guide bodies shows its guides, titled from the manifest when the page lacks them."""
+    with open(os.path.join(SITE_ROOT, 'index.html'), encoding='utf-8') as f:
+        static = parse_resources(f.read())
+    assert not any('chmod' in json.dumps(resource).lower() for resource in static)
+    titles = {entry['url']: entry['title'] for entry in load_content(SITE_ROOT)['guides']}
+
+    results = run_page_search(tmp_path, static, ['chmod'])['chmod']['results']
+    assert results and all(titles.get(url) == name for name, url in results)
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node not installed")
+def test_index_never_narrows_substring_scan(tmp_path):
+    """Every resource the old substring scan found is still listed, after the index hits."""
+    documents = load_documents(SITE_ROOT)
+    resources = [{key: document[key] for key in ('name', 'url', 'cat', 'desc', 'summary') if key in document}
+                 for document in documents]
+    queries = ['security', 'ux', 'c++', 'aws', 'sudo', 'crowdstrike', 'permissions', 'commands']
+    out = run_page_search(tmp_path, resources, queries)
+    for query in queries:
+        urls = [url for _, url in out[query]['results']]
+        assert len(urls) == len(set(urls)), query
+        assert set(out[query]['scanned']) <= set(urls), query
+    for query in ('security', 'ux', 'aws', 'sudo', 'crowdstrike', 'permissions', 'commands'):
+        assert out[query]['results'], query
+    security = [url for _, url in out['security']['results']]
+    assert len(security) > len(search(build_index(documents), 'security'))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Site Build Tests (Pytest)
+
+Tests for scripts/build_site.py: the minifiers must only drop comments and
+whitespace, and the build must write the served files, route fragments,
+content-hashed assets and precompressed siblings.
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from build_site import (build_site, fingerprint, first_load_paths, hashed_name, minify_css, minify_html, minify_js,
+                        site_files)
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+INLINE_SCRIPT = re.compile(r'<script(?![^>]*\bsrc=)(?![^>]*ld\+json)[^>]*>([\s\S]*?)</script>', re.I)
+
+@pytest.mark.parametrize("source, expected", [
+    ("let a = 1\nlet b = a - -1", "let a=1\nlet b=a- -1"),
+    ("x = a\n++b", "x=a\n++b"),                                  # ASI before ++ is kept
+    ("return\nx", "return\nx"),
+    ("if (a) {\n  b() // call\n}", "if(a){b()}"),
+    ("const r = /a\\/b[/]/g.test(s)\nd = a / b / c", "const r=/a\\/b[/]/g.test(s)\nd=a/b/c"),
+    ("f(`a  ${ {x: 1}.x + `in ${y}` }  b`)", "f(`a  ${{x:1}.x+`in ${y}`}  b`)"),
+    ("s = \"a  // b\" /* c */; t = 1 .toString()", "s=\"a  // b\";t=1 .toString()"),
+])
+def test_minify_js(source, expected):
+    """Whitespace and comments go; literals, ASI-relevant line breaks and token boundaries stay."""
+    assert minify_js(source) == expected
+
+def test_minify_css():
+    """Selectors keep descendant spaces; strings and calc() operators are untouched."""
+    css = 'a :hover , b > c { color : red ; /* x */ content: "a  b" ; }  .x { margin: calc(1px + 2px) }'
+    assert minify_css(css) == 'a :hover,b>c{color : red;content: "a  b"}.x{margin: calc(1px + 2px)}'
+
+def test_minify_html():
+    """Text whitespace collapses across removed comments; <pre>, tags and JSON-LD are handled."""
+    html = ('<!DOCTYPE html>\n\n<p title="a   b">a   b</p>\n<!-- note -->\n\n<pre>  x\n  y</pre>  '
+            '<script>var a = 1 // c\n</script><script type="application/ld+json">{ "a": [1, 2] }</script>')
+    assert minify_html(html) == ('<!DOCTYPE html>\n<p title="a   b">a b</p>\n<pre>  x\n  y</pre> '
+                                 '<script>var a=1</script><script type="application/ld+json">{"a":[1,2]}</script>')
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node not installed")
+def test_minified_site_scripts_parse(tmp_path):
+    """Every inline script and local script in the real site still parses after minification."""
+    for _, path in site_files(SITE_ROOT):
+        if path.endswith('.html'):
+            with open(path, encoding='utf-8') as f:
+                scripts = INLINE_SCRIPT.findall(minify_html(f.read()))
+        elif path.endswith('.js') and not path.endswith('.min.js'):
+            with open(path, encoding='utf-8') as f:
+                scripts = [minify_js(f.read())]
+        else:
+            continue
+        for index, script in enumerate(scripts):
+            target = tmp_path / f"{os.path.basename(path)}-{index}.js"
+            target.write_text(script)
+            result = subprocess.run(['node', '--check', str(target)], capture_output=True, text=True)
+            assert result.returncode == 0, f"{path} script {index}: {result.stderr}"
+
+def test_minify_is_idempotent_on_site():
+    """Minifying minified pages changes nothing (no whitespace left to collapse, nothing re-tokenized)."""
+    for _, path in site_files(SITE_ROOT):
+        if path.endswith('.html'):
+            with open(path, encoding='utf-8') as f:
+                once = minify_html(f.read())
+            assert minify_html(once) == once, path
+
+def test_build(tmp_path):
+    """The build holds minified pages, fragments and decompressible .gz siblings, and reports first load."""
+    root = tmp_path / "site"
+    (root / "guides").mkdir(parents=True)
+    (root / "js").mkdir()
+    (root / "blogs").mkdir()
+    (root / "index.html").write_text(
+        "<html><head><script src=\"./js/app.js\"></script></head>\n<body>\n  <p>Home</p>\n"
+        "<script>const data = [{ name: 'Tool', url: 'https://tool.example/', cat: 'x' }, ...guideResources];</script>"
+        "\n</body></html>")
+    (root / "js" / "app.js").write_text("// app\nconst greeting = 'hi';\n" * 20)
+    (root / "guides" / "one.html").write_text("<html><body>\n  <h1>One</h1>  <!-- c -->\n</body></html>")
+    (root / "guides" / "README.md").write_text("# not served")
+    guide = {"slug": "one", "title": "One", "date": "2025-01-02", "author": "Club", "summary": "s",
+             "description": "d", "detailedSummary": "ds", "file": "one.html", "tags": ["t"], "category": "linux"}
+    (root / "guides" / "guides.json").write_text(json.dumps([guide], indent=2))
+    (root / "blogs" / "blog-posts.json").write_text('[]')
+
+    report = build_site(str(root), str(tmp_path / "build"))
+    built = tmp_path / "build"
+
+    hashed_app = report['manifest']['js/app.js']
+    assert sorted(entry['path'] for entry in report['files']) == sorted([
+        'blogs/blog-posts.json', 'content-manifest.json', 'guides/guides.json', 'guides/one.html', 'index.html',
+        'js/app.js', hashed_app, 'prerendered/guides/one.html', 'search-index.json'])
+    assert (built / "prerendered" / "guides" / "one.html").read_text() == "<h1>One</h1>"
+    assert json.loads((built / "guides" / "guides.json").read_text()) == [guide]
+    assert json.loads((built / "content-manifest.json").read_text())['categories'] == {'linux': 1}
+    assert json.loads((built / "search-index.json").read_text())['docs'] == ['https://tool.example/', '#/guides/one.html']
+    assert not (built / "guides" / "README.md").exists()
+
+    app = (built / "js" / "app.js").read_bytes()
+    assert (built / hashed_app).read_bytes() == app
+    assert gzip.decompress((built / f"{hashed_app}.gz").read_bytes()) == app
+    assert f'src="./{hashed_app}"' in (built / "index.html").read_text()
+    assert json.loads((built / "asset-manifest.json").read_text()) == {'js/app.js': hashed_app}
+    assert report['first_load']['files'] == 2
+    assert report['totals']['transfer_bytes'] < report['totals']['source_bytes']
+
+    # Rebuilding replaces the output instead of leaving stale files behind
+    (root / "guides" / "one.html").unlink()
+    (root / "guides" / "guides.json").write_text('[]')
+    build_site(str(root), str(built))
+    assert not glob.glob(str(built / "**" / "one.html*"), recursive=True)
+
+def test_fingerprint_rewrites_references():
+    """References resolve from the referencing file; stylesheets are hashed after their url()s are rewritten."""
+    contents = {
+        'index.html': b'<img src="images/a.webp"><script src="./js/app.js?v=1"></script>'
+                      b'<img src="https://example.org/images/a.webp">',
+        'guides/one.html': b'<script src="../js/app.js"></script><img src="images/a.webp">',
+        'prerendered/guides/one.html': b'<img src="images/a.webp">',
+        'js/theme.css': b'.hero{background:url(../images/a.webp)}',
+        'js/app.js': b'const icon="images/a.webp"',
+        'images/a.webp': b'RIFF',
+        'version.json': b'{}',
+    }
+    manifest = fingerprint(contents)
+
+    image, app, css = manifest['images/a.webp'], manifest['js/app.js'], manifest['js/theme.css']
+    assert set(manifest) == {'images/a.webp', 'js/app.js', 'js/theme.css'}
+    assert image == hashed_name('images/a.webp', b'RIFF') and image.startswith('images/a.')
+    assert contents['index.html'].decode() == (f'<img src="{image}"><script src="./{app}?v=1"></script>'
+                                               '<img src="https://example.org/images/a.webp">')
+    # guides/images/a.webp does not exist, so only the script reference changes
+    assert contents['guides/one.html'].decode() == f'<script src="../{app}"></script><img src="images/a.webp">'
+    # Fragments are injected into index.html and resolve from the site root
+    assert contents['prerendered/guides/one.html'].decode() == f'<img src="{image}">'
+    assert contents[css] == contents['js/theme.css'] == f'.hero{{background:url(../{image})}}'.encode()
+    assert css == hashed_name('js/theme.css', contents[css])
+    assert contents[app] == b'const icon="images/a.webp"'
+
+def test_content_errors_stop_the_build(tmp_path):
+    """Invalid guide metadata fails the build before anything is deployed."""
+    root = tmp_path / "site"
+    (root / "guides").mkdir(parents=True)
+    (root / "blogs").mkdir()
+    (root / "index.html").write_text("<script>const data = [...guideResources];</script>")
+    (root / "guides" / "guides.json").write_text('[{"slug": "one"}]')
+    (root / "blogs" / "blog-posts.json").write_text('[]')
+    with pytest.raises(ValueError, match="missing 'title'"):
+        build_site(str(root), str(tmp_path / "build"))
+
+def test_refuses_to_replace_site_root(tmp_path):
+    """An output directory containing the site root is never deleted."""
+    (tmp_path / "index.html").write_text("<p>x</p>")
+    with pytest.raises(ValueError):
+        build_site(str(tmp_path), str(tmp_path))
+    assert (tmp_path / "index.html").exists()
+
+def test_first_load_paths():
+    """Local script, image and icon references count; remote and templated ones do not."""
+    html = ('<link rel="icon" href="favicon.ico"><script src="./js/a.js?v=1"></script>'
+            '<script src="https://cdn.example/x.js"></script><img src="images/b.webp"><img src="${url}">')
+    assert first_load_paths(html) == {'index.html', 'favicon.ico', 'js/a.js', 'images/b.webp'}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
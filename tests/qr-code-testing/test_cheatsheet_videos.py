@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cheatsheet Video Catalogue Tests (Pytest)
+
+Tests for the data-file catalogue in scripts/cheatsheet_videos.py.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from cheatsheet_videos import (
+    CatalogueError, cheatsheet_by_slug, cheatsheet_numbers, load_catalogue, video_by_id, videos_for_cheatsheet
+)
+from generate_qr_codes import get_all_cheatsheet_videos, get_cheatsheet_videos
+
+def write_catalogue(tmp_path, entries):
+    """Write a catalogue file and return its path."""
+    path = tmp_path / "cheatsheet-videos.json"
+    path.write_text(json.dumps(entries), encoding="utf-8")
+    return str(path)
+
+def video(video_id, title="Video"):
+    """A minimal valid catalogue video entry."""
+    return {
+        "title": title,
+        "url": f"https://youtu.be/{video_id}",
+        "full_url": f"https://www.youtube.com/watch?v={video_id}",
+        "filename": "video1_qr",
+    }
+
+class TestCatalogue:
+    """Test the shipped catalogue and its indexes."""
+
+    def test_every_cheatsheet_has_two_videos(self):
+        """Cheatsheets 1-5 are catalogued once each with two videos."""
+        assert cheatsheet_numbers() == [1, 2, 3, 4, 5]
+        for number in cheatsheet_numbers():
+            assert len(get_cheatsheet_videos(number)) == 2
+        assert len(get_all_cheatsheet_videos()) == 10
+
+    def test_indexes_agree(self):
+        """Number, slug and video ID lookups return the same entries."""
+        sheet = cheatsheet_by_slug("linux-cheatsheet-3")
+        assert sheet["cheatsheet"] == 3
+        assert sheet["file"] == "linux-cheatsheet-3.html"
+        assert sheet["videos"] == videos_for_cheatsheet(3)
+
+        found = video_by_id("twREXouRxns")
+        assert found["cheatsheet"] == 3
+        assert found["url"] == "https://youtu.be/twREXouRxns"
+
+    def test_unknown_lookups(self):
+        """Unknown keys return empty results rather than raising."""
+        assert get_cheatsheet_videos(99) == []
+        assert cheatsheet_by_slug("linux-cheatsheet-99") is None
+        assert video_by_id("xxxxxxxxxxx") is None
+
+    def test_results_are_copies(self):
+        """Mutating a returned video does not change the cached catalogue."""
+        get_cheatsheet_videos(1)[0]["title"] = "changed"
+        assert get_cheatsheet_videos(1)[0]["title"] != "changed"
+
+    def test_file_is_parsed_once(self, tmp_path):
+        """Repeated lookups reuse the cached index."""
+        path = write_catalogue(tmp_path, [{"cheatsheet": 1, "videos": [video("N9j--n-zGgc")]}])
+        before = load_catalogue.cache_info()
+        videos_for_cheatsheet(1, path)
+        video_by_id("N9j--n-zGgc", path)
+        cheatsheet_by_slug("linux-cheatsheet-1", path)
+        after = load_catalogue.cache_info()
+
+        assert after.misses - before.misses == 1
+        assert after.hits - before.hits == 2
+
+class TestValidation:
+    """Test that malformed data files are rejected."""
+
+    def test_duplicate_cheatsheet_number(self, tmp_path):
+        """A repeated cheatsheet number is an error instead of a silent overwrite."""
+        path = write_catalogue(tmp_path, [
+            {"cheatsheet": 3, "videos": [video("twREXouRxns")]},
+            {"cheatsheet": 3, "videos": [video("2DcDQe8idtU")]},
+        ])
+        with pytest.raises(CatalogueError, match="more than once"):
+            load_catalogue(path)
+
+    def test_missing_field(self, tmp_path):
+        """Videos must carry every field generate_qr_codes.py relies on."""
+        entry = video("N9j--n-zGgc")
+        del entry["filename"]
+        path = write_catalogue(tmp_path, [{"cheatsheet": 1, "videos": [entry]}])
+        with pytest.raises(CatalogueError, match="filename"):
+            load_catalogue(path)
+
+    def test_url_must_be_short_url(self, tmp_path):
+        """The encoded url must be a youtu.be short URL."""
+        entry = video("N9j--n-zGgc")
+        entry["url"] = entry["full_url"]
+        path = write_catalogue(tmp_path, [{"cheatsheet": 1, "videos": [entry]}])
+        with pytest.raises(CatalogueError, match="short URL"):
+            load_catalogue(path)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
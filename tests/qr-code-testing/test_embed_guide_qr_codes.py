@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Guide QR Embedding Tests (Pytest)
+
+Tests for the in-place refresh tool in scripts/embed_guide_qr_codes.py,
+run against copies of the real guides.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from embed_guide_qr_codes import apply_edits, find_qr_blocks, refresh_guides
+from generate_qr_codes import GUIDES_DIR, get_all_cheatsheet_videos
+from qr_decode import decode_matrix
+from qr_svg_path import path_to_matrix
+
+GUIDE = os.path.join(GUIDES_DIR, "linux-cheatsheet-4.html")
+
+@pytest.fixture
+def guide_copy(tmp_path):
+    """A writable copy of a real guide with two embedded QR codes."""
+    path = tmp_path / "linux-cheatsheet-4.html"
+    shutil.copyfile(GUIDE, path)
+    return path
+
+class TestFindBlocks:
+    """Test locating QR blocks and their videos."""
+
+    def test_blocks_are_matched_to_catalogue_videos(self):
+        """Every QR code in the guides belongs to a catalogued video."""
+        known = {video["url"].rsplit("/", 1)[-1] for video in get_all_cheatsheet_videos()}
+        for number in range(1, 6):
+            with open(os.path.join(GUIDES_DIR, f"linux-cheatsheet-{number}.html"), encoding="utf-8") as f:
+                blocks = find_qr_blocks(f.read())
+            assert len(blocks) == 2
+            assert all(block["video_id"] in known for block in blocks)
+
+    def test_block_without_video_link_is_unknown(self, tmp_path):
+        """A QR block with no YouTube link in its row is reported, not rewritten."""
+        path = tmp_path / "guide.html"
+        html = '<tr><td><svg viewBox="0 0 1 1"><path d="M0,0H1V1H0z"/><title>QR Code</title></svg></td></tr>'
+        path.write_text(html, encoding="utf-8")
+
+        report = refresh_guides([str(path)], get_all_cheatsheet_videos(), cache=None)[0]
+        assert report["unknown"] == 1
+        assert path.read_text(encoding="utf-8") == html
+
+class TestRefresh:
+    """Test stale detection and in-place rewriting."""
+
+    def test_check_mode_does_not_write(self, guide_copy):
+        """write=False reports stale blocks without touching the file."""
+        before = guide_copy.read_bytes()
+        report = refresh_guides([str(guide_copy)], get_all_cheatsheet_videos(), write=False, optimize=True)[0]
+
+        assert report["stale"] == 2
+        assert not report["written"]
+        assert guide_copy.read_bytes() == before
+
+    def test_refresh_only_changes_path_data(self, guide_copy):
+        """Only the path data changes, the result decodes, and a second run is a no-op."""
+        before = guide_copy.read_text(encoding="utf-8")
+        report = refresh_guides([str(guide_copy)], get_all_cheatsheet_videos(), optimize=True)[0]
+        after = guide_copy.read_text(encoding="utf-8")
+
+        assert report["written"]
+        assert report["bytes_after"] < report["bytes_before"]
+
+        old_blocks, new_blocks = find_qr_blocks(before), find_qr_blocks(after)
+        assert [b["video_id"] for b in old_blocks] == [b["video_id"] for b in new_blocks]
+        for old, new in zip(old_blocks, new_blocks):
+            assert decode_matrix(path_to_matrix(new["path"], 25)) == decode_matrix(path_to_matrix(old["path"], 25))
+
+        # Everything outside the replaced attribute values is byte-identical
+        blank = lambda html, blocks: apply_edits(html, [(*b["path_span"], "") for b in blocks])
+        assert blank(before, old_blocks) == blank(after, new_blocks)
+
+        mtime = os.stat(guide_copy).st_mtime_ns
+        again = refresh_guides([str(guide_copy)], get_all_cheatsheet_videos(), optimize=True)[0]
+        assert again["stale"] == 0 and not again["written"]
+        assert os.stat(guide_copy).st_mtime_ns == mtime
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
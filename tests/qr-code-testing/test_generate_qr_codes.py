@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Guide QR Generator Tests (Pytest)
+
+Tests for batch and parallel generation in scripts/generate_qr_codes.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from generate_qr_codes import generate_qr_code, generate_qr_batch, get_all_cheatsheet_videos
+
+class TestBatchGeneration:
+    """Test the shared-encoder batch pipeline."""
+
+    def test_batch_matches_single_generation(self):
+        """Reusing one encoder produces the same SVG as a fresh encoder per URL."""
+        items = get_all_cheatsheet_videos()
+        results = generate_qr_batch(items)
+
+        assert len(results) == len(items)
+        for item, result in zip(items, results):
+            assert result["url"] == item["url"]
+            assert result["svg"] == generate_qr_code(item["url"])
+            assert result["seconds"] >= 0
+
+    def test_encoder_reset_between_sizes(self):
+        """A long URL followed by a short one does not keep the larger version."""
+        long_url = "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html?" + "x" * 80
+        short_url = "https://youtu.be/N9j--n-zGgc"
+        results = generate_qr_batch([{"url": long_url}, {"url": short_url}])
+
+        assert results[1]["svg"] == generate_qr_code(short_url)
+
+    @pytest.mark.parametrize("jobs", [2, 3])
+    def test_parallel_output_order_is_deterministic(self, jobs):
+        """--jobs N returns results in input order, identical to the sequential run."""
+        items = get_all_cheatsheet_videos()
+        sequential = generate_qr_batch(items, jobs=1)
+        parallel = generate_qr_batch(items, jobs=jobs)
+
+        assert [r["url"] for r in parallel] == [item["url"] for item in items]
+        assert [r["svg"] for r in parallel] == [r["svg"] for r in sequential]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Playwright Validation Tests (Pytest)
+
+Tests for the batched diagnostics and the shared-browser page pool in
+playwright_validate.py. The browser tests are skipped when Playwright is
+not installed and also need `playwright install chromium`.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from gen_and_embed import make_html, render_qr
+from playwright_validate import DEFAULT_SELECTOR, diagnose, find_pages, page_error, png_dimensions, validate_pages
+from qr_png import png_data_uri
+
+SITE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+QR_SVG = '<svg viewBox="0 0 23.2 23.2"><path d="M1.6,1.6H2.4V2.4H1.6z"/><title>QR Code</title></svg>'
+
+def raw_image(**overrides):
+    """Raw diagnostics of a healthy QR image."""
+    raw = {
+        "id": "qr_a", "src": png_data_uri(render_qr("qr_a", "https://example.com/")["png"]), "alt": "", "expected_url": "",
+        "natural_width": 290, "natural_height": 290, "is_visible": True,
+        "computed_styles": {"display": "inline", "visibility": "visible", "opacity": "1"},
+        "parent_styles": None,
+    }
+    raw.update(overrides)
+    return raw
+
+class TestDiagnose:
+    """Test the issue rules."""
+
+    def test_healthy_image(self):
+        """A loaded, visible PNG data URI has no issues."""
+        assert diagnose(raw_image())["issues"] == []
+
+    def test_reports_issues(self):
+        """Each broken property is reported."""
+        issues = diagnose(raw_image(src="x", natural_width=0, is_visible=False,
+                                    computed_styles={"opacity": "0", "display": "none"}))["issues"]
+        assert issues == ["Image not loaded (natural dimensions are 0)", "Image not visible",
+                          "Invalid data URI format", "Opacity is 0", "Display is none"]
+
+    @pytest.mark.parametrize("payload", ["A" * 2000, "not base64!", "iVBORw0KGgoAAAANSUhEUgAAAAAAAAAA"])
+    def test_rejects_data_that_is_not_a_png(self, payload):
+        """Long garbage, invalid Base64 and a zero-sized IHDR are all reported."""
+        issues = diagnose(raw_image(src="data:image/png;base64," + payload))["issues"]
+        assert issues == ["Base64 data is not a valid PNG"]
+
+    @pytest.mark.parametrize("box_size", [1, 10])
+    def test_short_1bit_png_is_healthy(self, box_size):
+        """gray1 data URIs are far below 1000 characters and still pass."""
+        record = render_qr("home", "https://ccri-cyberknights.github.io/page/", box_size=box_size, png_mode="gray1")
+        src = png_data_uri(record["png"])
+        assert len(src) < 1000
+        assert png_dimensions(src) == tuple(record["png_size"])
+        assert diagnose(raw_image(src=src, natural_width=record["png_size"][0],
+                                  natural_height=record["png_size"][1]))["issues"] == []
+
+    def test_inline_svg(self):
+        """Inline SVG QR codes are checked for a viewBox and path data, not for a data URI."""
+        svg = raw_image(kind="svg", src="", path_length=1200, natural_width=23.2, natural_height=23.2)
+        assert diagnose(svg)["issues"] == []
+        broken = dict(svg, path_length=0, natural_width=0)
+        assert diagnose(broken)["issues"] == ["SVG has no viewBox", "QR path data is empty"]
+
+    def test_page_without_qr_codes_fails(self):
+        """A page on which the selector matches nothing is a failure, not a clean pass."""
+        assert "No QR codes found" in page_error([], DEFAULT_SELECTOR)
+        assert page_error([diagnose(raw_image())], DEFAULT_SELECTOR) is None
+
+class TestFindPages:
+    """Test --site page discovery."""
+
+    def test_only_site_pages_with_qr_codes(self, tmp_path):
+        """index.html, guides/ and blogs/ pages with QR markup; never build/, tests/ or docs/."""
+        for name, body in {"index.html": "<p>home</p>", "guides/a.html": QR_SVG, "guides/b.html": "<p>no codes</p>",
+                           "blogs/c.html": '<img class="qr-image" src="x">', "build/guides/a.html": QR_SVG,
+                           "tests/page.html": QR_SVG, "docs/page.html": QR_SVG}.items():
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text(body)
+        assert find_pages(str(tmp_path)) == [str(tmp_path / "guides" / "a.html"), str(tmp_path / "blogs" / "c.html")]
+
+    def test_site_guides_are_found(self):
+        """Every cheatsheet with embedded QR codes is validated by --site."""
+        pages = [os.path.relpath(page, SITE_ROOT) for page in find_pages(SITE_ROOT)]
+        assert pages and all(page.startswith(os.path.join("guides", "linux-cheatsheet-")) for page in pages)
+
+class TestBrowser:
+    """Validate real pages in one headless browser."""
+
+    def test_pages_share_one_browser(self, tmp_path):
+        """Several pages are validated concurrently, one report per page in order."""
+        pytest.importorskip("playwright")
+        pages = []
+        for name in ("one", "two", "three"):
+            records = [render_qr(f"{name}{i}", f"https://example.com/{name}/{i}") for i in range(3)]
+            pages.append(make_html(records, out_dir=tmp_path / name))
+
+        try:
+            reports = asyncio.run(validate_pages(pages, concurrency=2, screenshot_dir=None))
+        except Exception as e:
+            pytest.skip(f"Chromium unavailable: {e}")
+
+        assert [r["page"] for r in reports] == pages
+        for report in reports:
+            assert report["error"] is None
+            assert len(report["results"]) == 3
+            assert all(r["issues"] == [] for r in report["results"])
+
+    def test_empty_page_and_inline_svg(self, tmp_path):
+        """A page without QR codes fails; a site guide's inline SVG codes pass."""
+        pytest.importorskip("playwright")
+        empty = tmp_path / "empty.html"
+        empty.write_text("<html><body><p>No codes here</p></body></html>")
+        guide = os.path.join(SITE_ROOT, "guides", "linux-cheatsheet-1.html")
+
+        try:
+            reports = asyncio.run(validate_pages([str(empty), guide], screenshot_dir=None))
+        except Exception as e:
+            pytest.skip(f"Chromium unavailable: {e}")
+
+        assert reports[0]["results"] == [] and "No QR codes found" in reports[0]["error"]
+        assert reports[1]["error"] is None and len(reports[1]["results"]) == 2
+        assert all(r["kind"] == "svg" and r["issues"] == [] for r in reports[1]["results"])
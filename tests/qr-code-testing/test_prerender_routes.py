@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Route Prerendering Tests (Pytest)
+
+Tests for scripts/prerender_routes.py: fragments must be exactly what the
+router's body regex extracted from the full page, minus duplicate styles.
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from prerender_routes import dedupe_styles, extract_body, prerender_site, route_pages, shell_style_keys
+
+# The router's regex, as written in index.html
+ROUTER_BODY = re.compile(r'<body[^>]*>([\s\S]*)<\/body>', re.I)
+
+def make_site(root, pages, shell="<html><head><style>.shell{}</style></head><body></body></html>"):
+    """Write index.html and the given {route: html} pages under root."""
+    (root / "index.html").write_text(shell)
+    for route, html in pages.items():
+        path = root / route
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(html)
+
+def test_matches_router_extraction_on_site():
+    """For every real guide and blog, the fragment equals what the router injected."""
+    pages = route_pages()
+    assert pages
+    for _, path in pages:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        assert extract_body(html) == ROUTER_BODY.search(html).group(1)
+
+def test_no_body_returns_whole_text():
+    """Pages without <body> are injected whole, as before."""
+    assert extract_body("<p>plain</p>") == "<p>plain</p>"
+
+def test_dedupe_styles():
+    """Repeated blocks (ignoring whitespace) collapse to the first copy; blocks the shell has are dropped."""
+    a, b = "<style>.a { color: red; }</style>", "<style>.b{}</style>"
+    fragment = f"{a}<p>1</p><style>.a {{ color:  red; }}</style>{b}<p>2</p>{a}"
+    deduped, removed = dedupe_styles(fragment, shell_style_keys(f"<head>{b}</head>"))
+    assert deduped == f"{a}<p>1</p><p>2</p>"
+    assert removed == 3
+
+def test_build_and_check(tmp_path):
+    """Fragments are written under build/prerendered/ and reported stale only when they change."""
+    make_site(tmp_path, {
+        "guides/one.html": "<html><head><title>x</title></head><BODY class='a'><h1>One</h1></BODY></html>",
+        "blogs/two.html": "<html><body><style>.shell{}</style><p>Two</p></body></html>",
+    })
+
+    results = prerender_site(str(tmp_path))
+    assert [r["route"] for r in results] == ["guides/one.html", "blogs/two.html"]
+    assert (tmp_path / "build" / "prerendered" / "guides" / "one.html").read_text() == "<h1>One</h1>"
+    assert (tmp_path / "build" / "prerendered" / "blogs" / "two.html").read_text() == "<p>Two</p>"
+    assert not (tmp_path / "prerendered").exists()
+    assert results[1]["styles_removed"] == 1
+
+    assert not any(r["stale"] for r in prerender_site(str(tmp_path), write=False))
+    (tmp_path / "guides" / "one.html").write_text("<body><h1>Changed</h1></body>")
+    assert [r["route"] for r in prerender_site(str(tmp_path), write=False) if r["stale"]] == ["guides/one.html"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
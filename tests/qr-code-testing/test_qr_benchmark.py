@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+QR Benchmark Suite Tests (Pytest)
+
+Tests for the measurement and regression logic in qr_benchmark.py. The
+benchmarks themselves are run with tiny repeat counts; the numbers are not
+asserted, only their shape and the pass/fail decision.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from qr_benchmark import BENCHMARKS, ECLS, URLS, compare, load_baseline, run_benchmarks, save_baseline
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def result(median_us, peak_kib):
+    """A minimal benchmark result."""
+    return {'median_us': median_us, 'min_us': median_us, 'throughput': 1e6 / median_us, 'peak_kib': peak_kib}
+
+class TestCompare:
+    """Test the regression decision."""
+
+    def test_within_threshold(self):
+        """Changes up to the threshold pass."""
+        assert compare({'a': result(1200, 100)}, {'a': result(1000, 100)}, threshold=0.25) == []
+
+    def test_slower_past_threshold(self):
+        """A latency increase past the threshold is reported."""
+        regressions = compare({'a': result(1500, 100)}, {'a': result(1000, 100)}, threshold=0.25)
+        assert regressions == [{'case': 'a', 'metric': 'median_us', 'baseline': 1000, 'current': 1500,
+                                'ratio': 1.5}]
+
+    def test_memory_past_threshold(self):
+        """A peak memory increase past the threshold is reported."""
+        regressions = compare({'a': result(1000, 300)}, {'a': result(1000, 100)}, threshold=0.25)
+        assert [r['metric'] for r in regressions] == ['peak_kib']
+
+    def test_noise_floor(self):
+        """Tiny absolute changes never count, however large in relative terms."""
+        assert compare({'a': result(6, 2)}, {'a': result(3, 1)}, threshold=0.25) == []
+
+    def test_new_cases_are_not_regressions(self):
+        """Cases missing from the baseline are skipped."""
+        assert compare({'new': result(9999, 9999)}, {}, threshold=0) == []
+
+class TestRun:
+    """Test running the benchmarks."""
+
+    def test_baseline_covers_every_case(self):
+        """The committed baseline has every benchmark × URL × ECL case."""
+        baseline = load_baseline()
+        assert len(baseline['results']) == len(BENCHMARKS) * len(URLS) * len(ECLS)
+
+    @pytest.mark.parametrize("name", list(BENCHMARKS))
+    def test_every_benchmark_runs(self, name):
+        """Each benchmark produces all metrics."""
+        results = run_benchmarks([name], ['short'], ['L'], repeat=1, rounds=1)
+        (key, metrics), = results.items()
+        assert key == f"{name}/short/L"
+        assert metrics['median_us'] > 0 and metrics['peak_kib'] > 0
+
+    def test_fails_on_regression(self, tmp_path):
+        """The command line exits 1 when a case is far slower than its baseline."""
+        results = run_benchmarks(['png_encode'], ['short'], ['L'], repeat=1, rounds=1)
+        fast = {key: {**m, 'median_us': m['median_us'] / 100} for key, m in results.items()}
+        path = tmp_path / "baseline.json"
+        save_baseline(fast, str(path), repeat=1, rounds=1)
+
+        command = [sys.executable, os.path.join(HERE, "qr_benchmark.py"), "-b", "png_encode", "--url", "short",
+                   "--ecl", "L", "--repeat", "1", "--rounds", "1", "--baseline", str(path)]
+        assert subprocess.run(command, capture_output=True).returncode == 1
+        assert subprocess.run(command + ["--threshold", "1000"], capture_output=True).returncode == 0
+
+    def test_partial_update_keeps_other_cases(self, tmp_path):
+        """Updating a subset of cases leaves the rest of the baseline alone."""
+        path = tmp_path / "baseline.json"
+        save_baseline({'other/case/L': result(1, 1)}, str(path))
+        subprocess.run([sys.executable, os.path.join(HERE, "qr_benchmark.py"), "-b", "base64_encode",
+                        "--url", "short", "--ecl", "L", "--repeat", "1", "--rounds", "1",
+                        "--baseline", str(path), "--update-baseline"], capture_output=True, check=True)
+
+        assert set(json.loads(path.read_text())['results']) == {'other/case/L', 'base64_encode/short/L'}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,19 +3,22 @@
 QR Code Testing Script
 
 This script tests QR code generation and decoding functionality.
-It can generate QR codes, save them as images, and decode them using various methods.
+It generates QR codes and decodes them again entirely in memory (see
+qr_roundtrip.py), so no images are written to disk and no decoder process
+is spawned per image.
 """
 
 import qrcode
-import base64
-import io
 import os
 import sys
-import subprocess
-import tempfile
-from PIL import Image
+import time
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import available_backends, decode
+from qr_roundtrip import DEFAULT_URLS, image_data_uri, roundtrip
+
 def generate_qr_code(text, filename=None):
     """Generate a QR code and return the PIL Image object."""
     qr = qrcode.QRCode(
@@ -37,41 +40,7 @@ def generate_qr_code(text, filename=None):
 
 def generate_base64_qr(text):
     """Generate a QR code and return it as base64 string."""
-    img = generate_qr_code(text)
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
-
-def decode_qr_with_zbar(filename):
-    """Decode QR code using zbarimg command-line tool."""
-    try:
-        result = subprocess.run(['zbarimg', '--raw', filename], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            return result.stdout.strip()
-        else:
-            return None
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return None
-
-def decode_qr_with_opencv(filename):
-    """Decode QR code using OpenCV (if available)."""
-    try:
-        import cv2
-        from pyzbar import pyzbar
-        
-        image = cv2.imread(filename)
-        barcodes = pyzbar.decode(image)
-        
-        if barcodes:
-            return barcodes[0].data.decode('utf-8')
-        return None
-    except ImportError:
-        return None
+    return image_data_uri(generate_qr_code(text))
 
 def test_qr_generation_and_decoding():
     """Test QR code generation and decoding."""
@@ -79,48 +48,29 @@ def test_qr_generation_and_decoding():
     print("=" * 50)
     
     # Test URLs
-    test_urls = [
-        "https://ccri-cyberknights.github.io/page/",
-        "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
-        "https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6",
-        "https://www.youtube.com/watch?v=2DcDQe8idtU&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=7"
-    ]
+    test_urls = DEFAULT_URLS
     
+    start = time.perf_counter()
     results = []
-    
-    for i, url in enumerate(test_urls):
-        print(f"\n📱 Test {i+1}: {url[:50]}...")
-        
-        # Generate QR code
-        filename = f"/tmp/qr_test_{i+1}.png"
-        img = generate_qr_code(url, filename)
-        
-        # Try to decode with zbarimg
-        decoded_zbar = decode_qr_with_zbar(filename)
-        
-        # Try to decode with OpenCV (if available)
-        decoded_opencv = decode_qr_with_opencv(filename)
-        
-        # Generate base64 version
-        base64_qr = generate_base64_qr(url)
-        
-        result = {
-            "url": url,
-            "filename": filename,
-            "decoded_zbar": decoded_zbar,
-            "decoded_opencv": decoded_opencv,
-            "base64_length": len(base64_qr),
-            "success": decoded_zbar == url or decoded_opencv == url
-        }
-        
-        results.append(result)
-        
-        print(f"   ✅ Generated: {filename}")
-        print(f"   🔍 ZBar decode: {decoded_zbar}")
-        print(f"   🔍 OpenCV decode: {decoded_opencv}")
-        print(f"   📊 Base64 length: {len(base64_qr)} chars")
+    for result in roundtrip([{"text": url} for url in test_urls]):
+        results.append({
+            "url": result["text"],
+            "image_size": f"{result['shape'][1]}x{result['shape'][0]}",
+            "decoded": result["decoded"],
+            "base64_length": len(generate_base64_qr(result["text"])),
+            "success": result["success"]
+        })
+    elapsed = time.perf_counter() - start
+    
+    for i, result in enumerate(results):
+        print(f"\n📱 Test {i+1}: {result['url'][:50]}...")
+        print(f"   📊 Image size: {result['image_size']}")
+        print(f"   🔍 Decoded: {result['decoded']}")
+        print(f"   📊 Base64 length: {result['base64_length']} chars")
         print(f"   ✅ Success: {result['success']}")
     
+    print(f"\n⏱️  {len(results)} round trips in {elapsed * 1000:.0f} ms (no temp files)")
+    
     return results
 
 def test_current_cheatsheet_qr():
@@ -133,24 +83,21 @@ def test_current_cheatsheet_qr():
     
     print(f"Expected URL: {expected_url}")
     
-    # Generate the correct QR code
-    correct_filename = "/tmp/cheatsheet_correct.png"
-    generate_qr_code(expected_url, correct_filename)
+    # Generate the correct QR code in memory
+    img = generate_qr_code(expected_url)
     
     # Generate base64 version for embedding
     base64_correct = generate_base64_qr(expected_url)
     
-    print(f"✅ Correct QR code generated: {correct_filename}")
     print(f"📊 Base64 length: {len(base64_correct)} chars")
     
     # Test decoding
-    decoded = decode_qr_with_zbar(correct_filename)
+    decoded = decode(img.get_image())
     print(f"🔍 Decoded content: {decoded}")
     print(f"✅ Matches expected: {decoded == expected_url}")
     
     return {
         "expected_url": expected_url,
-        "filename": correct_filename,
         "base64": base64_correct,
         "decoded": decoded,
         "success": decoded == expected_url
@@ -164,25 +111,9 @@ def main():
     # Check available tools
     print("\n🔧 Checking Available Tools:")
     
-    # Check zbarimg
-    try:
-        subprocess.run(['zbarimg', '--version'], capture_output=True, timeout=5)
-        print("   ✅ zbarimg available")
-        zbar_available = True
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        print("   ❌ zbarimg not available")
-        zbar_available = False
-    
-    # Check OpenCV
-    try:
-        import cv2
-        from pyzbar import pyzbar
-        print("   ✅ OpenCV + pyzbar available")
-        opencv_available = True
-    except ImportError:
-        print("   ❌ OpenCV/pyzbar not available")
-        opencv_available = False
-    
+    backends = available_backends()
+    print("   ✅ Local decoder available")
+    print(f"   {'✅' if 'zbar' in backends else '❌'} zbar (pyzbar) available")
     print("   ✅ qrcode (Python) available")
     print("   ✅ PIL (Python) available")
     
@@ -206,10 +137,7 @@ def main():
         json.dump({
             "test_results": test_results,
             "cheatsheet_result": cheatsheet_result,
-            "tools_available": {
-                "zbarimg": zbar_available,
-                "opencv": opencv_available
-            }
+            "decoder_backends": backends
         }, f, indent=2)
     
     print(f"\n📄 Detailed results saved to: {results_file}")
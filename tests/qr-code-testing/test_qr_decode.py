@@ -1,66 +1,26 @@
 #!/usr/bin/env python3
 """
-QR Code Decoder using Web Services
+QR Code Decoder Test
 
-This script can decode QR codes using online services when local tools aren't available.
+Decodes generated QR code images offline through the common decode()
+interface in scripts/qr_decode.py (local NumPy decoder, or zbar when
+pyzbar is installed). No network access is needed.
 """
 
-import requests
-import base64
 import json
 import sys
 import os
-from PIL import Image
 
-def decode_qr_with_qrserver(filename):
-    """Decode QR code using qr-server.com API."""
-    try:
-        with open(filename, 'rb') as f:
-            files = {'file': f}
-            response = requests.post('https://api.qrserver.com/v1/read-qr-code/', 
-                                  files=files, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0 and 'symbol' in data[0]:
-                return data[0]['symbol'][0]['data']
-        return None
-    except Exception as e:
-        print(f"Error with qr-server.com: {e}")
-        return None
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
 
-def decode_qr_with_goqr(filename):
-    """Decode QR code using goqr.me API."""
-    try:
-        with open(filename, 'rb') as f:
-            files = {'file': f}
-            response = requests.post('https://api.qrserver.com/v1/read-qr-code/', 
-                                  files=files, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0 and 'symbol' in data[0]:
-                return data[0]['symbol'][0]['data']
-        return None
-    except Exception as e:
-        print(f"Error with goqr.me: {e}")
-        return None
+from qr_decode import available_backends, decode
 
-def decode_qr_with_webqr(filename):
-    """Decode QR code using webqr.com API."""
+def decode_qr_file(filename, backend='auto'):
+    """Decode a QR code image file; returns the text or None."""
     try:
-        with open(filename, 'rb') as f:
-            files = {'file': f}
-            response = requests.post('https://api.qrserver.com/v1/read-qr-code/', 
-                                  files=files, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0 and 'symbol' in data[0]:
-                return data[0]['symbol'][0]['data']
-        return None
-    except Exception as e:
-        print(f"Error with webqr.com: {e}")
+        return decode(filename, backend=backend)
+    except (OSError, ValueError) as e:
+        print(f"Error decoding {filename}: {e}")
         return None
 
 def test_qr_decoding():
@@ -93,19 +53,18 @@ def test_qr_decoding():
         print(f"\n📱 Test {i+1}: {os.path.basename(filename)}")
         print(f"   Expected: {expected_url}")
         
-        # Try different decoding methods
-        decoded_qrserver = decode_qr_with_qrserver(filename)
+        decoded = decode_qr_file(filename)
         
         result = {
             "filename": filename,
             "expected": expected_url,
-            "decoded_qrserver": decoded_qrserver,
-            "success": decoded_qrserver == expected_url
+            "decoded": decoded,
+            "success": decoded == expected_url
         }
         
         results.append(result)
         
-        print(f"   🔍 Decoded: {decoded_qrserver}")
+        print(f"   🔍 Decoded: {decoded}")
         print(f"   ✅ Success: {result['success']}")
     
     return results
@@ -131,6 +90,7 @@ def main():
         return False
     
     print(f"✅ Found {len(existing_files)} test files")
+    print(f"   Decoder backends: {', '.join(available_backends())}")
     
     # Test decoding
     results = test_qr_decoding()
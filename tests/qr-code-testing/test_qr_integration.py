@@ -7,12 +7,15 @@ Can be run as part of the project's test suite.
 """
 
 import qrcode
-import base64
-import io
+import os
 import sys
-import requests
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import decode
+from qr_roundtrip import image_data_uri
+
 def test_qr_generation():
     """Test basic QR code generation."""
     test_url = "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html"
@@ -30,10 +33,7 @@ def test_qr_generation():
         img = qr.make_image(fill_color="black", back_color="white")
         
         # Test base64 generation
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        base64_qr = f"data:image/png;base64,{img_str}"
+        base64_qr = image_data_uri(img)
         
         return True, f"Generated QR code: {len(base64_qr)} chars"
         
@@ -57,27 +57,10 @@ def test_qr_decoding():
         
         img = qr.make_image(fill_color="black", back_color="white")
         
-        # Save to temp file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            img.save(tmp.name)
-            temp_file = tmp.name
-        
-        # Test decoding
-        with open(temp_file, 'rb') as f:
-            files = {'file': f}
-            response = requests.post('https://api.qrserver.com/v1/read-qr-code/', 
-                                  files=files, timeout=10)
-        
-        # Clean up
-        import os
-        os.unlink(temp_file)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0 and 'symbol' in data[0]:
-                decoded = data[0]['symbol'][0]['data']
-                return decoded == test_url, f"Decoded: {decoded}"
+        # Decode the in-memory image offline
+        decoded = decode(img.get_image())
+        if decoded is not None:
+            return decoded == test_url, f"Decoded: {decoded}"
         
         return False, "Decoding failed"
         
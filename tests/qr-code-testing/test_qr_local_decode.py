@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local QR Decoder Tests (Pytest)
+
+Tests for the offline decoder in scripts/qr_decode.py.
+"""
+
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+import qrcode
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import QRDecodeError, available_backends, data_module_order, decode, decode_image, decode_matrix, load_image
+
+TEXTS = [
+    "https://ccri-cyberknights.github.io/page/",
+    "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+    "https://www.youtube.com/watch?v=twREXouRxns&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=6",
+    "HELLO WORLD 0123456789",
+    "ünïcødé ✓",
+    "x" * 400,
+]
+
+def make_matrix(text, ecl="M"):
+    """Encode text with the qrcode library and return its module matrix."""
+    qr = qrcode.QRCode(error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{ecl}"))
+    qr.add_data(text)
+    qr.make(fit=True)
+    return np.array(qr.modules, dtype=bool), qr.version
+
+def make_image(text, ecl="L", box_size=10, border=4, fill_color="black", back_color="white"):
+    """Encode text and return a PIL image, as the test scripts do."""
+    qr = qrcode.QRCode(
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{ecl}"),
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(text)
+    qr.make(fit=True)
+    return qr.make_image(fill_color=fill_color, back_color=back_color).get_image()
+
+class TestMatrixDecode:
+    """Decode module matrices produced by the qrcode library."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    @pytest.mark.parametrize("ecl", ["L", "M", "Q", "H"])
+    def test_roundtrip(self, text, ecl):
+        """Every ECL and segment mode decodes back to the input."""
+        matrix, _ = make_matrix(text, ecl)
+        assert decode_matrix(matrix) == text
+
+    @pytest.mark.parametrize("ecl,codewords", [("L", 2), ("M", 4), ("Q", 6), ("H", 8)])
+    def test_reed_solomon_corrects_errors(self, ecl, codewords):
+        """Corrupted codewords within the ECL's capacity are corrected."""
+        matrix, version = make_matrix(TEXTS[1], ecl)
+        rows, cols = data_module_order(version)
+
+        damaged = matrix.copy()
+        for codeword in range(codewords):
+            start = codeword * 8 * 3
+            damaged[rows[start:start + 8], cols[start:start + 8]] ^= True
+
+        assert decode_matrix(damaged) == TEXTS[1]
+
+    def test_invalid_size_raises(self):
+        """Matrices that are not a valid QR size are rejected."""
+        with pytest.raises(QRDecodeError):
+            decode_matrix(np.zeros((20, 20), dtype=bool))
+
+    def test_blank_symbol_raises(self):
+        """A symbol without format information is rejected."""
+        with pytest.raises(QRDecodeError):
+            decode_matrix(np.zeros((21, 21), dtype=bool))
+
+class TestImageDecode:
+    """Decode rendered images with the local backend."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    @pytest.mark.parametrize("ecl,box_size,border", [("L", 10, 4), ("M", 3, 1), ("H", 1, 0), ("Q", 8, 2)])
+    def test_png_roundtrip(self, text, ecl, box_size, border):
+        """PNG bytes decode back to the text at every size and border."""
+        buffer = io.BytesIO()
+        make_image(text, ecl, box_size, border).save(buffer, format="PNG")
+        assert decode_image(buffer.getvalue()) == text
+
+    def test_guide_colors(self):
+        """Black modules on the emerald guide background decode."""
+        assert decode_image(make_image(TEXTS[0], back_color="#10b981")) == TEXTS[0]
+
+    @pytest.mark.parametrize("angle", [90, 180, 270, 17, 45])
+    def test_rotated(self, angle):
+        """Rotated codes are located through their finder patterns."""
+        image = make_image(TEXTS[2]).convert("L").rotate(angle, expand=True, fillcolor=255)
+        assert decode_image(image) == TEXTS[2]
+
+    def test_mirrored_and_inverted(self):
+        """Mirror images and light-on-dark codes decode."""
+        image = make_image(TEXTS[1]).convert("L")
+        assert decode_image(image.transpose(Image.FLIP_LEFT_RIGHT)) == TEXTS[1]
+        assert decode_image(Image.eval(image, lambda v: 255 - v)) == TEXTS[1]
+
+    def test_sources(self, tmp_path):
+        """Paths, file objects, arrays and transparent images are all accepted."""
+        image = make_image(TEXTS[0])
+        path = tmp_path / "qr.png"
+        image.save(path)
+        assert decode_image(str(path)) == TEXTS[0]
+        with open(path, "rb") as f:
+            assert decode_image(f) == TEXTS[0]
+        assert decode_image(np.asarray(image.convert("RGB"))) == TEXTS[0]
+
+        transparent = make_image(TEXTS[0], back_color="transparent")
+        assert load_image(transparent).max() == 255
+        assert decode_image(transparent) == TEXTS[0]
+
+    def test_no_code_raises(self):
+        """A blank image raises QRDecodeError."""
+        with pytest.raises(QRDecodeError):
+            decode_image(np.full((100, 100), 255, dtype=np.uint8))
+
+class TestBackends:
+    """Test the common decode() interface."""
+
+    def test_local_backend(self):
+        """The local backend is always available and returns None on failure."""
+        assert "local" in available_backends()
+        assert decode(make_image(TEXTS[0]), backend="local") == TEXTS[0]
+        assert decode(np.full((50, 50), 255, dtype=np.uint8), backend="local") is None
+
+    def test_unknown_backend(self):
+        """Unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            decode(make_image(TEXTS[0]), backend="online")
+
+    def test_zbar_matches_local(self):
+        """When pyzbar is installed, both backends agree."""
+        if "zbar" not in available_backends():
+            pytest.skip("pyzbar not installed")
+        image = make_image(TEXTS[1])
+        assert decode(image, backend="zbar") == decode(image, backend="local") == TEXTS[1]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
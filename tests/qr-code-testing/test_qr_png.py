@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Minimal PNG Encoder Tests (Pytest)
+
+Tests for the 1-bit QR PNG encoder in scripts/qr_png.py and its use by
+gen_and_embed.render_qr().
+"""
+
+import io
+import os
+import struct
+import sys
+
+import numpy as np
+import pytest
+import qrcode
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from gen_and_embed import render_qr
+from qr_decode import decode
+from qr_png import encode_png, png_data_uri, size_report
+
+URL = "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html"
+
+def make_qr(data=URL, ecl=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=4):
+    qr = qrcode.QRCode(error_correction=ecl, box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+def chunk_types(png):
+    """Chunk types of a PNG, in order."""
+    types, offset = [], 8
+    while offset < len(png):
+        length, kind = struct.unpack('>I4s', png[offset:offset + 8])
+        types.append(kind)
+        offset += 12 + length
+    return types
+
+class TestEncoder:
+    """Test the encoded PNGs."""
+
+    @pytest.mark.parametrize("box_size,border", [(1, 4), (3, 2), (10, 4), (7, 0)])
+    def test_same_pixels_as_qrcode(self, box_size, border):
+        """gray1 output has exactly the pixels of qrcode's own image."""
+        qr = make_qr(box_size=box_size, border=border)
+        expected = np.asarray(qr.make_image().get_image().convert("L"))
+
+        image = Image.open(io.BytesIO(encode_png(qr.modules, box_size, border)))
+        assert image.mode == "1"
+        assert np.array_equal(np.asarray(image.convert("L")), expected)
+
+    def test_minimal_chunks(self):
+        """Only IHDR, IDAT and IEND are written (plus PLTE for palettes)."""
+        qr = make_qr()
+        assert chunk_types(encode_png(qr.modules)) == [b'IHDR', b'IDAT', b'IEND']
+        assert chunk_types(encode_png(qr.modules, mode='palette1')) == [b'IHDR', b'PLTE', b'IDAT', b'IEND']
+
+    def test_palette_colors(self):
+        """palette1 carries the requested colors and still decodes."""
+        qr = make_qr()
+        png = encode_png(qr.modules, 4, mode='palette1', fill_color='black', back_color='#10b981')
+        image = Image.open(io.BytesIO(png))
+        assert image.mode == "P"
+        assert image.getpalette()[:6] == [0, 0, 0, 0x10, 0xb9, 0x81]
+        assert decode(png) == URL
+
+    def test_gray1_rejects_colors(self):
+        """gray1 cannot carry colors, so asking for them is an error."""
+        with pytest.raises(ValueError, match="palette1"):
+            encode_png(make_qr().modules, back_color='#10b981')
+        with pytest.raises(ValueError, match="Unknown PNG mode"):
+            encode_png(make_qr().modules, mode='rgb')
+
+    @pytest.mark.parametrize("box_size", [1, 10])
+    def test_decodes(self, box_size):
+        """1-bit PNGs decode back to the data, including one pixel per module."""
+        assert decode(encode_png(make_qr().modules, box_size)) == URL
+
+    def test_smaller_than_pillow(self):
+        """The encoder beats Pillow's optimized 1-bit PNG of the same image."""
+        qr = make_qr()
+        buffer = io.BytesIO()
+        qr.make_image().get_image().save(buffer, format='PNG', optimize=True)
+        assert len(encode_png(qr.modules, 10)) < len(buffer.getvalue())
+
+    def test_data_uri(self):
+        """png_data_uri wraps the bytes for inline embedding."""
+        assert png_data_uri(b'\x89PNG').startswith("data:image/png;base64,iVBORw")
+
+class TestReport:
+    """Test the size report and gen_and_embed integration."""
+
+    def test_size_report(self):
+        """Every 1-bit variant is far smaller than the RGBA output."""
+        sizes = size_report(URL)['sizes']
+        assert sizes['gray1'] < sizes['rgba'] / 3
+        assert sizes['gray1@1px'] < sizes['gray1']
+
+    @pytest.mark.parametrize("png_mode", ["gray1", "palette1"])
+    def test_render_qr_modes(self, png_mode):
+        """render_qr() records the real image size for 1-bit modes."""
+        record = render_qr("px", URL, box_size=1, png_mode=png_mode)
+        image = Image.open(io.BytesIO(record["png"]))
+        assert list(image.size) == record["png_size"]
+        assert record["png_mode"] == png_mode
+        assert len(record["png"]) < len(render_qr("px", URL)["png"]) / 5
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
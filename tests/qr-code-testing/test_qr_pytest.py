@@ -3,30 +3,53 @@
 QR Code Unit Tests (Pytest)
 
 Comprehensive unit tests for QR code generation and validation.
+
+Every test writes into its own tmp_path and never changes the working
+directory, so the suite can be sharded across cores with pytest-xdist:
+
+    python -m pytest -n auto test_qr_pytest.py
 """
 
 import pytest
 import os
+import sys
 import json
 import base64
+import io
 from PIL import Image
-from gen_and_embed import gen_qr, verify_b64_roundtrip, make_html
+from gen_and_embed import gen_qr, verify_b64_roundtrip, make_html, render_qr, write_base64
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import decode
+
+# Round-trip matrix: every URL at every ECL, box size and border
+MATRIX_URLS = [
+    "https://ccri-cyberknights.github.io/page/",
+    "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+    "https://youtu.be/twREXouRxns",
+]
+MATRIX_ECLS = ["L", "M", "Q", "H"]
+MATRIX_BOX_SIZES = [2, 5, 10]
+MATRIX_BORDERS = [1, 4]
+
+def read_meta(out_dir, id):
+    """Load the metadata gen_qr() wrote for id."""
+    with open(os.path.join(out_dir, f"qr_{id}.meta.json")) as f:
+        return json.load(f)
 
 class TestQRGeneration:
     """Test QR code generation functionality."""
     
     def test_qr_generation_basic(self, tmp_path):
         """Test basic QR code generation."""
-        # Change to temp directory
-        os.chdir(tmp_path)
-        
         # Generate QR code
-        png_path, b64 = gen_qr("test1", "https://example.com/test")
+        png_path, b64 = gen_qr("test1", "https://example.com/test", out_dir=tmp_path)
         
         # Verify files exist
         assert os.path.exists(png_path)
-        assert os.path.exists("out/qr_test1.b64.txt")
-        assert os.path.exists("out/qr_test1.meta.json")
+        assert os.path.exists(tmp_path / "qr_test1.b64.txt")
+        assert os.path.exists(tmp_path / "qr_test1.meta.json")
         
         # Verify PNG is valid image
         img = Image.open(png_path)
@@ -38,59 +61,50 @@ class TestQRGeneration:
         assert isinstance(b64, str)
         
         # Verify metadata
-        with open("out/qr_test1.meta.json") as f:
-            meta = json.load(f)
+        meta = read_meta(tmp_path, "test1")
         assert meta["id"] == "test1"
         assert meta["data"] == "https://example.com/test"
     
-    def test_qr_generation_different_sizes(self, tmp_path):
+    @pytest.mark.parametrize("id,url,box_size,border,error", [
+        ("small", "https://example.com", 5, 2, "L"),
+        ("medium", "https://example.com", 10, 4, "M"),
+        ("large", "https://example.com", 15, 6, "H")
+    ])
+    def test_qr_generation_different_sizes(self, tmp_path, id, url, box_size, border, error):
         """Test QR code generation with different parameters."""
-        os.chdir(tmp_path)
+        png_path, b64 = gen_qr(id, url, box_size, border, error, out_dir=tmp_path)
         
-        test_cases = [
-            ("small", "https://example.com", 5, 2, "L"),
-            ("medium", "https://example.com", 10, 4, "M"),
-            ("large", "https://example.com", 15, 6, "H")
-        ]
+        # Verify generation
+        assert os.path.exists(png_path)
+        assert len(b64) > 0
         
-        for id, url, box_size, border, error in test_cases:
-            png_path, b64 = gen_qr(id, url, box_size, border, error)
-            
-            # Verify generation
-            assert os.path.exists(png_path)
-            assert len(b64) > 0
-            
-            # Verify metadata
-            with open(f"out/qr_{id}.meta.json") as f:
-                meta = json.load(f)
-            assert meta["box_size"] == box_size
-            assert meta["border"] == border
-            assert meta["error_level"] == error
+        # Verify metadata
+        meta = read_meta(tmp_path, id)
+        assert meta["box_size"] == box_size
+        assert meta["border"] == border
+        assert meta["error_level"] == error
     
     def test_base64_roundtrip(self, tmp_path):
         """Test Base64 encoding/decoding roundtrip."""
-        os.chdir(tmp_path)
-        
         # Generate QR code
-        gen_qr("roundtrip", "https://example.com/roundtrip")
+        gen_qr("roundtrip", "https://example.com/roundtrip", out_dir=tmp_path)
         
         # Test roundtrip
-        success, msg = verify_b64_roundtrip("roundtrip")
+        success, msg = verify_b64_roundtrip("roundtrip", out_dir=tmp_path)
         assert success, f"Roundtrip failed: {msg}"
     
     def test_html_generation(self, tmp_path):
         """Test HTML page generation."""
-        os.chdir(tmp_path)
-        
         # Generate test QR codes
-        gen_qr("html1", "https://example.com/1")
-        gen_qr("html2", "https://example.com/2")
+        gen_qr("html1", "https://example.com/1", out_dir=tmp_path)
+        gen_qr("html2", "https://example.com/2", out_dir=tmp_path)
         
         # Generate HTML
-        html_path = make_html(["html1", "html2"])
+        html_path = make_html(["html1", "html2"], out_dir=tmp_path)
         
         # Verify HTML file
         assert os.path.exists(html_path)
+        assert os.path.dirname(html_path) == str(tmp_path)
         
         # Read and verify content
         with open(html_path, 'r', encoding='utf-8') as f:
@@ -101,17 +115,66 @@ class TestQRGeneration:
         assert "qr_html2" in html_content
         assert "<!DOCTYPE html>" in html_content
 
+    def test_working_directory_untouched(self, tmp_path):
+        """Nothing is written relative to the working directory."""
+        before = sorted(os.listdir(os.getcwd()))
+        gen_qr("cwd", "https://example.com/cwd", out_dir=tmp_path / "nested")
+        make_html(["cwd"], out_dir=tmp_path / "nested")
+
+        assert sorted(os.listdir(os.getcwd())) == before
+        assert os.path.exists(tmp_path / "nested" / "index.html")
+
+class TestSinglePassPipeline:
+    """Test the encode-once, stream-to-HTML pipeline."""
+
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 47, 48, 49, 100])
+    def test_streamed_base64_matches(self, size):
+        """Chunked Base64 is identical to one-shot encoding across chunk boundaries."""
+        data = bytes(range(256)) * 4
+        out = io.StringIO()
+        written = write_base64(out, data[:size], chunk_size=48)
+        assert out.getvalue() == base64.b64encode(data[:size]).decode('ascii')
+        assert written == len(out.getvalue())
+
+    def test_records_match_files(self, tmp_path):
+        """A page built from in-memory records equals one built from gen_qr() files."""
+        urls = {"a": "https://example.com/a", "b": "https://example.com/b"}
+        for id, url in urls.items():
+            gen_qr(id, url, out_dir=tmp_path / "files")
+        from_files = make_html(list(urls), out_dir=tmp_path / "files")
+        from_records = make_html((render_qr(id, url) for id, url in urls.items()), out_dir=tmp_path / "memory")
+
+        with open(from_files, 'rb') as f, open(from_records, 'rb') as g:
+            assert f.read() == g.read()
+        assert sorted(os.listdir(tmp_path / "memory")) == ["index.html"]
+
+    def test_png_encoded_once(self, tmp_path):
+        """The saved PNG, the Base64 string and the record carry the same bytes."""
+        record = render_qr("once", "https://example.com/once")
+        png_path, b64 = gen_qr("once", "https://example.com/once", out_dir=tmp_path)
+
+        with open(png_path, 'rb') as f:
+            assert f.read() == record["png"] == base64.b64decode(b64)
+        assert record["base64_length"] == len(b64)
+        assert decode(record["png"]) == "https://example.com/once"
+
+    def test_without_sidecars(self, tmp_path):
+        """sidecars=False writes only the PNG, and make_html() still embeds it."""
+        gen_qr("bare", "https://example.com/bare", out_dir=tmp_path, sidecars=False)
+        assert sorted(os.listdir(tmp_path)) == ["qr_bare.png"]
+
+        with open(make_html(["bare"], out_dir=tmp_path), encoding='utf-8') as f:
+            assert 'id="qr_bare"' in f.read()
+
 class TestQRValidation:
     """Test QR code validation functionality."""
     
     def test_qr_content_validation(self, tmp_path):
         """Test that generated QR codes contain expected content."""
-        os.chdir(tmp_path)
-        
         test_url = "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html"
         
         # Generate QR code
-        png_path, b64 = gen_qr("validation", test_url)
+        png_path, b64 = gen_qr("validation", test_url, out_dir=tmp_path)
         
         # Verify PNG exists and is valid
         assert os.path.exists(png_path)
@@ -122,36 +185,50 @@ class TestQRValidation:
         assert len(b64) > 1000  # Should be substantial for this URL
         
         # Verify metadata
-        with open("out/qr_validation.meta.json") as f:
-            meta = json.load(f)
+        meta = read_meta(tmp_path, "validation")
         assert meta["data"] == test_url
     
-    def test_error_correction_levels(self, tmp_path):
+    @pytest.mark.parametrize("ecl", ["L", "M", "Q", "H"])
+    def test_error_correction_levels(self, tmp_path, ecl):
         """Test different error correction levels."""
-        os.chdir(tmp_path)
-        
         test_url = "https://example.com/ecl-test"
-        ecl_levels = ["L", "M", "Q", "H"]
         
-        for ecl in ecl_levels:
-            png_path, b64 = gen_qr(f"ecl_{ecl}", test_url, error=ecl)
+        png_path, b64 = gen_qr(f"ecl_{ecl}", test_url, error=ecl, out_dir=tmp_path)
+        
+        # Verify generation
+        assert os.path.exists(png_path)
+        assert len(b64) > 0
             
-            # Verify generation
-            assert os.path.exists(png_path)
-            assert len(b64) > 0
+        # Verify metadata
+        meta = read_meta(tmp_path, f"ecl_{ecl}")
+        assert meta["error_level"] == ecl
             
-            # Verify metadata
-            with open(f"out/qr_ecl_{ecl}.meta.json") as f:
-                meta = json.load(f)
-            assert meta["error_level"] == ecl
+class TestQRMatrix:
+    """URL × ECL × box size × border round trips, one independent test per combination."""
+
+    @pytest.mark.parametrize("border", MATRIX_BORDERS)
+    @pytest.mark.parametrize("box_size", MATRIX_BOX_SIZES)
+    @pytest.mark.parametrize("ecl", MATRIX_ECLS)
+    @pytest.mark.parametrize("url", MATRIX_URLS)
+    def test_roundtrip(self, tmp_path, url, ecl, box_size, border):
+        """The PNG, its Base64 copy and the metadata all describe the same QR code."""
+        png_path, b64 = gen_qr("matrix", url, box_size, border, ecl, out_dir=tmp_path)
+
+        assert decode(base64.b64decode(b64)) == url
+
+        success, msg = verify_b64_roundtrip("matrix", out_dir=tmp_path)
+        assert success, f"Roundtrip failed: {msg}"
+
+        meta = read_meta(tmp_path, "matrix")
+        width, height = Image.open(png_path).size
+        assert width == height == meta["png_size"][0]
+        assert (width // box_size - 2 * border - 17) % 4 == 0
 
 class TestQRIntegration:
     """Integration tests for complete QR code pipeline."""
     
     def test_complete_pipeline(self, tmp_path):
         """Test complete QR code generation and HTML pipeline."""
-        os.chdir(tmp_path)
-        
         # Test URLs from the project
         test_urls = {
             "home": "https://ccri-cyberknights.github.io/page/",
@@ -162,7 +239,7 @@ class TestQRIntegration:
         
         # Generate QR codes
         for id, url in test_urls.items():
-            png_path, b64 = gen_qr(id, url)
+            png_path, b64 = gen_qr(id, url, out_dir=tmp_path)
             generated_ids.append(id)
             
             # Verify each step
@@ -170,11 +247,11 @@ class TestQRIntegration:
             assert len(b64) > 0
             
             # Verify roundtrip
-            success, _ = verify_b64_roundtrip(id)
+            success, _ = verify_b64_roundtrip(id, out_dir=tmp_path)
             assert success
         
         # Generate HTML
-        html_path = make_html(generated_ids)
+        html_path = make_html(generated_ids, out_dir=tmp_path)
         assert os.path.exists(html_path)
         
         # Verify HTML contains all QR codes
@@ -185,23 +262,6 @@ class TestQRIntegration:
             assert f"qr_{id}" in html_content
             assert "data:image/png;base64," in html_content
 
-# Pytest configuration
-@pytest.fixture(autouse=True)
-def setup_test_environment(tmp_path):
-    """Setup test environment before each test."""
-    # Create output directory in temp path
-    out_dir = tmp_path / "out"
-    out_dir.mkdir(exist_ok=True)
-    
-    # Change to temp directory
-    original_cwd = os.getcwd()
-    os.chdir(tmp_path)
-    
-    yield
-    
-    # Restore original directory
-    os.chdir(original_cwd)
-
 if __name__ == "__main__":
     # Run tests directly
     pytest.main([__file__, "-v"])
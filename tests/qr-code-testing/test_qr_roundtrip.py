@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+In-Memory Round-Trip Tests (Pytest)
+
+Tests for the qr_roundtrip.py harness and the long-lived DecoderProcess in
+scripts/qr_decode.py.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+import qrcode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import DecoderProcess, decode
+from qr_roundtrip import default_cases, render_array, roundtrip
+
+class TestRenderArray:
+    """Test direct rendering to arrays."""
+
+    @pytest.mark.parametrize("ecl,constant", [("L", qrcode.constants.ERROR_CORRECT_L),
+                                              ("H", qrcode.constants.ERROR_CORRECT_H)])
+    def test_matches_pil_render(self, ecl, constant):
+        """The array has exactly the pixels of qrcode's PIL image."""
+        qr = qrcode.QRCode(error_correction=constant, box_size=3, border=2)
+        qr.add_data("https://youtu.be/twREXouRxns")
+        qr.make(fit=True)
+        expected = np.asarray(qr.make_image().get_image().convert("L"))
+
+        assert np.array_equal(render_array("https://youtu.be/twREXouRxns", ecl, 3, 2), expected)
+
+class TestRoundTrip:
+    """Test the generate/decode round trip."""
+
+    def test_default_suite_in_process(self):
+        """Every default case decodes, well under a second, without touching disk."""
+        start = time.perf_counter()
+        results = roundtrip(default_cases(), backend="local")
+        elapsed = time.perf_counter() - start
+
+        assert all(r["success"] for r in results), [r for r in results if not r["success"]]
+        assert elapsed < 1.0
+
+    def test_decoder_process(self):
+        """One worker process decodes the whole batch in a single call."""
+        cases = default_cases()
+        with DecoderProcess("local") as decoder:
+            results = roundtrip(cases, decoder=decoder)
+            assert decoder.decode(np.full((50, 50), 255, dtype=np.uint8)) is None
+            assert decoder.decode(render_array("again")) == "again"
+
+        assert [r["decoded"] for r in results] == [c["text"] for c in cases]
+
+    def test_accepts_pil_images(self):
+        """decode_many() takes PIL images as well as arrays."""
+        qr = qrcode.QRCode()
+        qr.add_data("pil image")
+        image = qr.make_image().get_image()
+
+        with DecoderProcess("local") as decoder:
+            assert decoder.decode_many([image, image]) == ["pil image", "pil image"]
+        assert decode(image) == "pil image"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -7,13 +7,15 @@ by displaying the generated images and base64 data.
 """
 
 import qrcode
-import base64
-import io
 import os
 import sys
 import json
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_roundtrip import image_data_uri
+
 def generate_qr_code(text, filename=None, size=10):
     """Generate a QR code and return the PIL Image object."""
     qr = qrcode.QRCode(
@@ -35,14 +37,7 @@ def generate_qr_code(text, filename=None, size=10):
 
 def generate_base64_qr(text, size=10):
     """Generate a QR code and return it as base64 string."""
-    img = generate_qr_code(text, size=size)
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
+    return image_data_uri(generate_qr_code(text, size=size))
 
 def test_cheatsheet_qr_codes():
     """Test QR codes for the Linux cheatsheet."""
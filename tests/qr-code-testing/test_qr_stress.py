@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+QR Stress Tester Tests (Pytest)
+
+Tests for the rasterizer, the batched degradations and the recommendation
+logic in scripts/qr_stress.py, on a deliberately small grid.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+import qrcode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_stress import (DEGRADATIONS, SCHEMES, build_cases, conditions, print_dpi, rasterize_svg, recommend,
+                       stress, summarize)
+from generate_qr_codes import generate_qr_code
+
+URL = "https://youtu.be/twREXouRxns"
+
+@pytest.fixture(scope="module")
+def cases():
+    return build_cases([URL], ecls=['L', 'H'], box_sizes=[4])
+
+def test_rasterize_matches_modules():
+    """The rasterized SVG has exactly qrcode's modules, in the scheme's colors."""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=3, border=2)
+    qr.add_data(URL)
+    qr.make(fit=True)
+
+    image = rasterize_svg(generate_qr_code(URL, ecl='L', box_size=3, border=2), 3, 2, 'footer')
+    dark = np.asarray(qr.make_image().get_image().convert("L")) == 0
+    assert image.shape == dark.shape + (3,)
+    assert (image[dark] == (0x00, 0x10, 0x11)).all() and (image[~dark] == (0xf4, 0xe4, 0xc1)).all()
+
+def test_measures_deployed_svg(cases):
+    """svg_bytes is the size of the optimized path the guides ship, not the unoptimized one."""
+    shipped = generate_qr_code(URL, ecl='L', box_size=4, border=2, optimize=True)
+    assert cases[0]["svg_bytes"] == len(shipped.encode('utf-8'))
+    unoptimized = build_cases([URL], ecls=['L'], box_sizes=[4], schemes={'emerald': SCHEMES['emerald']},
+                              optimize=False)[0]
+    assert unoptimized["svg_bytes"] > cases[0]["svg_bytes"]
+    assert (unoptimized["image"] == cases[0]["image"]).all()
+
+@pytest.mark.parametrize("name", list(DEGRADATIONS))
+def test_degradations_keep_batch(cases, name):
+    """Every degradation maps a batch to a batch of the same length and value range."""
+    batch = np.stack([case["image"] for case in cases[:2]])
+    function, levels = DEGRADATIONS[name]
+    out = function(batch, levels[-1], np.random.default_rng(0))
+    assert out.shape[0] == 2 and out.shape[-1] == 3
+    assert out.min() >= 0 and out.max() <= 255
+
+def test_print_dpi_size(cases):
+    """Print downscaling targets the physical size of a guide QR code."""
+    assert print_dpi(cases[0]["image"][None], 48).shape[1:3] == (60, 60)
+
+def test_stress_outcomes(cases):
+    """Every case is decoded under every condition, and pristine codes always decode."""
+    outcomes = stress(cases)
+    assert len(outcomes) == len(cases) * len(conditions())
+    assert all(o["decoded"] for o in outcomes if o["degradation"] == "none")
+
+    summary = summarize(outcomes)
+    assert {(c["scheme"], c["ecl"]) for c in summary} == {(s, e) for s in SCHEMES for e in "LH"}
+    assert all(0 <= c["success"] <= 1 and set(c["by_degradation"]) == {"none", *DEGRADATIONS} for c in summary)
+
+def test_recommend_smallest_reliable():
+    """The smallest configuration that meets the target wins; None when nothing does."""
+    summary = [
+        {"scheme": "a", "ecl": "L", "box_size": 2, "svg_bytes": 100, "version": 2, "success": 0.5},
+        {"scheme": "a", "ecl": "M", "box_size": 4, "svg_bytes": 300, "version": 3, "success": 0.95},
+        {"scheme": "a", "ecl": "L", "box_size": 4, "svg_bytes": 200, "version": 2, "success": 0.92},
+        {"scheme": "b", "ecl": "L", "box_size": 2, "svg_bytes": 100, "version": 2, "success": 0.1},
+    ]
+    best = recommend(summary, target=0.9)
+    assert (best["a"]["ecl"], best["a"]["box_size"]) == ("L", 4)
+    assert best["b"] is None
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+QR SVG Cache Tests (Pytest)
+
+Tests for the content-addressed SVG cache used by scripts/generate_qr_codes.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from generate_qr_codes import generate_qr_code, generate_qr_batch
+from qr_svg_cache import QRSvgCache, cache_key
+
+TEST_URL = "https://youtu.be/N9j--n-zGgc"
+
+class TestCacheKey:
+    """Test cache key derivation."""
+
+    def test_key_is_stable(self):
+        """Same inputs produce the same key."""
+        assert cache_key(TEST_URL) == cache_key(TEST_URL)
+
+    @pytest.mark.parametrize("change", [
+        {"data": "https://youtu.be/lI0mUMqBesU"},
+        {"ecl": "M"},
+        {"box_size": 10},
+        {"border": 4},
+        {"fill_color": "#000000"},
+        {"back_color": "#001011"},
+    ])
+    def test_every_input_changes_key(self, change):
+        """Changing any rendering input produces a different key."""
+        params = {"data": TEST_URL, "ecl": "L", "box_size": 8, "border": 2,
+                  "fill_color": "black", "back_color": "#10b981"}
+        assert cache_key(**params) != cache_key(**{**params, **change})
+
+class TestQRSvgCache:
+    """Test cache storage, LRU eviction and invalidation."""
+
+    def test_cached_output_is_byte_identical(self, tmp_path):
+        """A cache hit returns exactly what an uncached run produces."""
+        cache = QRSvgCache(str(tmp_path))
+        uncached = generate_qr_code(TEST_URL)
+
+        first = generate_qr_code(TEST_URL, cache=cache)
+        second = generate_qr_code(TEST_URL, cache=cache)
+
+        assert first == uncached
+        assert second == uncached
+        assert cache.misses == 1
+        assert cache.hits == 1
+
+    def test_batch_reports_cache_hits(self, tmp_path):
+        """Batch results flag which items came from the cache."""
+        cache = QRSvgCache(str(tmp_path))
+        items = [{"title": "a", "url": TEST_URL}]
+
+        assert generate_qr_batch(items, cache=cache)[0]["cached"] is False
+        result = generate_qr_batch(items, cache=cache)[0]
+        assert result["cached"] is True
+        assert result["svg"] == generate_qr_code(TEST_URL)
+
+    def test_lru_eviction(self, tmp_path):
+        """The least recently used entry is evicted once over budget."""
+        cache = QRSvgCache(str(tmp_path), max_bytes=250)
+        cache.put("aa" + "0" * 62, "x" * 100)
+        cache.put("bb" + "0" * 62, "y" * 100)
+
+        # Touch the first entry so the second becomes least recently used
+        os.utime(cache._path("bb" + "0" * 62), (1, 1))
+        assert cache.get("aa" + "0" * 62) == "x" * 100
+
+        cache.put("cc" + "0" * 62, "z" * 100)
+
+        assert cache.get("aa" + "0" * 62) == "x" * 100
+        assert cache.get("bb" + "0" * 62) is None
+        assert cache.get("cc" + "0" * 62) == "z" * 100
+        assert cache.stats()["bytes"] <= 250
+
+    def test_clear(self, tmp_path):
+        """Clearing removes every entry."""
+        cache = QRSvgCache(str(tmp_path))
+        generate_qr_code(TEST_URL, cache=cache)
+
+        assert cache.clear() == 1
+        assert cache.stats()["entries"] == 0
+        assert cache.get(cache_key(TEST_URL)) is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+QR SVG Path Renderer Tests (Pytest)
+
+Parity tests for the NumPy run-length path renderer in scripts/qr_svg_path.py
+against the qrcode library's SvgPathImage output.
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+import pytest
+import qrcode
+import qrcode.image.svg
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from generate_qr_codes import generate_qr_code, get_all_cheatsheet_videos
+from qr_decode import decode, decode_matrix
+from qr_svg_path import module_matrix, module_runs, path_to_matrix, render_optimized_path, render_path
+
+URLS = [video["url"] for video in get_all_cheatsheet_videos()] + [
+    "https://ccri-cyberknights.github.io/page/",
+    "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+]
+
+def make_qr(url, ecl="L", box_size=8, border=2):
+    """Build a QRCode the same way generate_qr_codes.py does."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{ecl}"),
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr
+
+def reference_path(qr):
+    """Path data from the previous SvgPathImage + regex pipeline."""
+    svg = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).to_string().decode("utf-8")
+    return re.search(r'<path d="([^"]*)"', svg).group(1)
+
+def rasterize(matrix, border, scale=8):
+    """Render a module matrix as a black-on-white PIL image."""
+    padded = np.pad(matrix, border)
+    pixels = np.where(padded, 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels.repeat(scale, axis=0).repeat(scale, axis=1), mode="L")
+
+class TestModuleRuns:
+    """Test run-length extraction."""
+
+    def test_runs_cover_every_dark_module(self):
+        """Runs reconstruct the matrix exactly."""
+        matrix = module_matrix(make_qr(URLS[0]).modules)
+        rows, starts, ends = module_runs(matrix)
+
+        rebuilt = np.zeros_like(matrix)
+        for y, x0, x1 in zip(rows, starts, ends):
+            rebuilt[y, x0:x1] = True
+        assert (rebuilt == matrix).all()
+        assert len(rows) < matrix.sum()
+
+class TestRenderParity:
+    """Test the native renderer against SvgPathImage."""
+
+    @pytest.mark.parametrize("url", URLS)
+    @pytest.mark.parametrize("ecl,box_size,border", [("L", 8, 2), ("M", 10, 4), ("H", 3, 1)])
+    def test_same_modules_as_svg_path_image(self, url, ecl, box_size, border):
+        """Both paths rasterize to the same module matrix as qr.modules."""
+        qr = make_qr(url, ecl, box_size, border)
+        matrix = module_matrix(qr.modules)
+
+        native = render_path(matrix, box_size, border)
+        reference = reference_path(qr)
+
+        assert (path_to_matrix(reference, qr.modules_count, box_size, border) == matrix).all()
+        assert (path_to_matrix(native, qr.modules_count, box_size, border) == matrix).all()
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_native_path_is_smaller(self, url):
+        """Run-length merging produces a shorter path string."""
+        qr = make_qr(url)
+        assert len(render_path(module_matrix(qr.modules))) < len(reference_path(qr))
+
+    def test_generated_svg_keeps_viewbox(self):
+        """The SVG wrapper (viewBox, size, colors) is unchanged by the new renderer."""
+        svg = generate_qr_code(URLS[0])
+        assert 'viewBox="0 0 23.2 23.2"' in svg
+        assert 'fill="#000000"' in svg
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_rendered_path_decodes_to_url(self, url):
+        """The native path, rasterized, decodes back to the original URL."""
+        svg = generate_qr_code(url)
+        path = re.search(r'<path d="([^"]*)"', svg).group(1)
+        size = make_qr(url).modules_count
+
+        image = rasterize(path_to_matrix(path, size), border=2)
+        assert decode(image) == url
+
+class TestOptimizedPath:
+    """Test the minimal-path optimizer used for embedded guide QR codes."""
+
+    @pytest.mark.parametrize("url", URLS)
+    @pytest.mark.parametrize("box_size,border", [(8, 2), (10, 4), (3, 1), (5, 0)])
+    def test_optimized_path_decodes_to_url(self, url, box_size, border):
+        """The optimized path rasterizes to the same modules and decodes to the URL."""
+        qr = make_qr(url, box_size=box_size, border=border)
+        matrix = module_matrix(qr.modules)
+        path = render_optimized_path(matrix, box_size, border)
+
+        rendered = path_to_matrix(path, qr.modules_count, box_size, border)
+        assert (rendered == matrix).all()
+        assert decode_matrix(rendered) == url
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_optimized_path_is_smaller_than_run_path(self, url):
+        """Relative commands and trimmed numbers beat the absolute run-length path."""
+        matrix = module_matrix(make_qr(url).modules)
+        assert len(render_optimized_path(matrix)) < len(render_path(matrix))
+
+    def test_optimized_generation_is_verified(self):
+        """generate_qr_code(optimize=True) returns a smaller SVG with the same viewBox."""
+        plain = generate_qr_code(URLS[0])
+        optimized = generate_qr_code(URLS[0], optimize=True)
+
+        assert len(optimized) < len(plain)
+        assert 'viewBox="0 0 23.2 23.2"' in optimized
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
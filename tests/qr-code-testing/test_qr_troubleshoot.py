@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+QR Troubleshooting Pipeline Tests (Pytest)
+
+Tests for the staged, in-process pipeline in qr_troubleshoot.py. The
+Playwright stage is skipped; it is covered by test_playwright_validate.py.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import zipfile
+
+import pytest
+
+from gen_and_embed import TEST_URLS
+from qr_troubleshoot import run_pipeline
+
+@pytest.fixture
+def report(tmp_path):
+    """One pipeline run without Playwright, writing only under tmp_path."""
+    return asyncio.run(run_pipeline(str(tmp_path / "out"), str(tmp_path), playwright=False))
+
+def test_stages_are_timed(report):
+    """Every stage runs, succeeds and reports its wall-clock time."""
+    assert report["ok"]
+    assert [stage["name"] for stage in report["stages"]] == ["generate", "verify", "package"]
+    assert all(stage["seconds"] > 0 for stage in report["stages"])
+
+def test_package_contents(report):
+    """The zip holds the generated files, the debug scripts and the summary."""
+    with zipfile.ZipFile(report["debug_package"]) as zf:
+        names = set(zf.namelist())
+        summary = json.loads(zf.read("debug_summary.json"))
+
+    assert {f"out/qr_{id}.png" for id in TEST_URLS} | {"out/index.html", "gen_and_embed.py"} <= names
+    assert [stage["name"] for stage in summary["stages"]] == ["generate", "verify"]
+    assert summary["files_generated"] == len(TEST_URLS) + 1
+
+def test_working_directory_untouched(tmp_path):
+    """Nothing is written outside the given directories."""
+    before = sorted(os.listdir(os.getcwd()))
+    asyncio.run(run_pipeline(str(tmp_path / "out"), str(tmp_path), playwright=False, png_mode="gray1"))
+    assert sorted(os.listdir(os.getcwd())) == before
+
+def test_package_defaults_to_out_dir(tmp_path):
+    """Without a package directory the zip goes next to the generated files, not into the cwd."""
+    report = asyncio.run(run_pipeline(str(tmp_path / "out"), playwright=False, png_mode="gray1"))
+    assert os.path.dirname(report["debug_package"]) == str(tmp_path / "out")
+    assert os.path.exists(report["debug_package"])
+
+@pytest.mark.skipif(importlib.util.find_spec("playwright") is not None, reason="Playwright is installed")
+def test_missing_playwright_fails_stage(tmp_path):
+    """Without Playwright the stage fails cleanly and packaging still runs."""
+    report = asyncio.run(run_pipeline(str(tmp_path / "out"), str(tmp_path), playwright=True))
+    stages = {stage["name"]: stage for stage in report["stages"]}
+    assert not report["ok"] and not stages["playwright"]["ok"]
+    assert stages["package"]["ok"] and os.path.exists(report["debug_package"])
@@ -7,14 +7,16 @@ specifically for the Linux cheatsheet project.
 """
 
 import qrcode
-import base64
-import io
 import json
 import os
 import sys
-import requests
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from qr_decode import decode
+from qr_roundtrip import image_data_uri
+
 class QRCodeTester:
     """QR Code testing utility class."""
     
@@ -36,29 +38,11 @@ class QRCodeTester:
     
     def generate_base64_qr(self, text, size=10):
         """Generate QR code as base64 string."""
-        img = self.generate_qr_code(text, size)
-        
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        
-        return f"data:image/png;base64,{img_str}"
+        return image_data_uri(self.generate_qr_code(text, size))
     
-    def decode_qr_with_api(self, filename):
-        """Decode QR code using online API."""
-        try:
-            with open(filename, 'rb') as f:
-                files = {'file': f}
-                response = requests.post('https://api.qrserver.com/v1/read-qr-code/', 
-                                      files=files, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0 and 'symbol' in data[0]:
-                    return data[0]['symbol'][0]['data']
-            return None
-        except Exception:
-            return None
+    def decode_qr(self, image):
+        """Decode an in-memory QR image with the local decoder (zbar when installed)."""
+        return decode(image.get_image())
     
     def test_cheatsheet_qr_codes(self):
         """Test QR codes for Linux cheatsheet."""
@@ -82,15 +66,11 @@ class QRCodeTester:
             # Generate QR code
             img = self.generate_qr_code(url)
             
-            # Save to temp file for decoding test
-            temp_file = f"/tmp/test_{name}.png"
-            img.save(temp_file)
-            
             # Generate base64 version
             base64_qr = self.generate_base64_qr(url)
             
             # Test decoding
-            decoded_url = self.decode_qr_with_api(temp_file)
+            decoded_url = self.decode_qr(img)
             
             # Get image dimensions
             width, height = img.size
@@ -101,14 +81,13 @@ class QRCodeTester:
                 "decoded_url": decoded_url,
                 "base64_length": len(base64_qr),
                 "image_size": f"{width}x{height}",
-                "success": decoded_url == url,
-                "temp_file": temp_file
+                "success": decoded_url == url
             }
             
             results[name] = result
             self.test_results.append(result)
             
-            print(f"   ✅ Generated: {temp_file}")
+            print("   ✅ Generated in memory")
             print(f"   📊 Image size: {width}x{height}")
             print(f"   📊 Base64 length: {len(base64_qr)} chars")
             print(f"   🔍 Decoded: {decoded_url}")
@@ -131,11 +110,9 @@ class QRCodeTester:
             print(f"\n📏 Testing size {size}:")
             
             img = self.generate_qr_code(test_url, size)
-            temp_file = f"/tmp/quality_test_{size}.png"
-            img.save(temp_file)
             
             # Test decoding
-            decoded_url = self.decode_qr_with_api(temp_file)
+            decoded_url = self.decode_qr(img)
             
             width, height = img.size
             
@@ -184,11 +161,9 @@ class QRCodeTester:
             qr.make(fit=True)
             
             img = qr.make_image(fill_color="black", back_color="white")
-            temp_file = f"/tmp/ecl_test_{ecl_name}.png"
-            img.save(temp_file)
             
             # Test decoding
-            decoded_url = self.decode_qr_with_api(temp_file)
+            decoded_url = self.decode_qr(img)
             
             width, height = img.size
             
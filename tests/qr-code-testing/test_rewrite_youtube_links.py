@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+YouTube Link Rewriter Tests (Pytest)
+
+Tests for the site-wide link rewriter in scripts/rewrite_youtube_links.py.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from embed_guide_qr_codes import find_qr_blocks
+from generate_qr_codes import GUIDES_DIR
+from rewrite_youtube_links import rewrite_file, rewrite_lines, rewrite_site, shorten_link
+
+PAGE = """<p>Watch https://www.youtube.com/watch?v=N9j--n-zGgc&list=PL1.</p>
+<a href="https://www.youtube.com/watch?v=lI0mUMqBesU&amp;list=PL1&amp;index=3">Part 2</a>
+<a href="https://youtu.be/7JYJO_D8zVs">Already short</a>
+<a href="https://www.youtube.com/playlist?list=PL1">Playlist</a>
+<a href="https://example.com/watch?v=N9j--n-zGgc">Not YouTube</a>
+"""
+
+class TestRewriteLines:
+    """Test link detection and replacement."""
+
+    def test_attributes_and_text(self):
+        """Links in text and in attributes (with &amp;) are shortened; others are kept."""
+        rewritten = "".join(new for _, new, _ in rewrite_lines(PAGE.splitlines(keepends=True)))
+
+        assert "Watch https://youtu.be/N9j--n-zGgc.</p>" in rewritten
+        assert 'href="https://youtu.be/lI0mUMqBesU"' in rewritten
+        assert 'href="https://youtu.be/7JYJO_D8zVs"' in rewritten
+        assert 'href="https://www.youtube.com/playlist?list=PL1"' in rewritten
+        assert 'href="https://example.com/watch?v=N9j--n-zGgc"' in rewritten
+
+    @pytest.mark.parametrize("line", [
+        '<a href="https://notyoutube.com/watch?v=N9j--n-zGgc">x</a>\n',
+        '<a href="https://example.com/?next=https://www.youtube.com/watch?v=N9j--n-zGgc">x</a>\n',
+        '<a href="https://example.com/?a=1&amp;next=youtu.be/N9j--n-zGgc">x</a>\n',
+    ])
+    def test_look_alike_and_nested_links_are_kept(self, line):
+        """Only URLs whose host is YouTube are rewritten, not look-alikes or URLs inside other URLs."""
+        assert list(rewrite_lines([line])) == [(line, line, 0)]
+
+    def test_counts(self):
+        """Only changed links are counted."""
+        assert sum(count for _, _, count in rewrite_lines(PAGE.splitlines(keepends=True))) == 2
+
+    def test_repeated_links_are_memoized(self):
+        """The same link is only shortened once per process."""
+        link = "https://www.youtube.com/watch?v=twREXouRxns&amp;list=PL9"
+        shorten_link(link)
+        before = shorten_link.cache_info().hits
+        list(rewrite_lines([f'<a href="{link}">x</a>\n'] * 5))
+        assert shorten_link.cache_info().hits - before == 5
+
+class TestRewriteFiles:
+    """Test dry-run and in-place modes."""
+
+    def test_dry_run_leaves_file_alone(self, tmp_path):
+        """Without write=True the file is unchanged and a diff is returned."""
+        path = tmp_path / "page.html"
+        path.write_text(PAGE, encoding="utf-8")
+        result = rewrite_file(str(path))
+
+        assert result["links"] == 2 and not result["written"]
+        assert "+<a href=\"https://youtu.be/lI0mUMqBesU\">Part 2</a>" in result["diff"]
+        assert path.read_text(encoding="utf-8") == PAGE
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_write_guides_in_place(self, tmp_path, jobs):
+        """Rewritten guides keep their QR blocks matched to the same videos."""
+        paths = []
+        for number in (1, 2, 3):
+            path = tmp_path / f"linux-cheatsheet-{number}.html"
+            shutil.copyfile(os.path.join(GUIDES_DIR, path.name), path)
+            paths.append(str(path))
+        before = [find_qr_blocks(open(p, encoding="utf-8").read()) for p in paths]
+
+        results = rewrite_site(paths, write=True, jobs=jobs)
+        assert [r["path"] for r in results] == paths
+        assert all(r["links"] == 2 and r["written"] for r in results)
+
+        for path, blocks in zip(paths, before):
+            text = open(path, encoding="utf-8").read()
+            assert "youtube.com/watch" not in text
+            assert [b["video_id"] for b in find_qr_blocks(text)] == [b["video_id"] for b in blocks]
+
+        assert all(r["links"] == 0 for r in rewrite_site(paths, jobs=jobs))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Visual Diff Tests (Pytest)
+
+Tests for the screenshot comparison in scripts/visual_diff.py, on synthetic
+images and on the committed Playwright baselines.
+"""
+
+import glob
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from visual_diff import compare_arrays, diff_all, find_directory_pairs, find_result_pairs, heatmap, load_rgb
+
+SNAPSHOTS = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '*-snapshots', '*.png')))
+
+def page(height=120, width=200):
+    """A white page with a dark header bar."""
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    image[:20] = (30, 30, 30)
+    return image
+
+class TestCompare:
+    """Test the pixel comparison."""
+
+    def test_identical(self):
+        """Identical images have no changed pixels or regions."""
+        stats, _ = compare_arrays(page(), page())
+        assert stats["changed_pixels"] == 0 and stats["bbox"] is None and stats["top_regions"] == []
+
+    def test_changed_block(self):
+        """A changed block is counted, bounded and located on the region grid."""
+        actual = page()
+        actual[70:90, 130:170] = (200, 0, 0)
+        stats, _ = compare_arrays(page(), actual, tile=64)
+
+        assert stats["changed_pixels"] == 20 * 40
+        assert stats["bbox"] == {"x": 130, "y": 70, "width": 40, "height": 20}
+        assert (stats["top_regions"][0]["x"], stats["top_regions"][0]["y"]) == (128, 64)
+        assert stats["regions_changed"] == 1 and stats["regions_total"] == 2 * 4
+
+    def test_perceptual_threshold(self):
+        """Imperceptible shifts pass at the default threshold but not at 0."""
+        actual = page()
+        actual[40:] = 252
+        assert compare_arrays(page(), actual)[0]["changed_pixels"] == 0
+        assert compare_arrays(page(), actual, threshold=0)[0]["changed_pixels"] == 80 * 200
+
+    def test_size_mismatch(self):
+        """Rows present in only one image count as changed and show magenta in the heatmap."""
+        stats, delta = compare_arrays(page(120), page(100))
+        assert stats["size_mismatch"] and stats["changed_pixels"] == 20 * 200
+
+        pixels = np.asarray(heatmap(delta, page(120)))
+        assert tuple(pixels[110, 10]) == (255, 0, 255)
+        assert tuple(pixels[50, 10]) == (255, 255, 255)
+
+    def test_transparency_blends_onto_white(self, tmp_path):
+        """Transparent pixels compare as white, like Playwright's comparator."""
+        Image.new("RGBA", (4, 4), (0, 0, 0, 0)).save(tmp_path / "clear.png")
+        assert (load_rgb(str(tmp_path / "clear.png")) == 255).all()
+
+class TestDirectories:
+    """Test pairing and the parallel run."""
+
+    def test_result_pairs(self, tmp_path):
+        """Playwright's -actual/-expected files are paired; lone actuals are ignored."""
+        spec = tmp_path / "index-visual-regression-home-chromium"
+        spec.mkdir()
+        for name in ("home-page-full-actual", "home-page-full-expected", "orphan-actual"):
+            Image.fromarray(page()).save(spec / f"{name}.png")
+
+        (name, expected, actual), = find_result_pairs(str(tmp_path))
+        assert name == os.path.join(spec.name, "home-page-full.png")
+        assert expected.endswith("-expected.png") and actual.endswith("-actual.png")
+
+    @pytest.mark.skipif(not SNAPSHOTS, reason="no committed snapshots")
+    def test_snapshot_directory_ranked(self, tmp_path):
+        """Baselines compared against a copy with one edit rank that edit first, in parallel."""
+        expected_dir, actual_dir = tmp_path / "expected", tmp_path / "actual"
+        expected_dir.mkdir()
+        actual_dir.mkdir()
+        for path in SNAPSHOTS[:4]:
+            image = Image.open(path)
+            image.save(expected_dir / os.path.basename(path))
+            image.save(actual_dir / os.path.basename(path))
+        edited = os.path.basename(SNAPSHOTS[2])
+        image = np.array(Image.open(actual_dir / edited).convert("RGB"))
+        image[:10, :10] = (255, 0, 0)
+        Image.fromarray(image).save(actual_dir / edited)
+        Image.fromarray(page()).save(expected_dir / "only-expected.png")
+
+        pairs, missing, extra = find_directory_pairs(str(expected_dir), str(actual_dir))
+        assert missing == ["only-expected.png"] and extra == []
+
+        results = diff_all(pairs, heatmap_dir=str(tmp_path / "diff"), jobs=2)
+        assert results[0]["name"] == edited and results[0]["changed_pixels"] > 0
+        assert os.path.exists(results[0]["heatmap"])
+        assert all(r["changed_pixels"] == 0 and r["heatmap"] is None for r in results[1:])
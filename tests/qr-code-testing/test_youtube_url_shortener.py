@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+YouTube URL Shortener Tests (Pytest)
+
+Tests for scripts/youtube_url_shortener.py, the first step of the QR code
+workflow.
+"""
+
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from youtube_url_shortener import (
+    batch_shorten_urls, extract_video_id, shorten_youtube_url, shorten_youtube_url_regex, stream_shorten_urls, write_jsonl
+)
+
+LINKS = [
+    "https://www.youtube.com/watch?v=7JYJO_D8zVs&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=4",
+    "@https://www.youtube.com/watch?v=gSVg40u0fZE&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=5",
+    "https://youtu.be/N9j--n-zGgc",
+    "https://example.com/not-youtube",
+]
+
+def legacy_parse_shorten(url):
+    """The former urlparse/parse_qs implementation of shorten_youtube_url()."""
+    prefix = "@" if url.startswith("@") else ""
+    url = url[len(prefix):]
+    netloc = urlparse(url).netloc
+    if "youtube.com" not in netloc or "youtu.be" in netloc:
+        return prefix + url
+    video_id = parse_qs(urlparse(url).query).get("v", [None])[0]
+    return prefix + (f"https://youtu.be/{video_id}" if video_id else url)
+
+def legacy_regex_shorten(url):
+    """The former shorten_youtube_url_regex() implementation."""
+    prefix = "@" if url.startswith("@") else ""
+    url = url[len(prefix):]
+    match = re.search(r"(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)", url)
+    return prefix + (f"https://youtu.be/{match.group(1)}" if match else url)
+
+# (input, expected output, expected video ID)
+CORPUS = [
+    # Long watch URLs, with and without playlist parameters and the @ prefix
+    ("https://www.youtube.com/watch?v=7JYJO_D8zVs&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=4",
+     "https://youtu.be/7JYJO_D8zVs", "7JYJO_D8zVs"),
+    ("@https://www.youtube.com/watch?v=gSVg40u0fZE&list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M&index=5",
+     "@https://youtu.be/gSVg40u0fZE", "gSVg40u0fZE"),
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=43s", "https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://www.youtube.com/watch?v=abc123", "https://youtu.be/abc123", "abc123"),
+    ("http://youtube.com/watch?v=N9j--n-zGgc#comments", "https://youtu.be/N9j--n-zGgc", "N9j--n-zGgc"),
+    # v= is not the first parameter
+    ("https://www.youtube.com/watch?feature=share&v=twREXouRxns", "https://youtu.be/twREXouRxns", "twREXouRxns"),
+    ("https://www.youtube.com/watch?list=PL1&xv=1&v=twREXouRxns", "https://youtu.be/twREXouRxns", "twREXouRxns"),
+    # Mobile and music hosts
+    ("https://m.youtube.com/watch?v=2DcDQe8idtU", "https://youtu.be/2DcDQe8idtU", "2DcDQe8idtU"),
+    ("https://music.youtube.com/watch?v=2DcDQe8idtU&si=abc", "https://youtu.be/2DcDQe8idtU", "2DcDQe8idtU"),
+    # Path-style video URLs
+    ("https://www.youtube.com/embed/rR_n2ciilrc?start=30", "https://youtu.be/rR_n2ciilrc", "rR_n2ciilrc"),
+    ("https://www.youtube-nocookie.com/embed/rR_n2ciilrc", "https://youtu.be/rR_n2ciilrc", "rR_n2ciilrc"),
+    ("https://youtube.com/shorts/l0d7ks9ZkjU", "https://youtu.be/l0d7ks9ZkjU", "l0d7ks9ZkjU"),
+    ("@https://m.youtube.com/shorts/l0d7ks9ZkjU?feature=share", "@https://youtu.be/l0d7ks9ZkjU", "l0d7ks9ZkjU"),
+    ("https://www.youtube.com/live/y6-e233rrQE", "https://youtu.be/y6-e233rrQE", "y6-e233rrQE"),
+    # Without a scheme
+    ("www.youtube.com/watch?v=to0GrfGERK0", "https://youtu.be/to0GrfGERK0", "to0GrfGERK0"),
+    # Already short: unchanged, but the ID is still extracted
+    ("https://youtu.be/N9j--n-zGgc", "https://youtu.be/N9j--n-zGgc", "N9j--n-zGgc"),
+    ("@https://youtu.be/N9j--n-zGgc?t=5", "@https://youtu.be/N9j--n-zGgc?t=5", "N9j--n-zGgc"),
+    # YouTube pages that are not videos
+    ("https://www.youtube.com/playlist?list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M",
+     "https://www.youtube.com/playlist?list=PLqux0fXsj7x3WYm6ZWuJnGC1rXQZ1018M", None),
+    ("https://www.youtube.com/watch?v=", "https://www.youtube.com/watch?v=", None),
+    ("https://www.youtube.com/@ccri", "https://www.youtube.com/@ccri", None),
+    ("https://www.youtube.com/watch?v=abc%20def", "https://www.youtube.com/watch?v=abc%20def", None),
+    # Not YouTube, including look-alikes
+    ("https://example.com/not-youtube", "https://example.com/not-youtube", None),
+    ("https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html",
+     "https://ccri-cyberknights.github.io/page/#/guides/linux-cheatsheet-3.html", None),
+    ("https://notyoutube.com.evil.example/watch?v=N9j--n-zGgc",
+     "https://notyoutube.com.evil.example/watch?v=N9j--n-zGgc", None),
+    ("https://example.com/?next=https://www.youtube.com/watch?v=N9j--n-zGgc",
+     "https://example.com/?next=https://www.youtube.com/watch?v=N9j--n-zGgc", None),
+]
+
+# Inputs where the engine intentionally differs from at least one of the old implementations
+LEGACY_DIVERGENCES = {
+    "https://www.youtube.com/embed/rR_n2ciilrc?start=30",
+    "https://www.youtube-nocookie.com/embed/rR_n2ciilrc",
+    "https://youtube.com/shorts/l0d7ks9ZkjU",
+    "@https://m.youtube.com/shorts/l0d7ks9ZkjU?feature=share",
+    "https://www.youtube.com/live/y6-e233rrQE",
+    "https://www.youtube.com/watch?feature=share&v=twREXouRxns",
+    "https://www.youtube.com/watch?list=PL1&xv=1&v=twREXouRxns",
+    "www.youtube.com/watch?v=to0GrfGERK0",
+    "https://www.youtube.com/watch?v=abc%20def",
+    "https://notyoutube.com.evil.example/watch?v=N9j--n-zGgc",
+    "https://example.com/?next=https://www.youtube.com/watch?v=N9j--n-zGgc",
+}
+
+class TestEngine:
+    """Differential tests for the single shortening engine."""
+
+    @pytest.mark.parametrize("url,expected,video_id", CORPUS)
+    def test_corpus(self, url, expected, video_id):
+        """Every corpus entry shortens and extracts as documented."""
+        assert shorten_youtube_url(url) == expected
+        assert extract_video_id(url) == video_id
+
+    @pytest.mark.parametrize("url,expected,video_id", CORPUS)
+    def test_regex_alias_agrees(self, url, expected, video_id):
+        """The old regex entry point now gives the same answer."""
+        assert shorten_youtube_url_regex(url) == shorten_youtube_url(url)
+
+    @pytest.mark.parametrize("url", [entry[0] for entry in CORPUS if entry[0] not in LEGACY_DIVERGENCES])
+    def test_matches_legacy_implementations(self, url):
+        """Outside the documented divergences, behavior is unchanged from both old implementations."""
+        assert shorten_youtube_url(url) == legacy_parse_shorten(url) == legacy_regex_shorten(url)
+
+    @pytest.mark.parametrize("url", sorted(LEGACY_DIVERGENCES))
+    def test_divergences_are_real(self, url):
+        """Every listed divergence really differed between the old implementations or from the engine."""
+        results = {shorten_youtube_url(url), legacy_parse_shorten(url), legacy_regex_shorten(url)}
+        assert len(results) > 1
+
+class TestStreaming:
+    """Test the streaming JSONL mode."""
+
+    def test_records(self):
+        """Each line becomes one record with input, output, video_id and changed."""
+        records = list(stream_shorten_urls(line + "\n" for line in LINKS))
+
+        assert [r["output"] for r in records] == batch_shorten_urls(LINKS)
+        assert [r["video_id"] for r in records] == ["7JYJO_D8zVs", "gSVg40u0fZE", "N9j--n-zGgc", None]
+        assert [r["changed"] for r in records] == [True, True, False, False]
+        assert records[1]["input"] == LINKS[1]
+
+    def test_blank_lines_are_skipped(self):
+        """Blank and whitespace-only lines produce no records."""
+        assert len(list(stream_shorten_urls(["\n", "  \n", LINKS[0] + "\n"]))) == 1
+
+    def test_is_lazy(self):
+        """Records are produced as lines arrive, not after the input is exhausted."""
+        def lines():
+            yield LINKS[0]
+            raise AssertionError("read past the first line")
+
+        assert next(stream_shorten_urls(lines()))["video_id"] == "7JYJO_D8zVs"
+
+    def test_write_jsonl(self):
+        """write_jsonl emits one JSON object per line."""
+        out = io.StringIO()
+        assert write_jsonl(stream_shorten_urls(LINKS), out) == len(LINKS)
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["input"] for line in lines] == LINKS
+
+class TestCommandLine:
+    """Test the command line interface."""
+
+    def run(self, *args, stdin=None):
+        return subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "youtube_url_shortener.py"), *args],
+            input=stdin, capture_output=True, text=True, check=True,
+        ).stdout
+
+    def test_stdin_to_jsonl(self):
+        """--file - streams stdin to JSONL on stdout."""
+        out = self.run("--file", "-", stdin="\n".join(LINKS) + "\n")
+        assert [json.loads(line)["output"] for line in out.splitlines()] == batch_shorten_urls(LINKS)
+
+    def test_file_to_jsonl(self, tmp_path):
+        """--file reads a links file."""
+        path = tmp_path / "links.txt"
+        path.write_text("\n".join(LINKS), encoding="utf-8")
+        assert len(self.run("--file", str(path)).splitlines()) == len(LINKS)
+
+    def test_positional_urls_keep_text_output(self):
+        """URL arguments still print the Input/Output report."""
+        out = self.run(LINKS[0])
+        assert "Output: https://youtu.be/7JYJO_D8zVs" in out
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])